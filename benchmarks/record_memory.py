@@ -0,0 +1,85 @@
+"""
+Memory benchmark: slotted TweetRecord versus the equivalent per-tweet dicts
+
+Run with `python benchmarks/record_memory.py` (or `make benchmark`).
+"""
+
+import tracemalloc
+from typing import Dict
+
+from youtube_script_agent.core.records import TweetRecord
+
+
+def sample_record(i: int) -> TweetRecord:
+    """
+    Build a deterministic, fully populated tweet record
+    
+    Args:
+        i: Record number
+        
+    Returns:
+        Tweet record
+    """
+    return TweetRecord(
+        id=1700000000000000000 + i,
+        text=f"Sample tweet {i} about tonight's game #NFL https://t.co/abc{i}",
+        created_at='2024-01-07T20:15:00+00:00',
+        author_username=f"user{i}",
+        author_verified=i % 7 == 0,
+        author_followers=1000 + i,
+        author_profile_image=f"https://pbs.twimg.com/profile_images/{i}.jpg",
+        likes=i % 500,
+        retweets=i % 50,
+        replies=i % 30,
+        quotes=i % 10,
+        total_engagement=i % 500 + i % 50 + i % 30,
+        engagement_ratio=(i % 500) / (1000 + i),
+        conversation_id=1700000000000000000 + i,
+        media=(('photo', f"https://pbs.twimg.com/media/{i}.jpg"),),
+        urls=(f"https://example.com/story/{i}",),
+        hashtags=('nfl',),
+        tweet_url=f"https://twitter.com/user{i}/status/{1700000000000000000 + i}",
+        quality_score=float(i % 700)
+    )
+
+
+def measure_record_memory(count: int = 10000) -> Dict[str, float]:
+    """
+    Benchmark the memory held by tweet records against the equivalent dicts
+    
+    Args:
+        count: Number of tweets to build in each representation
+        
+    Returns:
+        Dict with bytes per tweet for each representation and the saving ratio
+    """
+    def measure(build) -> int:
+        tracemalloc.start()
+        try:
+            items = [build(i) for i in range(count)]
+            current, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del items
+        return current
+    
+    record_bytes = measure(sample_record)
+    dict_bytes = measure(lambda i: sample_record(i).to_dict())
+    
+    return {
+        'dict_bytes_per_tweet': dict_bytes / count,
+        'record_bytes_per_tweet': record_bytes / count,
+        'saving_ratio': 1 - record_bytes / dict_bytes
+    }
+
+
+def main() -> None:
+    """Print the per-tweet memory of each representation"""
+    results = measure_record_memory()
+    print(f"dict:        {results['dict_bytes_per_tweet']:.0f} bytes/tweet")
+    print(f"TweetRecord: {results['record_bytes_per_tweet']:.0f} bytes/tweet")
+    print(f"Saving:      {results['saving_ratio']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Latency benchmark: fanned-out agent graph versus the same nodes run in sequence
+
+Every node is replaced by a stub that sleeps for a fixed time, so the result
+depends only on the graph shape. Run with `python benchmarks/workflow_fanout.py`
+(or `make benchmark`); `--scale` multiplies every sleep.
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List
+
+from youtube_script_agent.agents.workflow import (
+    NODE_DEPENDENCIES,
+    critical_path_seconds,
+    wire_graph,
+)
+from youtube_script_agent.utils.tracing import RunTrace, tracing
+
+# Seconds each stub node sleeps, in the proportions of a typical run
+STUB_SECONDS = {
+    'discover_hashtags': 0.30,
+    'scrape_tweets': 0.50,
+    'dedupe_tweets': 0.05,
+    'filter_tweets': 0.05,
+    'analyze_competitors': 0.60,
+    'scrape_comments': 0.80,
+    'fact_check': 0.70,
+    'analyze_sentiment': 0.40,
+    'generate_media': 0.10,
+    'generate_scripts': 1.00,
+    'compile_output': 0.02,
+    'save_files': 0.02,
+}
+
+
+def stub_node(seconds: float) -> Callable[[Dict, Dict], Dict]:
+    """
+    Build a node that sleeps and returns the state unchanged
+    
+    Args:
+        seconds: Time to sleep
+        
+    Returns:
+        Node function
+    """
+    def run(state: Dict, run_config: Dict) -> Dict:
+        time.sleep(seconds)
+        return state
+    
+    return run
+
+
+def sequential_dependencies() -> Dict[str, List[str]]:
+    """
+    Chain every node after the previous one, as the graph was wired before the fan-out
+    
+    Returns:
+        Dependencies in the shape of NODE_DEPENDENCIES
+    """
+    names = list(NODE_DEPENDENCIES)
+    return {name: names[i - 1:i] for i, name in enumerate(names)}
+
+
+def time_graph(dependencies: Dict[str, List[str]], scale: float, repeats: int) -> Dict[str, float]:
+    """
+    Invoke a stub graph and measure its latency
+    
+    Args:
+        dependencies: Graph shape
+        scale: Multiplier applied to every stub sleep
+        repeats: Invocations to run; the fastest is reported
+        
+    Returns:
+        Dict with the measured wall time and the critical path derived from node timings
+    """
+    nodes = {name: stub_node(seconds * scale) for name, seconds in STUB_SECONDS.items()}
+    agent = wire_graph(nodes, dependencies).compile()
+    
+    best = None
+    for i in range(repeats):
+        trace = RunTrace(f"benchmark-{i}", 'benchmark')
+        with tracing(trace):
+            agent.invoke({'topic': 'benchmark', 'config': {}}, {'configurable': {}})
+        trace.finish()
+        if best is None or trace.seconds < best.seconds:
+            best = trace
+    
+    return {
+        'wall_seconds': best.seconds,
+        'critical_path_seconds': critical_path_seconds(best.node_seconds())
+    }
+
+
+def main() -> None:
+    """Print the latency of the sequential and fanned-out graphs"""
+    parser = argparse.ArgumentParser(description='Benchmark the workflow fan-out with stub nodes')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier for every stub sleep')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='Invocations per graph (fastest is kept)')
+    args = parser.parse_args()
+    
+    expected_parallel = critical_path_seconds({k: v * args.scale for k, v in STUB_SECONDS.items()})
+    expected_sequential = sum(STUB_SECONDS.values()) * args.scale
+    
+    sequential = time_graph(sequential_dependencies(), args.scale, args.repeats)
+    parallel = time_graph(NODE_DEPENDENCIES, args.scale, args.repeats)
+    
+    print(f"{'graph':<12}{'expected':>10}{'measured':>10}")
+    print(f"{'sequential':<12}{expected_sequential:>9.2f}s{sequential['wall_seconds']:>9.2f}s")
+    print(f"{'fan-out':<12}{expected_parallel:>9.2f}s{parallel['wall_seconds']:>9.2f}s")
+    print(f"Critical path from node timings: {parallel['critical_path_seconds']:.2f}s")
+    print(f"Latency saved: {1 - parallel['wall_seconds'] / sequential['wall_seconds']:.1%}")
+
+
+if __name__ == "__main__":
+    main()
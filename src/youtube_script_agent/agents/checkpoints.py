@@ -0,0 +1,224 @@
+"""
+Durable run checkpoints for resuming failed agent runs
+"""
+
+import sqlite3
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from ..core.constants import (
+    CHECKPOINT_DB_PATH, CHECKPOINT_KEEP_SUCCEEDED, CHECKPOINT_MAX_AGE_SECONDS, CHECKPOINT_MAX_RUNS
+)
+from ..core.records import TweetRecord
+
+RECORD_KEY = '__tweet_record__'
+
+
+def encode_records(value: Any) -> Any:
+    """
+    Replace tweet records in a state value with tagged dicts
+    
+    Args:
+        value: State channel value
+        
+    Returns:
+        Value with every TweetRecord swapped for its to_dict() form
+    """
+    if isinstance(value, TweetRecord):
+        return {RECORD_KEY: value.to_dict()}
+    if isinstance(value, dict):
+        return {key: encode_records(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(encode_records(item) for item in value)
+    return value
+
+
+def decode_records(value: Any) -> Any:
+    """
+    Rebuild tweet records from the tagged dicts written by encode_records
+    
+    Args:
+        value: Deserialized state channel value
+        
+    Returns:
+        Value with TweetRecords restored
+    """
+    if isinstance(value, dict):
+        if RECORD_KEY in value and len(value) == 1:
+            return TweetRecord.from_dict(value[RECORD_KEY])
+        return {key: decode_records(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(decode_records(item) for item in value)
+    return value
+
+
+class RecordSerializer(JsonPlusSerializer):
+    """
+    Checkpoint serializer that understands the slotted TweetRecord
+    """
+    
+    def dumps_typed(self, obj: Any):
+        return super().dumps_typed(encode_records(obj))
+    
+    def loads_typed(self, data):
+        return decode_records(super().loads_typed(data))
+
+
+def new_run_id(topic: str) -> str:
+    """
+    Generate a run id (also the checkpoint thread id)
+    
+    Args:
+        topic: Topic name
+        
+    Returns:
+        Id like 'nfl-20250101-120000-1a2b3c'
+    """
+    return f"{topic}-{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+class RunCheckpoints:
+    """
+    SQLite checkpointer for the agent graph plus an index of runs
+    
+    The graph persists its state after every step under the run id, so a
+    run that failed can continue from its last completed node instead of
+    repeating every Twitter and Claude call. The run index records each
+    run's topic and status for resume and retention: checkpoints of
+    succeeded runs are dropped unless CHECKPOINT_KEEP_SUCCEEDED is set, and
+    runs older than max_age_seconds or beyond the newest max_runs are pruned.
+    """
+    
+    def __init__(
+        self,
+        path: str = CHECKPOINT_DB_PATH,
+        max_age_seconds: float = CHECKPOINT_MAX_AGE_SECONDS,
+        max_runs: int = CHECKPOINT_MAX_RUNS
+    ):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_age_seconds = max_age_seconds
+        self.max_runs = max_runs
+        # The saver serializes all access to the connection with its lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self.saver = SqliteSaver(self._conn, serde=RecordSerializer())
+        self.saver.setup()
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            "run_id TEXT PRIMARY KEY, topic TEXT NOT NULL, status TEXT NOT NULL, "
+            "error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+    
+    def _execute(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self.saver.lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.commit()
+        return rows
+    
+    def start(self, run_id: str, topic: str) -> None:
+        """
+        Record that a run started (or resumed)
+        
+        Args:
+            run_id: Run id
+            topic: Topic name
+        """
+        now = time.time()
+        self._execute(
+            "INSERT INTO runs (run_id, topic, status, error, created_at, updated_at) "
+            "VALUES (?, ?, 'running', NULL, ?, ?) "
+            "ON CONFLICT(run_id) DO UPDATE SET "
+            "status = 'running', error = NULL, updated_at = excluded.updated_at",
+            (run_id, topic, now, now)
+        )
+    
+    def finish(self, run_id: str, error: Optional[str] = None) -> None:
+        """
+        Record a run's outcome and apply the retention policy
+        
+        Args:
+            run_id: Run id
+            error: Error message if the run failed
+        """
+        status = 'failed' if error else 'succeeded'
+        self._execute(
+            "UPDATE runs SET status = ?, error = ?, updated_at = ? WHERE run_id = ?",
+            (status, error, time.time(), run_id)
+        )
+        if status == 'succeeded' and not CHECKPOINT_KEEP_SUCCEEDED:
+            self.saver.delete_thread(run_id)
+        self.prune()
+    
+    def get(self, run_id: str) -> Optional[Dict]:
+        """
+        Look up a run in the index
+        
+        Args:
+            run_id: Run id
+            
+        Returns:
+            Dict with run_id, topic, status, error, created_at and updated_at, or None
+        """
+        rows = self._execute(
+            "SELECT run_id, topic, status, error, created_at, updated_at FROM runs "
+            "WHERE run_id = ?", (run_id,)
+        )
+        return self._row(rows[0]) if rows else None
+    
+    def list_runs(self, limit: int = 20) -> List[Dict]:
+        """
+        List indexed runs, most recently updated first
+        
+        Args:
+            limit: Maximum runs to return
+            
+        Returns:
+            Run dicts as returned by get()
+        """
+        rows = self._execute(
+            "SELECT run_id, topic, status, error, created_at, updated_at FROM runs "
+            "ORDER BY updated_at DESC LIMIT ?",
+            (limit,)
+        )
+        return [self._row(row) for row in rows]
+    
+    def prune(self) -> int:
+        """
+        Delete checkpoints of runs outside the retention window
+        
+        Runs last updated more than max_age_seconds ago are removed, then
+        the oldest finished runs beyond max_runs.
+        
+        Returns:
+            Number of runs removed
+        """
+        expired = {row[0] for row in self._execute(
+            "SELECT run_id FROM runs WHERE updated_at < ?", (time.time() - self.max_age_seconds,)
+        )}
+        expired.update(row[0] for row in self._execute(
+            "SELECT run_id FROM runs WHERE status != 'running' "
+            "ORDER BY updated_at DESC LIMIT -1 OFFSET ?",
+            (self.max_runs,)
+        ))
+        
+        for run_id in expired:
+            self.saver.delete_thread(run_id)
+            self._execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+        return len(expired)
+    
+    @staticmethod
+    def _row(row: tuple) -> Dict:
+        run_id, topic, status, error, created_at, updated_at = row
+        return {
+            'run_id': run_id,
+            'topic': topic,
+            'status': status,
+            'error': error,
+            'created_at': datetime.fromtimestamp(created_at).isoformat(),
+            'updated_at': datetime.fromtimestamp(updated_at).isoformat()
+        }
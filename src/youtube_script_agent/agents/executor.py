@@ -3,22 +3,29 @@ Agent execution and scheduling
 """
 
 import os
-import schedule
+import sys
 import time
-import tweepy
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from langchain_anthropic import ChatAnthropic
 from typing import Dict, List, Optional
 
 from ..core.config import AgentConfig
-from ..core.state import create_initial_state
-from .workflow import build_agent
+from ..core.constants import SCHEDULER_OVERLAP_POLICY, SCHEDULER_WORKERS, TOPIC_WORKERS
+from ..utils.console import captured_output, write_direct
+from ..utils.file_manager import create_output_dir
+from ..utils.tracing import RunTrace
+from .checkpoints import new_run_id
+from .runtime import AgentRuntime, get_agent_runtime
+from .scheduler import TopicScheduler
 
 
 def run_agent_for_topic(
     topic: str, 
     config: AgentConfig, 
-    custom_config: Optional[Dict] = None
+    custom_config: Optional[Dict] = None,
+    run_id: Optional[str] = None,
+    show_metrics: bool = False
 ) -> Dict:
     """
     Run the agent for a specific topic
@@ -27,6 +34,8 @@ def run_agent_for_topic(
         topic: Topic name (e.g., 'nfl', 'nba')
         config: Agent configuration
         custom_config: Optional custom configuration overrides
+        run_id: Optional run id to checkpoint under (generated if omitted)
+        show_metrics: Also print the run's Prometheus metrics dump
         
     Returns:
         Final agent state
@@ -43,37 +52,138 @@ def run_agent_for_topic(
     if custom_config:
         topic_config_dict.update(custom_config)
     
-    # Initialize API clients
-    twitter_client = tweepy.Client(bearer_token=config.api.twitter_bearer_token)
-    llm = ChatAnthropic(
-        model=config.claude_model,
-        api_key=config.api.anthropic_api_key
-    )
+    # Create the output directory up front so scripts can stream into it
+    # (unless the caller already chose one)
+    if topic_config_dict.get('stream_scripts') and not topic_config_dict.get('output_dir'):
+        topic_config_dict['output_dir'] = str(create_output_dir(topic))
     
-    # Build and run agent
-    agent = build_agent(twitter_client, llm)
+    run_id = run_id or new_run_id(topic)
+    print(f"🔖 Run id: {run_id}")
     
-    # Initialize state
-    initial_state = create_initial_state(topic, topic_config_dict)
+    # Clients and the compiled graph are built once per process and reused
+    runtime, cold = get_agent_runtime(config)
+    try:
+        final_state, trace, run_overhead = runtime.invoke(topic, topic_config_dict, run_id)
+    except Exception:
+        print(f"\n↩️  Resume from the last completed step with: --resume {run_id}")
+        raise
     
-    # Run the agent
-    final_state = agent.invoke(initial_state)
+    print_runtime_reuse(runtime, cold, run_overhead)
+    print_trace_summary(trace, show_metrics)
+    return print_run_summary(final_state, trace, run_id)
+
+
+def resume_agent_run(
+    run_id: str,
+    config: AgentConfig,
+    show_metrics: bool = False
+) -> Optional[Dict]:
+    """
+    Resume a failed run from its last checkpoint
+    
+    Args:
+        run_id: Id printed when the run started
+        config: Agent configuration
+        show_metrics: Also print the Prometheus metrics dump of the resumed part
+        
+    Returns:
+        Final agent state, or None if the run failed again or cannot be resumed
+    """
+    print(f"\n{'='*80}")
+    print(f"↩️  Resuming run: {run_id}")
+    print(f"{'='*80}\n")
     
-    # Display results
+    runtime, cold = get_agent_runtime(config)
+    try:
+        final_state, trace, run_overhead = runtime.resume(run_id)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return None
+    except Exception:
+        print(f"\n↩️  Resume again with: --resume {run_id}")
+        raise
+    
+    print_runtime_reuse(runtime, cold, run_overhead)
+    print_trace_summary(trace, show_metrics)
+    return print_run_summary(final_state, trace, run_id)
+
+
+def print_runtime_reuse(runtime: AgentRuntime, cold: bool, run_overhead: float) -> None:
+    """
+    Print whether the run paid for client and graph setup
+    
+    Args:
+        runtime: Shared agent runtime
+        cold: Whether the runtime was created for this run
+        run_overhead: Per-run setup seconds
+    """
+    if cold:
+        print(f"\n⚙️  Runtime: cold start, {runtime.setup_seconds + run_overhead:.3f}s setup "
+              f"(clients and graph compile {runtime.setup_seconds:.3f}s)")
+    else:
+        print(f"\n⚙️  Runtime: warm (run {runtime.runs}), {run_overhead:.3f}s setup, "
+              f"{runtime.setup_seconds:.3f}s of client and graph setup reused")
+
+
+def print_trace_summary(trace: RunTrace, show_metrics: bool = False) -> None:
+    """
+    Print per-node timings, call counts, payload sizes and tokens of a run
+    
+    Args:
+        trace: Finished run trace
+        show_metrics: Also print the Prometheus metrics dump
+    """
+    node_time = sum(trace.node_seconds().values())
+    print(f"\n⏱️  NODE TIMINGS: run {trace.seconds:.2f}s, "
+          f"critical path {trace.critical_path_seconds:.2f}s, {node_time:.2f}s of node time")
+    print(f"  {'Node':<22}{'Time':>8}{'Twitter':>9}{'KB in':>9}{'LLM':>5}{'Cached':>8}"
+          f"{'Tokens in/out':>16}")
+    for node, counters in trace.nodes.items():
+        tokens = f"{counters['input_tokens']}/{counters['output_tokens']}"
+        print(f"  {node:<22}{counters['seconds']:>7.2f}s{counters['twitter_requests']:>9}"
+              f"{counters['twitter_response_bytes'] / 1024:>9.1f}{counters['llm_calls']:>5}"
+              f"{counters['llm_cache_hits']:>8}{tokens:>16}")
+    if trace.paths:
+        print(f"  🧾 Trace: {trace.paths[0]} (metrics: {trace.paths[1]})")
+    
+    if show_metrics:
+        print(f"\n{trace.prometheus()}", end='')
+
+
+def print_run_summary(final_state: Dict, trace: RunTrace, run_id: str) -> Optional[Dict]:
+    """
+    Print the execution summary of a finished run
+    
+    Args:
+        final_state: Final agent state
+        trace: Trace of the run (for its own LLM call and cache counts)
+        run_id: Run id (for the resume hint on errors)
+        
+    Returns:
+        The final state, or None if the run reported an error
+    """
     if final_state.get('error'):
         print(f"\n❌ Error: {final_state['error']}")
+        print(f"↩️  Resume from the last completed step with: --resume {run_id}")
         return None
     
     print("\n" + "="*80)
     print("📊 EXECUTION SUMMARY")
     print("="*80)
     
-    print(f"\n✅ Tweets Analyzed: {len(final_state['raw_tweets'])}")
+    tweets_analyzed = final_state.get('tweets_fetched', len(final_state['raw_tweets']))
+    print(f"\n✅ Tweets Analyzed: {tweets_analyzed}")
+    dedup_stats = final_state.get('dedup_stats') or {}
+    if dedup_stats:
+        print(f"✅ Unique Tweets: {dedup_stats['unique']} "
+              f"(collapse ratio {dedup_stats['collapse_ratio']:.1%})")
     print(f"✅ Quality Tweets: {len(final_state['filtered_tweets'])}")
     print(f"✅ Trending Hashtags: {', '.join(final_state['trending_hashtags'][:5])}")
     print(f"✅ Script Variants Generated: {len(final_state['script_variants'])}")
     print(f"✅ Media Suggestions: {len(final_state['media_suggestions'])}")
     print(f"✅ Claims Fact-Checked: {len(final_state['fact_check_results'])}")
+    totals = trace.totals()
+    print(f"✅ LLM Calls: {totals['llm_calls']} ({totals['llm_cache_hits']} served from cache)")
     
     print("\n📈 TOP TRENDING TOPICS:")
     for i, topic_item in enumerate(final_state['trending_topics'][:5], 1):
@@ -97,29 +207,175 @@ def run_agent_for_topic(
     return final_state
 
 
-def scheduled_job(topic: str, config: AgentConfig):
+def run_topic_captured(
+    topic: str,
+    config: AgentConfig,
+    custom_config: Optional[Dict],
+    run_id: Optional[str] = None
+) -> Dict:
+    """
+    Run one topic with its console output captured, never raising
+    
+    Args:
+        topic: Topic name
+        config: Agent configuration
+        custom_config: Optional custom configuration overrides
+        run_id: Optional run id to checkpoint under
+        
+    Returns:
+        Dict with topic, state, error, seconds and output
+    """
+    write_direct(f"▶️  {topic.upper()} started\n")
+    started = time.perf_counter()
+    error = None
+    final_state = None
+    
+    with captured_output() as output:
+        try:
+            final_state = run_agent_for_topic(topic, config, custom_config, run_id)
+            if final_state is None:
+                error = 'agent reported an error (see topic output)'
+        except Exception as e:
+            traceback.print_exc(file=sys.stdout)
+            error = f"{type(e).__name__}: {e}"
+    
+    seconds = time.perf_counter() - started
+    write_direct(f"{'⚠️ ' if error else '✔️ '} {topic.upper()} finished in {seconds:.1f}s\n")
+    return {
+        'topic': topic,
+        'state': final_state,
+        'error': error,
+        'seconds': seconds,
+        'output': output.getvalue()
+    }
+
+
+def print_combined_summary(results: List[Dict], wall_seconds: float) -> None:
+    """
+    Print one summary table across all topics of a concurrent run
+    
+    Args:
+        results: Results from run_topic_captured, in topic order
+        wall_seconds: Wall time of the whole run
+    """
+    print("\n" + "="*80)
+    print("📊 COMBINED SUMMARY")
+    print("="*80)
+    print(f"\n{'Topic':<12}{'Status':<9}{'Time':>8}{'Tweets':>9}{'Unique':>9}{'Quality':>9}"
+          f"{'Scripts':>9}{'Claims':>8}")
+    
+    for result in results:
+        state = result['state'] or {}
+        unique = (state.get('dedup_stats') or {}).get('unique', '-')
+        status = 'failed' if result['error'] else 'ok'
+        print(
+            f"{result['topic']:<12}{status:<9}{result['seconds']:>7.1f}s"
+            f"{state.get('tweets_fetched', len(state.get('raw_tweets', []))):>9}{unique:>9}"
+            f"{len(state.get('filtered_tweets', [])):>9}"
+            f"{len(state.get('script_variants', [])):>9}"
+            f"{len(state.get('fact_check_results', [])):>8}"
+        )
+    
+    for result in results:
+        if result['error']:
+            print(f"\n❌ {result['topic']}: {result['error']}")
+    
+    sequential = sum(result['seconds'] for result in results)
+    print(f"\n⏱️  Wall time {wall_seconds:.1f}s vs {sequential:.1f}s of topic time "
+          f"({sequential / max(wall_seconds, 1e-9):.1f}x)")
+    print("="*80 + "\n")
+
+
+def run_topics_concurrently(
+    topics: List[str],
+    config: AgentConfig,
+    custom_config: Optional[Dict] = None,
+    workers: int = TOPIC_WORKERS
+) -> Dict[str, Optional[Dict]]:
+    """
+    Run several topics in parallel threads
+    
+    Topics share the process-wide Twitter client (and its rate limits) and
+    the LLM cache. Each topic's console output is captured and printed as
+    one block when it finishes; a topic that fails or raises does not stop
+    the others. A combined summary is printed at the end.
+    
+    Args:
+        topics: Topics to run
+        config: Agent configuration
+        custom_config: Optional custom configuration overrides for every topic
+        workers: Maximum topics running at once
+        
+    Returns:
+        Final state per topic (None for failed topics)
+    """
+    workers = max(1, min(workers, len(topics)))
+    print(f"\n🚀 Running {len(topics)} topics with {workers} workers: {', '.join(topics)}\n")
+    
+    started = time.perf_counter()
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='topic') as executor:
+        futures = [
+            executor.submit(run_topic_captured, topic, config, custom_config) for topic in topics
+        ]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result['topic']] = result
+            status = 'failed' if result['error'] else 'ok'
+            print(f"\n{'─'*80}\n📄 {result['topic'].upper()} output "
+                  f"({status}, {result['seconds']:.1f}s)\n{'─'*80}")
+            print(result['output'], end='')
+    
+    print_combined_summary([results[topic] for topic in topics], time.perf_counter() - started)
+    return {topic: results[topic]['state'] for topic in topics}
+
+
+def scheduled_job(topic: str, config: AgentConfig) -> Optional[Dict]:
     """
     Job to run on schedule
     
+    Output is captured and printed as one block, since scheduled topics can
+    run at the same time.
+    
     Args:
         topic: Topic to run
         config: Agent configuration
+        
+    Returns:
+        Final agent state, or None if the run failed
     """
     print(f"\n⏰ Scheduled job triggered for {topic} at {datetime.now()}")
-    run_agent_for_topic(topic, config)
+    # Scheduled runs resume from the previous run's watermark
+    result = run_topic_captured(topic, config, {'incremental': True})
+    status = 'failed' if result['error'] else 'ok'
+    print(f"\n{'─'*80}\n📄 {topic.upper()} output ({status}, {result['seconds']:.1f}s)\n{'─'*80}")
+    print(result['output'], end='')
+    return result['state']
 
 
-def setup_automation(topics: List[str], config: AgentConfig):
+def setup_automation(
+    topics: List[str],
+    config: AgentConfig,
+    workers: int = SCHEDULER_WORKERS,
+    overlap_policy: str = SCHEDULER_OVERLAP_POLICY
+):
     """
     Set up automated scheduling for multiple topics
     
+    Jobs are dispatched at their due times to a pool of `workers` threads;
+    see TopicScheduler for the overlap policies.
+    
     Args:
         topics: List of topics to automate
         config: Agent configuration
+        workers: Maximum topics running at once
+        overlap_policy: 'skip', 'queue' or 'coalesce' when a topic is still running
     """
     print("\n🤖 SETTING UP AUTOMATION")
     print("="*80)
     
+    scheduler = TopicScheduler(lambda topic: scheduled_job(topic, config), workers, overlap_policy)
+    
     for topic in topics:
         try:
             topic_config = config.get_topic_config(topic)
@@ -130,34 +386,28 @@ def setup_automation(topics: List[str], config: AgentConfig):
         schedule_day = topic_config.schedule_day
         schedule_time = topic_config.schedule_time
         
-        if schedule_day == 'daily':
-            schedule.every().day.at(schedule_time).do(scheduled_job, topic=topic, config=config)
-            print(f"✅ {topic.upper()}: Daily at {schedule_time}")
-        elif schedule_day == 'monday':
-            schedule.every().monday.at(schedule_time).do(scheduled_job, topic=topic, config=config)
-            print(f"✅ {topic.upper()}: Every Monday at {schedule_time}")
-        elif schedule_day == 'tuesday':
-            schedule.every().tuesday.at(schedule_time).do(scheduled_job, topic=topic, config=config)
-            print(f"✅ {topic.upper()}: Every Tuesday at {schedule_time}")
-        elif schedule_day == 'wednesday':
-            schedule.every().wednesday.at(schedule_time).do(scheduled_job, topic=topic, config=config)
-            print(f"✅ {topic.upper()}: Every Wednesday at {schedule_time}")
-        elif schedule_day == 'thursday':
-            schedule.every().thursday.at(schedule_time).do(scheduled_job, topic=topic, config=config)
-            print(f"✅ {topic.upper()}: Every Thursday at {schedule_time}")
-        elif schedule_day == 'friday':
-            schedule.every().friday.at(schedule_time).do(scheduled_job, topic=topic, config=config)
-            print(f"✅ {topic.upper()}: Every Friday at {schedule_time}")
-        elif schedule_day == 'saturday':
-            schedule.every().saturday.at(schedule_time).do(scheduled_job, topic=topic, config=config)
-            print(f"✅ {topic.upper()}: Every Saturday at {schedule_time}")
-        elif schedule_day == 'sunday':
-            schedule.every().sunday.at(schedule_time).do(scheduled_job, topic=topic, config=config)
-            print(f"✅ {topic.upper()}: Every Sunday at {schedule_time}")
-    
-    print("\n🔄 Automation active. Press Ctrl+C to stop.\n")
+        try:
+            due = scheduler.add_topic(topic, schedule_day, schedule_time)
+        except ValueError as e:
+            print(f"⚠️ {topic}: {e}, skipping...")
+            continue
+        
+        when = 'Daily' if schedule_day == 'daily' else f"Every {schedule_day.capitalize()}"
+        print(f"✅ {topic.upper()}: {when} at {schedule_time} (next run {due:%Y-%m-%d %H:%M})")
+    
+    print(f"\n🔄 Automation active ({workers} workers, overlap policy: {overlap_policy}). "
+          "Press Ctrl+C to stop.\n")
     
     # Run scheduler
-    while True:
-        schedule.run_pending()
-        time.sleep(60)  # Check every minute
\ No newline at end of file
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping scheduler, waiting for running jobs...")
+        scheduler.stop(wait=True)
+    
+    print("\n📈 SCHEDULER METRICS")
+    for topic, metrics in scheduler.metrics().items():
+        print(f"  {topic}: {metrics['runs']} runs "
+              f"({metrics['failed']} failed, {metrics['dropped']} dropped), "
+              f"lateness mean {metrics['mean_lateness_seconds']}s, "
+              f"max {metrics['max_lateness_seconds']}s")
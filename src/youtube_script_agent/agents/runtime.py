@@ -0,0 +1,178 @@
+"""
+Long-lived agent runtime shared across runs
+"""
+
+import threading
+import time
+from itertools import chain
+from langchain_anthropic import ChatAnthropic
+from typing import Dict, Optional, Tuple
+
+from ..analyzers.claim_store import ClaimStore
+from ..core.config import AgentConfig
+from ..core.state import create_initial_state
+from ..scrapers.client_pool import get_twitter_client
+from ..utils.llm_cache import get_llm_cache
+from ..utils.tracing import LLMCallTracer, RunTrace, tracing
+from .checkpoints import RunCheckpoints, new_run_id
+from .workflow import build_agent, critical_path_seconds, run_config
+
+
+class AgentRuntime:
+    """
+    Process-lifetime holder of the API clients and the compiled graph
+    
+    Building the Twitter client, the Claude client (and their HTTP
+    connection pools) and compiling the LangGraph workflow happens once;
+    each run only builds its initial state and per-run config. Runs are
+    checkpointed under their run id so a failed run can be resumed, and
+    traced (see RunTrace) into TRACE_DIR.
+    """
+    
+    def __init__(self, config: AgentConfig):
+        started = time.perf_counter()
+        self.config = config
+        self.twitter_client = get_twitter_client(config.api.twitter_bearer_token)
+        self.llm_cache = get_llm_cache()
+        self.llm = ChatAnthropic(
+            model=config.claude_model,
+            api_key=config.api.anthropic_api_key,
+            cache=self.llm_cache,
+            callbacks=[LLMCallTracer()]
+        )
+        self.claim_store = ClaimStore()
+        self.checkpoints = RunCheckpoints()
+        self.checkpoints.prune()
+        self.agent = build_agent(
+            self.twitter_client, self.llm, self.claim_store, self.checkpoints.saver
+        )
+        self.setup_seconds = time.perf_counter() - started
+        self.runs = 0
+        self._lock = threading.Lock()
+    
+    def invoke(
+        self,
+        topic: str,
+        topic_config: Dict,
+        run_id: Optional[str] = None
+    ) -> Tuple[Dict, RunTrace, float]:
+        """
+        Run the agent for one topic
+        
+        Args:
+            topic: Topic name
+            topic_config: Complete topic configuration for this run
+            run_id: Run id to checkpoint under (generated if omitted)
+            
+        Returns:
+            Tuple of (final state, run trace, seconds of per-run setup before the graph started)
+        """
+        started = time.perf_counter()
+        run_id = run_id or new_run_id(topic)
+        initial_state = create_initial_state(topic, topic_config)
+        config = run_config(cache_bypass=topic_config.get('llm_cache_bypass', []), run_id=run_id)
+        overhead = time.perf_counter() - started
+        
+        self.checkpoints.start(run_id, topic)
+        final_state, trace = self._run(run_id, topic, initial_state, config)
+        return final_state, trace, overhead
+    
+    def resume(self, run_id: str) -> Tuple[Dict, RunTrace, float]:
+        """
+        Continue a failed run from its last completed step
+        
+        Nodes that finished before the failure are not run again; their
+        outputs come from the checkpoint. When a node reported an error in
+        the state (rather than raising), the run rewinds to the step before
+        the error was recorded and repeats from there.
+        
+        Args:
+            run_id: Id of the failed run
+            
+        Returns:
+            Tuple of (final state, trace of the resumed part, seconds spent
+            locating the checkpoint)
+            
+        Raises:
+            ValueError: If the run has no checkpoints or already completed
+        """
+        started = time.perf_counter()
+        history = self.agent.get_state_history({'configurable': {'thread_id': run_id}})
+        latest = next(history, None)
+        if latest is None:
+            run = self.checkpoints.get(run_id)
+            if run and run['status'] == 'succeeded':
+                raise ValueError(f"Run {run_id} already completed")
+            raise ValueError(f"No checkpoints for run {run_id} (unknown or pruned)")
+        if not latest.next and not latest.values.get('error'):
+            raise ValueError(f"Run {run_id} already completed")
+        
+        checkpoint = next(
+            (snapshot for snapshot in chain([latest], history)
+             if snapshot.next and not snapshot.values.get('error')),
+            None
+        )
+        if checkpoint is None:
+            raise ValueError(f"Run {run_id} has no checkpoint to resume from")
+        
+        topic = latest.values['topic']
+        config = run_config(
+            cache_bypass=latest.values['config'].get('llm_cache_bypass', []), run_id=run_id
+        )
+        config['configurable'].update(checkpoint.config['configurable'])
+        overhead = time.perf_counter() - started
+        
+        print(f"↩️  Resuming {topic.upper()} run {run_id} at: {', '.join(checkpoint.next)}")
+        self.checkpoints.start(run_id, topic)
+        final_state, trace = self._run(run_id, topic, None, config, resumed=True)
+        return final_state, trace, overhead
+    
+    def _run(
+        self,
+        run_id: str,
+        topic: str,
+        graph_input: Optional[Dict],
+        config: Dict,
+        resumed: bool = False
+    ) -> Tuple[Dict, RunTrace]:
+        with self._lock:
+            self.runs += 1
+        trace = RunTrace(run_id, topic, resumed)
+        try:
+            with tracing(trace):
+                final_state = self.agent.invoke(graph_input, config=config)
+        except Exception as e:
+            self.checkpoints.finish(run_id, f"{type(e).__name__}: {e}")
+            self._save_trace(trace)
+            raise
+        self.checkpoints.finish(run_id, final_state.get('error'))
+        self._save_trace(trace)
+        return final_state, trace
+    
+    @staticmethod
+    def _save_trace(trace: RunTrace) -> None:
+        trace.critical_path_seconds = round(critical_path_seconds(trace.node_seconds()), 4)
+        trace.save()
+
+
+_runtimes: Dict[Tuple, AgentRuntime] = {}
+_runtimes_lock = threading.Lock()
+
+
+def get_agent_runtime(config: AgentConfig) -> Tuple[AgentRuntime, bool]:
+    """
+    Get the shared runtime for a configuration, creating it on first use
+    
+    Args:
+        config: Agent configuration
+        
+    Returns:
+        Tuple of (runtime, whether it was created by this call)
+    """
+    key = (config.api.twitter_bearer_token, config.api.anthropic_api_key, config.claude_model)
+    with _runtimes_lock:
+        runtime = _runtimes.get(key)
+        if runtime is not None:
+            return runtime, False
+        runtime = _runtimes[key] = AgentRuntime(config)
+        return runtime, True
@@ -0,0 +1,237 @@
+"""
+Event-driven topic scheduler
+"""
+
+import heapq
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from ..core.constants import (
+    SCHEDULER_MAX_SLEEP_SECONDS,
+    SCHEDULER_OVERLAP_POLICY,
+    SCHEDULER_WORKERS
+)
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+OVERLAP_POLICIES = ('skip', 'queue', 'coalesce')
+
+
+def next_run_time(schedule_day: str, schedule_time: str, after: datetime) -> datetime:
+    """
+    Compute the next due time of a daily or weekly schedule
+    
+    Args:
+        schedule_day: 'daily' or a weekday name
+        schedule_time: Local time of day as HH:MM
+        after: Earliest time to consider (exclusive)
+        
+    Returns:
+        Next due time in local time
+    """
+    hour, minute = (int(part) for part in schedule_time.split(':'))
+    due = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    
+    if schedule_day == 'daily':
+        return due if due > after else due + timedelta(days=1)
+    
+    if schedule_day not in WEEKDAYS:
+        raise ValueError(f"Unknown schedule day: {schedule_day}")
+    days_ahead = (WEEKDAYS.index(schedule_day) - after.weekday()) % 7
+    due += timedelta(days=days_ahead)
+    return due if due > after else due + timedelta(days=7)
+
+
+class TopicScheduler:
+    """
+    Runs topic jobs at their due times on a bounded worker pool
+    
+    The dispatcher thread sleeps until the earliest due time instead of
+    polling, then hands the job to the pool so a long run never delays
+    other topics. When a topic is still running at its next due time, the
+    overlap policy decides what happens:
+    
+    - skip: drop the new run
+    - queue: run every missed occurrence after the current one, in order
+    - coalesce: run once after the current one, however many came due
+    
+    Each run records its lateness (start time minus due time).
+    """
+    
+    def __init__(
+        self,
+        job: Callable[[str], Optional[Dict]],
+        workers: int = SCHEDULER_WORKERS,
+        overlap_policy: str = SCHEDULER_OVERLAP_POLICY
+    ):
+        if overlap_policy not in OVERLAP_POLICIES:
+            raise ValueError(
+                f"Unknown overlap policy: {overlap_policy} "
+                f"(expected one of {', '.join(OVERLAP_POLICIES)})"
+            )
+        
+        self.job = job
+        self.overlap_policy = overlap_policy
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scheduled')
+        self._schedules: Dict[str, Tuple[str, str]] = {}
+        self._heap: List[Tuple[datetime, str]] = []
+        self._running: Dict[str, datetime] = {}
+        self._pending: Dict[str, Deque[datetime]] = {}
+        self._runs: List[Dict] = []
+        self._dropped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+    
+    def add_topic(
+        self,
+        topic: str,
+        schedule_day: str,
+        schedule_time: str,
+        now: Optional[datetime] = None
+    ) -> datetime:
+        """
+        Register a topic's schedule
+        
+        Args:
+            topic: Topic name
+            schedule_day: 'daily' or a weekday name
+            schedule_time: Local time of day as HH:MM
+            now: Current time (defaults to datetime.now())
+            
+        Returns:
+            First due time
+        """
+        due = next_run_time(schedule_day, schedule_time, now or datetime.now())
+        with self._lock:
+            self._schedules[topic] = (schedule_day, schedule_time)
+            heapq.heappush(self._heap, (due, topic))
+        self._wakeup.set()
+        return due
+    
+    def run_forever(self) -> None:
+        """
+        Dispatch jobs as they come due until stop() is called
+        """
+        while not self._stopped:
+            with self._lock:
+                due, topic = self._heap[0] if self._heap else (None, None)
+            
+            if due is None:
+                self._wait(SCHEDULER_MAX_SLEEP_SECONDS)
+                continue
+            
+            remaining = (due - datetime.now()).total_seconds()
+            if remaining > 0:
+                # Capped so wall-clock changes (DST, NTP) are picked up
+                self._wait(min(remaining, SCHEDULER_MAX_SLEEP_SECONDS))
+                continue
+            
+            with self._lock:
+                heapq.heappop(self._heap)
+                heapq.heappush(self._heap, (next_run_time(*self._schedules[topic], due), topic))
+            self._dispatch(topic, due)
+    
+    def stop(self, wait: bool = True) -> None:
+        """
+        Stop dispatching and shut down the worker pool
+        
+        Args:
+            wait: Wait for running jobs to finish
+        """
+        self._stopped = True
+        self._wakeup.set()
+        self._pool.shutdown(wait=wait)
+    
+    def _wait(self, seconds: float) -> None:
+        self._wakeup.wait(timeout=seconds)
+        self._wakeup.clear()
+    
+    def _dispatch(self, topic: str, due: datetime) -> None:
+        with self._lock:
+            if topic not in self._running:
+                self._start(topic, due)
+                return
+            
+            pending = self._pending.setdefault(topic, deque())
+            coalesce = self.overlap_policy == 'coalesce' and not pending
+            if self.overlap_policy == 'queue' or coalesce:
+                pending.append(due)
+                action = 'queued'
+            else:
+                self._dropped[topic] = self._dropped.get(topic, 0) + 1
+                action = 'skipped' if self.overlap_policy == 'skip' else 'coalesced'
+        
+        print(f"⏭️  {topic.upper()} due at {due:%H:%M} while still running: {action}")
+    
+    def _start(self, topic: str, due: datetime) -> None:
+        # Called with the lock held
+        self._running[topic] = due
+        self._pool.submit(self._run, topic, due)
+    
+    def _run(self, topic: str, due: datetime) -> None:
+        started = datetime.now()
+        clock = time.perf_counter()
+        status = 'ok'
+        try:
+            if self.job(topic) is None:
+                status = 'failed'
+        except Exception as e:
+            status = 'failed'
+            print(f"❌ Scheduled job for {topic} raised: {e}")
+        
+        run = {
+            'topic': topic,
+            'due_at': due.isoformat(),
+            'started_at': started.isoformat(),
+            'lateness_seconds': round((started - due).total_seconds(), 3),
+            'duration_seconds': round(time.perf_counter() - clock, 3),
+            'status': status
+        }
+        with self._lock:
+            self._runs.append(run)
+            del self._running[topic]
+            pending = self._pending.get(topic)
+            if pending and not self._stopped:
+                self._start(topic, pending.popleft())
+        
+        print(f"⏰ {topic.upper()} run finished ({status}) in {run['duration_seconds']:.1f}s, "
+              f"started {run['lateness_seconds']:.1f}s after due")
+    
+    def metrics(self) -> Dict[str, Dict]:
+        """
+        Summarize job lateness and overlap handling per topic
+        
+        Returns:
+            Per-topic dict with runs, failures, dropped runs (skipped or
+            coalesced), pending runs, and mean and max lateness in seconds
+        """
+        with self._lock:
+            runs = list(self._runs)
+            summary = {}
+            for topic in self._schedules:
+                topic_runs = [run for run in runs if run['topic'] == topic]
+                lateness = [run['lateness_seconds'] for run in topic_runs]
+                mean_lateness = round(sum(lateness) / len(lateness), 3) if lateness else None
+                summary[topic] = {
+                    'runs': len(lateness),
+                    'failed': sum(1 for run in topic_runs if run['status'] != 'ok'),
+                    'dropped': self._dropped.get(topic, 0),
+                    'pending': len(self._pending.get(topic, ())),
+                    'mean_lateness_seconds': mean_lateness,
+                    'max_lateness_seconds': max(lateness) if lateness else None
+                }
+        return summary
+    
+    def next_due(self) -> List[Tuple[datetime, str]]:
+        """
+        List the upcoming due time of every topic
+        
+        Returns:
+            (due time, topic) pairs, soonest first
+        """
+        with self._lock:
+            return sorted(self._heap)
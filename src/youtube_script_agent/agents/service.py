@@ -0,0 +1,631 @@
+"""
+Local HTTP job service for topic runs
+"""
+
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from ..core.config import AgentConfig
+from ..core.constants import (
+    SCRIPT_VARIANTS, SENTIMENT_LLM_MODES, SERVICE_HOST, SERVICE_LATENCY_WINDOW,
+    SERVICE_MAX_BODY_BYTES, SERVICE_PORT, SERVICE_QUEUE_SIZE, SERVICE_RECENT_RUNS, SERVICE_WORKERS
+)
+from ..core.records import to_json
+from ..utils.file_manager import create_output_dir
+from .executor import run_topic_captured
+
+# Overrides a submitted run may set, with their expected types (the same
+# settings the CLI exposes as flags)
+OVERRIDE_TYPES = {
+    'engagement_threshold': int,
+    'follower_threshold': int,
+    'video_length': str,
+    'tone': str,
+    'script_variant_count': int,
+    'max_tweets': int,
+    'stream_scripts': bool,
+    'llm_cache_bypass': list,
+    'incremental': bool,
+    'sentiment_llm': str
+}
+# Inclusive bounds for numeric overrides
+OVERRIDE_RANGES = {
+    'script_variant_count': (1, len(SCRIPT_VARIANTS))
+}
+# Allowed values for string overrides
+OVERRIDE_CHOICES = {
+    'sentiment_llm': SENTIMENT_LLM_MODES
+}
+FINISHED_STATUSES = ('succeeded', 'failed', 'cancelled')
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class QueueFullError(Exception):
+    """Raised when a run is submitted while the queue is at capacity"""
+
+
+def validate_overrides(overrides: Dict) -> Dict:
+    """
+    Check submitted config overrides against the allowed settings
+    
+    Args:
+        overrides: Overrides from the request body
+        
+    Returns:
+        The overrides, unchanged
+    
+    Raises:
+        ValueError: On unknown settings, wrong value types, out-of-range values or
+            unsupported choices
+    """
+    if not isinstance(overrides, dict):
+        raise ValueError("overrides must be an object")
+    
+    for key, value in overrides.items():
+        expected = OVERRIDE_TYPES.get(key)
+        if expected is None:
+            raise ValueError(
+                f"Unknown override: {key} (allowed: {', '.join(sorted(OVERRIDE_TYPES))})"
+            )
+        # bool is an int subclass, so check it explicitly
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            raise ValueError(f"Override {key} must be of type {expected.__name__}")
+        bounds = OVERRIDE_RANGES.get(key)
+        if bounds and not bounds[0] <= value <= bounds[1]:
+            raise ValueError(f"Override {key} must be between {bounds[0]} and {bounds[1]}")
+        choices = OVERRIDE_CHOICES.get(key)
+        if choices and value not in choices:
+            raise ValueError(f"Override {key} must be one of: {', '.join(choices)}")
+    return overrides
+
+
+def summarize_outputs(state: Dict, output_dir: str) -> Dict:
+    """
+    Summarize a finished run for status queries
+    
+    Args:
+        state: Final agent state
+        output_dir: Directory the run saved its files to
+        
+    Returns:
+        Dict with counts, script variants and saved file names
+    """
+    directory = Path(output_dir)
+    return {
+        'output_dir': output_dir,
+        'files': sorted(path.name for path in directory.iterdir()) if directory.is_dir() else [],
+        'tweets_analyzed': state.get('tweets_fetched', len(state.get('raw_tweets', []))),
+        'unique_tweets': (state.get('dedup_stats') or {}).get('unique'),
+        'quality_tweets': len(state.get('filtered_tweets', [])),
+        'trending_hashtags': state.get('trending_hashtags', [])[:5],
+        'claims_fact_checked': len(state.get('fact_check_results', [])),
+        'script_variants': [
+            {'variant_name': variant['variant_name'], 'word_count': variant['word_count']}
+            for variant in state.get('script_variants', [])
+        ]
+    }
+
+
+def latency_summary(samples: List[float]) -> Dict:
+    """
+    Quantiles, sum and count of latency samples
+    
+    Args:
+        samples: Latencies in seconds
+        
+    Returns:
+        Dict with count, sum and quantiles (None when there are no samples)
+    """
+    values = np.asarray(samples, dtype=float)
+    if values.size:
+        quantiles = np.quantile(values, LATENCY_QUANTILES)
+    else:
+        quantiles = [None] * len(LATENCY_QUANTILES)
+    return {
+        'count': int(values.size),
+        'sum': round(float(values.sum()), 3),
+        'quantiles': {
+            str(q): (round(float(value), 3) if value is not None else None)
+            for q, value in zip(LATENCY_QUANTILES, quantiles)
+        }
+    }
+
+
+class RunService:
+    """
+    Bounded in-process queue of topic runs served by a worker pool
+    
+    Submissions beyond the queue capacity are rejected instead of piling up
+    (admission control). Runs reuse the process-wide agent runtime, so
+    clients and the compiled graph are shared by all requests. The most
+    recent runs are kept in memory with their status, outputs and console
+    log. Service run ids double as checkpoint run ids, so a failed run can
+    be resumed with --resume <id>.
+    """
+    
+    def __init__(
+        self,
+        config: AgentConfig,
+        workers: int = SERVICE_WORKERS,
+        queue_size: int = SERVICE_QUEUE_SIZE,
+        base_overrides: Optional[Dict] = None
+    ):
+        self.config = config
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.base_overrides = dict(base_overrides or {})
+        self._queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self._runs: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._run_seconds: Deque[float] = deque(maxlen=SERVICE_LATENCY_WINDOW)
+        self._queue_seconds: Deque[float] = deque(maxlen=SERVICE_LATENCY_WINDOW)
+        self._counts = {'submitted': 0, 'rejected': 0, 'succeeded': 0, 'failed': 0, 'cancelled': 0}
+        self._running = 0
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f'service-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+    
+    def submit(self, topic: str, overrides: Optional[Dict] = None) -> Dict:
+        """
+        Queue a run for a topic
+        
+        Args:
+            topic: Topic name
+            overrides: Optional topic config overrides for this run
+            
+        Returns:
+            Public view of the queued run
+        
+        Raises:
+            ValueError: On an unknown topic or invalid overrides
+            QueueFullError: When the queue is at capacity
+        """
+        self.config.get_topic_config(topic)
+        overrides = validate_overrides(overrides or {})
+        
+        run = {
+            'id': uuid.uuid4().hex[:12],
+            'topic': topic,
+            'overrides': overrides,
+            'status': 'queued',
+            'submitted_at': datetime.now().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'queue_seconds': None,
+            'run_seconds': None,
+            'error': None,
+            'outputs': None,
+            '_enqueued': time.perf_counter(),
+            '_final_output': None,
+            '_log': ''
+        }
+        
+        with self._lock:
+            if self._stopped:
+                raise QueueFullError("service is shutting down")
+            try:
+                self._queue.put_nowait(run)
+            except queue.Full:
+                self._counts['rejected'] += 1
+                raise QueueFullError(f"run queue is full ({self.queue_size} waiting)")
+            self._counts['submitted'] += 1
+            self._runs[run['id']] = run
+            self._trim()
+        
+        print(f"📥 Queued {topic.upper()} run {run['id']} ({self._queue.qsize()} waiting)")
+        return self._public(run)
+    
+    def get(self, run_id: str) -> Optional[Dict]:
+        """
+        Look up a run
+        
+        Args:
+            run_id: Run id returned by submit()
+            
+        Returns:
+            Public view of the run, or None if unknown or evicted
+        """
+        with self._lock:
+            run = self._runs.get(run_id)
+            return self._public(run) if run else None
+    
+    def final_output(self, run_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Get a run together with its full final output
+        
+        Args:
+            run_id: Run id
+            
+        Returns:
+            Tuple of (public view of the run or None, final output or None)
+        """
+        with self._lock:
+            run = self._runs.get(run_id)
+            return (self._public(run), run['_final_output']) if run else (None, None)
+    
+    def log(self, run_id: str) -> Optional[str]:
+        """
+        Get the captured console output of a run
+        
+        Args:
+            run_id: Run id
+            
+        Returns:
+            Console output so far (empty until the run finishes), or None if unknown
+        """
+        with self._lock:
+            run = self._runs.get(run_id)
+            return run['_log'] if run else None
+    
+    def list_runs(
+        self,
+        limit: int = 20,
+        topic: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        List recent runs, newest first
+        
+        Args:
+            limit: Maximum runs to return
+            topic: Only runs for this topic
+            status: Only runs with this status
+            
+        Returns:
+            Public views of the matching runs
+        """
+        with self._lock:
+            runs = [
+                self._public(run) for run in reversed(self._runs.values())
+                if (topic is None or run['topic'] == topic)
+                and (status is None or run['status'] == status)
+            ]
+        return runs[:max(limit, 0)]
+    
+    def metrics(self) -> Dict:
+        """
+        Queue and latency metrics
+        
+        Returns:
+            Dict with queue depth and capacity, runs in flight, run counts
+            by outcome, and queue wait and run latency summaries over the
+            most recent finished runs
+        """
+        with self._lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'queue_capacity': self.queue_size,
+                'running': self._running,
+                'workers': self.workers,
+                'runs': dict(self._counts),
+                'queue_seconds': latency_summary(list(self._queue_seconds)),
+                'run_seconds': latency_summary(list(self._run_seconds))
+            }
+    
+    def stop(self, wait: bool = True) -> None:
+        """
+        Stop accepting runs, cancel queued ones and stop the workers
+        
+        Args:
+            wait: Wait for running runs to finish
+        """
+        with self._lock:
+            self._stopped = True
+        
+        while True:
+            try:
+                run = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                run['status'] = 'cancelled'
+                run['finished_at'] = datetime.now().isoformat()
+                self._counts['cancelled'] += 1
+        
+        for _ in self._threads:
+            self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+    
+    def _worker(self) -> None:
+        while True:
+            run = self._queue.get()
+            if run is None:
+                return
+            self._execute(run)
+    
+    def _execute(self, run: Dict) -> None:
+        with self._lock:
+            run['status'] = 'running'
+            run['started_at'] = datetime.now().isoformat()
+            run['queue_seconds'] = round(time.perf_counter() - run['_enqueued'], 3)
+            self._queue_seconds.append(run['queue_seconds'])
+            self._running += 1
+        
+        started = time.perf_counter()
+        status = 'failed'
+        try:
+            output_dir = str(create_output_dir(run['topic'], run['id']))
+            overrides = {**self.base_overrides, **run['overrides'], 'output_dir': output_dir}
+            result = run_topic_captured(run['topic'], self.config, overrides, run['id'])
+            
+            state = result['state']
+            status = 'failed' if result['error'] else 'succeeded'
+            with self._lock:
+                run['error'] = result['error']
+                run['outputs'] = summarize_outputs(state, output_dir) if state else None
+                run['_final_output'] = state.get('final_output') if state else None
+                run['_log'] = result['output']
+        except Exception as e:
+            # Anything outside the captured run (output dir, summary) still fails the run
+            with self._lock:
+                run['error'] = str(e)
+        finally:
+            with self._lock:
+                run['status'] = status
+                run['finished_at'] = datetime.now().isoformat()
+                run['run_seconds'] = round(time.perf_counter() - started, 3)
+                self._run_seconds.append(run['run_seconds'])
+                self._counts[status] += 1
+                self._running -= 1
+                self._trim()
+    
+    def _trim(self) -> None:
+        # Called with the lock held; queued and running runs are never evicted
+        excess = len(self._runs) - SERVICE_RECENT_RUNS
+        finished = [
+            run_id for run_id, run in self._runs.items() if run['status'] in FINISHED_STATUSES
+        ]
+        for run_id in finished:
+            if excess <= 0:
+                break
+            del self._runs[run_id]
+            excess -= 1
+    
+    @staticmethod
+    def _public(run: Dict) -> Dict:
+        return {key: value for key, value in run.items() if not key.startswith('_')}
+
+
+def prometheus_metrics(metrics: Dict) -> str:
+    """
+    Render service metrics in the Prometheus text exposition format
+    
+    Args:
+        metrics: Output of RunService.metrics()
+        
+    Returns:
+        Metrics text
+    """
+    lines = [
+        '# HELP yts_service_queue_depth Runs waiting in the queue',
+        '# TYPE yts_service_queue_depth gauge',
+        f"yts_service_queue_depth {metrics['queue_depth']}",
+        '# HELP yts_service_queue_capacity Maximum runs waiting before submissions are rejected',
+        '# TYPE yts_service_queue_capacity gauge',
+        f"yts_service_queue_capacity {metrics['queue_capacity']}",
+        '# HELP yts_service_running Runs in flight',
+        '# TYPE yts_service_running gauge',
+        f"yts_service_running {metrics['running']}",
+        '# HELP yts_service_runs_total Runs by outcome',
+        '# TYPE yts_service_runs_total counter'
+    ]
+    lines += [
+        f'yts_service_runs_total{{outcome="{outcome}"}} {count}'
+        for outcome, count in metrics['runs'].items()
+    ]
+    
+    summaries = (('queue_seconds', 'Time runs waited in the queue'), ('run_seconds', 'Run latency'))
+    for name, help_text in summaries:
+        summary = metrics[name]
+        lines += [f'# HELP yts_service_{name} {help_text}', f'# TYPE yts_service_{name} summary']
+        lines += [
+            f'yts_service_{name}{{quantile="{q}"}} {value if value is not None else "NaN"}'
+            for q, value in summary['quantiles'].items()
+        ]
+        lines += [
+            f"yts_service_{name}_sum {summary['sum']}",
+            f"yts_service_{name}_count {summary['count']}"
+        ]
+    
+    return '\n'.join(lines) + '\n'
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API over a RunService
+    
+    POST /runs                 submit {"topic": ..., "overrides": {...}}
+    GET  /runs                 recent runs (?limit=, ?topic=, ?status=)
+    GET  /runs/<id>            status and output summary
+    GET  /runs/<id>/output     full final output
+    GET  /runs/<id>/log        captured console output
+    GET  /metrics              Prometheus text (?format=json for JSON)
+    GET  /health               liveness
+    """
+    
+    service: RunService = None
+    server_version = 'YouTubeScriptAgent'
+    
+    def do_POST(self):
+        path = urlparse(self.path).path.rstrip('/')
+        if path != '/runs':
+            return self._send_json(HTTPStatus.NOT_FOUND, {'error': f"No route for POST {path}"})
+        
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > SERVICE_MAX_BODY_BYTES:
+            return self._send_json(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'Request body too large'}
+            )
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError as e:
+            return self._send_json(HTTPStatus.BAD_REQUEST, {'error': f"Invalid JSON: {e}"})
+        
+        if not isinstance(body, dict) or not isinstance(body.get('topic'), str):
+            return self._send_json(
+                HTTPStatus.BAD_REQUEST, {'error': 'Body must be an object with a "topic" string'}
+            )
+        
+        try:
+            run = self.service.submit(body['topic'], body.get('overrides'))
+        except ValueError as e:
+            return self._send_json(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+        except QueueFullError as e:
+            return self._send_json(
+                HTTPStatus.TOO_MANY_REQUESTS, {'error': str(e)}, {'Retry-After': '30'}
+            )
+        
+        self._send_json(HTTPStatus.ACCEPTED, run, {'Location': f"/runs/{run['id']}"})
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        
+        if parts == ['health']:
+            return self._send_json(HTTPStatus.OK, {'status': 'ok'})
+        
+        if parts == ['metrics']:
+            metrics = self.service.metrics()
+            if query.get('format') == 'json':
+                return self._send_json(HTTPStatus.OK, metrics)
+            return self._send(
+                HTTPStatus.OK, prometheus_metrics(metrics).encode(), 'text/plain; version=0.0.4'
+            )
+        
+        if parts == ['runs']:
+            try:
+                limit = int(query.get('limit', 20))
+            except ValueError:
+                return self._send_json(
+                    HTTPStatus.BAD_REQUEST, {'error': 'limit must be an integer'}
+                )
+            runs = self.service.list_runs(limit, query.get('topic'), query.get('status'))
+            return self._send_json(HTTPStatus.OK, {'runs': runs})
+        
+        if len(parts) == 2 and parts[0] == 'runs':
+            run = self.service.get(parts[1])
+        elif len(parts) == 3 and parts[0] == 'runs' and parts[2] == 'output':
+            run, final_output = self.service.final_output(parts[1])
+            if run:
+                return self._send_json(HTTPStatus.OK, {**run, 'final_output': final_output})
+        elif len(parts) == 3 and parts[0] == 'runs' and parts[2] == 'log':
+            log = self.service.log(parts[1])
+            if log is not None:
+                return self._send(HTTPStatus.OK, log.encode('utf-8'), 'text/plain; charset=utf-8')
+            run = None
+        else:
+            return self._send_json(HTTPStatus.NOT_FOUND, {'error': f"No route for GET {url.path}"})
+        
+        if run is None:
+            return self._send_json(HTTPStatus.NOT_FOUND, {'error': f"Unknown run: {parts[1]}"})
+        self._send_json(HTTPStatus.OK, run)
+    
+    def log_request(self, code='-', size='-'):
+        # Status polling would flood the console; only log submissions and errors
+        if self.command != 'GET' or (isinstance(code, int) and code >= 400):
+            print(f"🌐 {self.command} {self.path} → {int(code) if isinstance(code, int) else code}")
+    
+    def _send_json(self, status: int, payload, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, default=to_json).encode('utf-8')
+        self._send(status, body, 'application/json', headers)
+    
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_server(
+    service: RunService,
+    host: str = SERVICE_HOST,
+    port: int = SERVICE_PORT
+) -> ThreadingHTTPServer:
+    """
+    Bind the HTTP API for a run service
+    
+    Args:
+        service: Run service handling the requests
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        
+    Returns:
+        Server ready for serve_forever()
+    """
+    handler = type('BoundServiceRequestHandler', (ServiceRequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(
+    config: AgentConfig,
+    host: str = SERVICE_HOST,
+    port: int = SERVICE_PORT,
+    workers: int = SERVICE_WORKERS,
+    queue_size: int = SERVICE_QUEUE_SIZE,
+    base_overrides: Optional[Dict] = None
+) -> None:
+    """
+    Run the local HTTP job service until interrupted
+    
+    Args:
+        config: Agent configuration
+        host: Interface to bind
+        port: Port to bind
+        workers: Runs in flight at once
+        queue_size: Runs allowed to wait before submissions are rejected
+        base_overrides: Config overrides applied to every run (request
+            overrides take precedence)
+    """
+    service = RunService(config, workers, queue_size, base_overrides)
+    server = create_server(service, host, port)
+    
+    print("\n🌐 JOB SERVICE")
+    print("="*80)
+    print(f"✅ Listening on http://{host}:{server.server_address[1]} "
+          f"({service.workers} workers, queue of {service.queue_size})")
+    print("   POST /runs · GET /runs · GET /runs/<id> · GET /metrics. Press Ctrl+C to stop.\n")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping service, waiting for running jobs...")
+    finally:
+        server.server_close()
+        service.stop(wait=True)
+    
+    metrics = service.metrics()
+    print(f"\n📈 SERVICE METRICS: {metrics['runs']['succeeded']} succeeded, "
+          f"{metrics['runs']['failed']} failed, "
+          f"{metrics['runs']['rejected']} rejected, {metrics['runs']['cancelled']} cancelled; "
+          f"run p95 {metrics['run_seconds']['quantiles']['0.95']}s, "
+          f"queue wait p95 {metrics['queue_seconds']['quantiles']['0.95']}s")
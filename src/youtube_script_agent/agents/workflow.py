@@ -2,61 +2,309 @@
 LangGraph workflow builder
 """
 
-from langgraph.graph import StateGraph, END
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.graph import StateGraph, START, END
 import tweepy
 from langchain_anthropic import ChatAnthropic
+from typing import Annotated, Callable, Dict, Iterable, List, Optional
 
 from ..core.state import AgentState
+from ..core.records import TweetRecord
+from ..scrapers.corpus import TweetCorpus
+from ..scrapers.watermarks import WatermarkStore
 from ..scrapers.hashtags import discover_trending_hashtags
 from ..scrapers.twitter import scrape_enhanced_tweets
 from ..scrapers.comments import scrape_comments_detailed
+from ..utils.dedup import dedupe_tweets
 from ..utils.filters import filter_quality_tweets_advanced
+from ..analyzers.claim_store import ClaimStore
 from ..analyzers.competitor import analyze_competitors
 from ..analyzers.fact_checker import fact_check_claims
 from ..analyzers.sentiment import analyze_sentiment_advanced
 from ..generators.media import generate_media_suggestions
 from ..generators.scripts import generate_multiple_script_variants
 from ..utils.file_manager import compile_final_output, save_outputs
+from ..utils.tracing import trace_node
 
 
-def build_agent(twitter_client: tweepy.Client, llm: ChatAnthropic):
+def merge_filtered_tweets(
+    current: List[TweetRecord],
+    update: List[TweetRecord]
+) -> List[TweetRecord]:
+    """
+    Reducer for filtered_tweets when parallel branches write it in the same step
+    
+    The first write (from filter_tweets) sets the list. After that, branches
+    may only narrow and annotate it: the result keeps the update's order,
+    restricted to tweets already present, with annotations from either side.
+    
+    Args:
+        current: Current filtered_tweets value
+        update: Value written by a node
+        
+    Returns:
+        Merged filtered_tweets
+    """
+    if not current:
+        return update
+    
+    by_id = {tweet.id: tweet for tweet in current}
+    merged = []
+    for tweet in update:
+        existing = by_id.get(tweet.id)
+        if existing is None:
+            continue
+        if existing is not tweet:
+            for field in TweetRecord.OPTIONAL_FIELDS:
+                if getattr(tweet, field) is None:
+                    setattr(tweet, field, getattr(existing, field))
+        merged.append(tweet)
+    return merged
+
+
+def keep_first_error(current: Optional[str], update: Optional[str]) -> Optional[str]:
+    """
+    Reducer for error: the first error reported by any branch wins
+    
+    Args:
+        current: Current error value
+        update: Value written by a node
+        
+    Returns:
+        Error message, if any
+    """
+    return current or update
+
+
+class WorkflowState(AgentState):
+    """
+    Agent state with reducers for the keys parallel branches can both write
+    """
+    tweets_fetched: int
+    unique_tweets: List[TweetRecord]
+    dedup_stats: Dict
+    filtered_tweets: Annotated[List[TweetRecord], merge_filtered_tweets]
+    error: Annotated[Optional[str], keep_first_error]
+
+
+# Data dependencies: each node runs once all of the nodes it reads from are done.
+# analyze_competitors only reads config, but LangGraph executes in supersteps, so
+# starting it at START would hold back scraping; it runs beside the other
+# post-filter branches instead (and is skipped with them if scraping fails).
+NODE_DEPENDENCIES: Dict[str, List[str]] = {
+    'discover_hashtags': [],
+    'scrape_tweets': ['discover_hashtags'],
+    'dedupe_tweets': ['scrape_tweets'],
+    'filter_tweets': ['dedupe_tweets'],
+    'analyze_competitors': ['filter_tweets'],
+    'scrape_comments': ['filter_tweets'],
+    'fact_check': ['filter_tweets'],
+    'analyze_sentiment': ['analyze_competitors', 'scrape_comments', 'fact_check'],
+    'generate_media': ['analyze_sentiment'],
+    'generate_scripts': ['generate_media'],
+    'compile_output': ['generate_scripts'],
+    'save_files': ['compile_output'],
+}
+
+# State keys each node writes; only these are returned, so branches never collide
+NODE_OUTPUTS: Dict[str, List[str]] = {
+    'discover_hashtags': ['trending_hashtags'],
+    'scrape_tweets': ['raw_tweets', 'tweets_fetched'],
+    'dedupe_tweets': ['unique_tweets', 'dedup_stats'],
+    'filter_tweets': ['filtered_tweets'],
+    'analyze_competitors': ['competitor_analysis'],
+    'scrape_comments': ['filtered_tweets'],
+    'fact_check': ['filtered_tweets', 'fact_check_results'],
+    'analyze_sentiment': ['filtered_tweets', 'sentiment_analysis', 'trending_topics'],
+    'generate_media': ['media_suggestions'],
+    'generate_scripts': ['script_variants'],
+    'compile_output': ['final_output'],
+    'save_files': [],
+}
+
+
+def node_updates(
+    name: str,
+    node: Callable[[AgentState, Dict], AgentState]
+) -> Callable[[WorkflowState, RunnableConfig], Dict]:
+    """
+    Adapt a node that mutates and returns the full state into one returning only its outputs
+    
+    The node is also timed, and the calls it makes are attributed to it in
+    the run's trace.
+    
+    Args:
+        name: Node name (key into NODE_OUTPUTS)
+        node: Node function taking the state and the run's configurable dict
+        
+    Returns:
+        Node function returning a partial state update
+    """
+    outputs = NODE_OUTPUTS[name]
+    
+    # LangGraph derives each node's input keys from this annotation, so it
+    # must be the workflow state (AgentState lacks unique_tweets/dedup_stats)
+    def run(state: WorkflowState, config: RunnableConfig) -> Dict:
+        with trace_node(name):
+            result = node(dict(state), config['configurable'])
+        updates = {key: result[key] for key in outputs if key in result}
+        if result.get('error') and not state.get('error'):
+            updates['error'] = result['error']
+        return updates
+    
+    return run
+
+
+def critical_path_seconds(timings: Dict[str, float]) -> float:
+    """
+    Compute the wall time of the longest dependency chain through the graph
+    
+    Compare against sum(timings.values()), the latency of running every node
+    in sequence, to see what the fan-out saves.
+    
+    Args:
+        timings: Seconds spent in each node
+        
+    Returns:
+        Critical-path latency in seconds
+    """
+    finish = {}
+    for name in NODE_DEPENDENCIES:  # Declared in topological order
+        start = max((finish[dep] for dep in NODE_DEPENDENCIES[name]), default=0.0)
+        finish[name] = start + timings.get(name, 0.0)
+    return max(finish.values(), default=0.0)
+
+
+def wire_graph(
+    nodes: Dict[str, Callable[[AgentState, Dict], AgentState]],
+    dependencies: Dict[str, List[str]] = NODE_DEPENDENCIES
+) -> StateGraph:
+    """
+    Build an uncompiled graph from node functions and their dependencies
+    
+    Nodes with no dependencies start from START, and nodes nothing depends
+    on lead to END.
+    
+    Args:
+        nodes: Node functions taking the state and the run's configurable dict
+        dependencies: Nodes each node waits for, in topological order
+        
+    Returns:
+        StateGraph over WorkflowState
+    """
+    workflow = StateGraph(WorkflowState)
+    for name, node in nodes.items():
+        workflow.add_node(name, node_updates(name, node))
+    
+    # Wire edges from the declared dependencies
+    for name, upstream in dependencies.items():
+        if not upstream:
+            workflow.add_edge(START, name)
+        elif len(upstream) == 1:
+            workflow.add_edge(upstream[0], name)
+        else:
+            workflow.add_edge(upstream, name)
+    
+    required = {dep for upstream in dependencies.values() for dep in upstream}
+    for name in dependencies:
+        if name not in required:
+            workflow.add_edge(name, END)
+    return workflow
+
+
+def run_config(
+    cache_bypass: Iterable[str] = (),
+    corpus: Optional[TweetCorpus] = None,
+    run_id: Optional[str] = None
+) -> Dict:
+    """
+    Build the per-run config for invoking a compiled agent
+    
+    The compiled graph is shared across runs; everything scoped to a single
+    run travels in `configurable` instead of being baked into the graph.
+    
+    Args:
+        cache_bypass: Node names that must skip the LLM response cache (for
+            fact_check this also skips the claim verdict store)
+        corpus: Search results shared by hashtag discovery and tweet scraping
+            (a fresh corpus with the default watermark store if omitted)
+        run_id: Checkpoint thread id (required when the agent has a checkpointer)
+        
+    Returns:
+        RunnableConfig for agent.invoke()
+    """
+    configurable = {
+        'corpus': corpus or TweetCorpus(watermarks=WatermarkStore()),
+        'cache_bypass': frozenset(cache_bypass)
+    }
+    if run_id:
+        configurable['thread_id'] = run_id
+    return {'configurable': configurable}
+
+
+def build_agent(
+    twitter_client: tweepy.Client,
+    llm: ChatAnthropic,
+    claim_store: Optional[ClaimStore] = None,
+    checkpointer: Optional[BaseCheckpointSaver] = None
+):
     """
     Build and compile the complete LangGraph agent
     
+    Nodes are wired by their data dependencies, so independent branches run
+    in parallel: competitor analysis, comment scraping and fact-checking all
+    fan out from the filtered tweets and join before sentiment analysis.
+    
+    The graph holds only process-lifetime dependencies and can be invoked
+    for any number of runs; pass run_config(...) as the invoke config.
+    With a checkpointer, state is saved after every step under the run's
+    thread id, so a failed run can be resumed from its last completed node.
+    
     Args:
         twitter_client: Authenticated Twitter client
         llm: Claude LLM instance
+        claim_store: Fact-check verdict store (a default ClaimStore if omitted)
+        checkpointer: Optional checkpoint saver (see RunCheckpoints)
         
     Returns:
         Compiled LangGraph workflow
     """
-    workflow = StateGraph(AgentState)
-    
-    # Add all nodes with their dependencies injected
-    workflow.add_node("discover_hashtags", lambda state: discover_trending_hashtags(state, twitter_client))
-    workflow.add_node("scrape_tweets", lambda state: scrape_enhanced_tweets(state, twitter_client))
-    workflow.add_node("filter_tweets", filter_quality_tweets_advanced)
-    workflow.add_node("analyze_competitors", lambda state: analyze_competitors(state, twitter_client, llm))
-    workflow.add_node("scrape_comments", lambda state: scrape_comments_detailed(state, twitter_client))
-    workflow.add_node("fact_check", lambda state: fact_check_claims(state, llm))
-    workflow.add_node("analyze_sentiment", lambda state: analyze_sentiment_advanced(state, llm))
-    workflow.add_node("generate_media", generate_media_suggestions)
-    workflow.add_node("generate_scripts", lambda state: generate_multiple_script_variants(state, llm))
-    workflow.add_node("compile_output", compile_final_output)
-    workflow.add_node("save_files", save_outputs)
-    
-    # Define complete flow
-    workflow.set_entry_point("discover_hashtags")
-    workflow.add_edge("discover_hashtags", "scrape_tweets")
-    workflow.add_edge("scrape_tweets", "filter_tweets")
-    workflow.add_edge("filter_tweets", "analyze_competitors")
-    workflow.add_edge("analyze_competitors", "scrape_comments")
-    workflow.add_edge("scrape_comments", "fact_check")
-    workflow.add_edge("fact_check", "analyze_sentiment")
-    workflow.add_edge("analyze_sentiment", "generate_media")
-    workflow.add_edge("generate_media", "generate_scripts")
-    workflow.add_edge("generate_scripts", "compile_output")
-    workflow.add_edge("compile_output", "save_files")
-    workflow.add_edge("save_files", END)
-    
-    return workflow.compile()
\ No newline at end of file
+    # Nodes where freshness matters get a copy of the LLM with caching disabled
+    uncached_llm = llm.model_copy(update={'cache': False})
+    claim_store = claim_store or ClaimStore()
+    
+    def llm_for(name: str, run: Dict) -> ChatAnthropic:
+        return uncached_llm if name in run['cache_bypass'] else llm
+    
+    def claims_for(run: Dict) -> Optional[ClaimStore]:
+        return None if 'fact_check' in run['cache_bypass'] else claim_store
+    
+    # All nodes with their dependencies injected; `run` is the per-run configurable
+    nodes = {
+        'discover_hashtags': lambda state, run: discover_trending_hashtags(
+            state, twitter_client, run['corpus']
+        ),
+        'scrape_tweets': lambda state, run: scrape_enhanced_tweets(
+            state, twitter_client, run['corpus']
+        ),
+        'dedupe_tweets': lambda state, run: dedupe_tweets(state),
+        'filter_tweets': lambda state, run: filter_quality_tweets_advanced(state),
+        'analyze_competitors': lambda state, run: analyze_competitors(
+            state, twitter_client, llm_for('analyze_competitors', run)
+        ),
+        'scrape_comments': lambda state, run: scrape_comments_detailed(state, twitter_client),
+        'fact_check': lambda state, run: fact_check_claims(
+            state, llm_for('fact_check', run), claims_for(run)
+        ),
+        'analyze_sentiment': lambda state, run: analyze_sentiment_advanced(
+            state, llm_for('analyze_sentiment', run)
+        ),
+        'generate_media': lambda state, run: generate_media_suggestions(state),
+        'generate_scripts': lambda state, run: generate_multiple_script_variants(
+            state, llm_for('generate_scripts', run)
+        ),
+        'compile_output': lambda state, run: compile_final_output(state),
+        'save_files': lambda state, run: save_outputs(state),
+    }
+    return wire_graph(nodes).compile(checkpointer=checkpointer)
@@ -0,0 +1,94 @@
+"""
+Compiled claim detection for fact-check candidate selection
+"""
+
+import re
+from typing import Dict, List, Sequence, Tuple
+from ..core.records import TweetRecord
+
+# Weight of each kind of signal in a claim's strength
+ATTRIBUTION_WEIGHT = 2.0  # "BREAKING:", "Sources:", "according to"
+SUPERLATIVE_WEIGHT = 1.5  # "first time", "record", "all-time"
+STAT_WEIGHT = 1.0  # Each stated number, up to MAX_COUNTED_STATS
+MAX_COUNTED_STATS = 3
+
+_STAT_UNITS = (
+    r'yards?|yds|points?|pts|touchdowns?|tds?|goals?|assists?|rebounds?|sacks?|'
+    r'wins?|losses|games?|seasons?|years?|times|million|billion|[mbk]'
+)
+
+# One alternation of named groups, so each tweet is scanned once
+CLAIM_PATTERN = re.compile(
+    r'(?P<attribution>\b(?:breaking|report|reports|sources?|confirmed|official|just in)\s*:'
+    r'|\baccording to\b|\bper sources\b|\bsources say\b)'
+    r'|(?P<superlative>\bfirst(?:[- ]ever)? time\b|\bfirst ever\b|\ball[- ]time\b|\brecords?\b'
+    r'|\bcareer[- ]high\b|\bmost ever\b|\bnever before\b|\bhistor(?:y|ic)\b|\bunprecedented\b)'
+    rf'|(?P<stat>\$\d[\d,]*(?:\.\d+)?\s*(?:million|billion|[mbk])?\b'
+    r'|\b\d[\d,]*(?:\.\d+)?\s*%'
+    r'|\b\d{1,3}-\d{1,3}\b'
+    rf'|\b\d[\d,]*(?:\.\d+)?\s*(?:{_STAT_UNITS})\b)',
+    re.IGNORECASE
+)
+
+
+def detect_claim(text: str) -> Tuple[float, Tuple[str, ...]]:
+    """
+    Score how strongly a tweet makes a checkable factual claim
+    
+    Attribution and superlative markers count once each; every stated
+    statistic adds STAT_WEIGHT, up to MAX_COUNTED_STATS.
+    
+    Args:
+        text: Tweet text
+        
+    Returns:
+        Tuple of (claim strength, extracted statistics)
+    """
+    attribution = superlative = False
+    stats = []
+    for match in CLAIM_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'attribution':
+            attribution = True
+        elif kind == 'superlative':
+            superlative = True
+        else:
+            stats.append(match.group().strip())
+    
+    strength = (
+        ATTRIBUTION_WEIGHT * attribution
+        + SUPERLATIVE_WEIGHT * superlative
+        + STAT_WEIGHT * min(len(stats), MAX_COUNTED_STATS)
+    )
+    return strength, tuple(stats)
+
+
+def rank_claim_candidates(tweets: Sequence[TweetRecord]) -> List[Dict]:
+    """
+    Detect claims in every tweet and rank them by strength times engagement
+    
+    Args:
+        tweets: Filtered tweet records
+        
+    Returns:
+        Claim dicts (tweet_id, text, author, engagement, stats, claim_score),
+        most worth checking first
+    """
+    scored = []
+    for position, tweet in enumerate(tweets):
+        strength, stats = detect_claim(tweet.text)
+        if strength > 0:
+            scored.append((strength * max(tweet.total_engagement, 1), -position, tweet, stats))
+    
+    scored.sort(key=lambda item: item[:2], reverse=True)
+    return [
+        {
+            'tweet_id': tweet.id,
+            'text': tweet.text,
+            'author': tweet.author_username,
+            'engagement': tweet.total_engagement,
+            'stats': list(stats),
+            'claim_score': round(score, 1)
+        }
+        for score, _, tweet, stats in scored
+    ]
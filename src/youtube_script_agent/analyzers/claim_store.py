@@ -0,0 +1,206 @@
+"""
+Persistent fact-check verdicts with near-duplicate claim lookup
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ..core.constants import (
+    CLAIM_CACHE_MAX_AGE_SECONDS,
+    CLAIM_MATCH_THRESHOLD,
+    CLAIM_STORE_MAX_ENTRIES,
+    CLAIM_STORE_PATH
+)
+from ..utils.minhash import MinHasher, MinHashLSH, normalize_text
+
+_NUMBER_RE = re.compile(r'\d[\d,.]*')
+
+# Verdict fields kept in the store; tweet-specific fields are added on lookup
+VERDICT_FIELDS = ('claim', 'credibility', 'reasoning', 'recommendation')
+
+
+def claim_numbers(normalized: str) -> Tuple[str, ...]:
+    """
+    Extract the numbers a claim states
+    
+    Near-duplicate claims must agree on these: "5 TDs" and "4 TDs" are
+    similar text but different claims.
+    
+    Args:
+        normalized: Normalized claim text
+        
+    Returns:
+        Sorted number tokens
+    """
+    numbers = (number.rstrip('.,').replace(',', '') for number in _NUMBER_RE.findall(normalized))
+    return tuple(sorted(numbers))
+
+
+class ClaimStore:
+    """
+    On-disk store of fact-check verdicts keyed by normalized claim text
+    
+    Lookups try the exact normalized text first, then a MinHash LSH index for
+    reworded or retweeted variants of a stored claim. Entries expire after
+    `max_age_seconds`. The store is one JSON file, loaded on first use.
+    """
+    
+    def __init__(
+        self,
+        path: str = CLAIM_STORE_PATH,
+        max_age_seconds: int = CLAIM_CACHE_MAX_AGE_SECONDS,
+        threshold: float = CLAIM_MATCH_THRESHOLD
+    ):
+        self.path = Path(path)
+        self.max_age_seconds = max_age_seconds
+        self.threshold = threshold
+        self._hasher = MinHasher()
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._index = MinHashLSH(threshold)
+        self._lock = threading.Lock()
+    
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        now = time.time()
+        entries = {}
+        for key, entry in stored.items():
+            if not self._expired(entry, now):
+                entry['signature'] = tuple(entry['signature'])
+                entry['numbers'] = tuple(entry['numbers'])
+                entries[key] = entry
+        return entries
+    
+    def _expired(self, entry: Dict, now: Optional[float] = None) -> bool:
+        return entry.get('checked_at', 0) < (now or time.time()) - self.max_age_seconds
+    
+    def _drop(self, key: str) -> None:
+        del self._entries[key]
+        self._index.remove(key)
+    
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            self._entries = self._read()
+            for key, entry in self._entries.items():
+                self._index.add(key, entry['signature'])
+        return self._entries
+    
+    def lookup(self, text: str) -> Optional[Dict]:
+        """
+        Find a stored verdict for a claim or a near-duplicate of it
+        
+        Expired entries met along the way are dropped, so a long-lived store
+        never serves a verdict older than max_age_seconds.
+        
+        Args:
+            text: Raw claim text
+            
+        Returns:
+            Stored verdict, or None if the claim has not been checked recently
+        """
+        key = normalize_text(text)
+        with self._lock:
+            entries = self._load()
+            if key in entries:
+                if not self._expired(entries[key]):
+                    return entries[key]['verdict']
+                self._drop(key)
+            
+            numbers = claim_numbers(key)
+            for match, _ in self._index.query(self._hasher.text_signature(key)):
+                if self._expired(entries[match]):
+                    self._drop(match)
+                elif entries[match]['numbers'] == numbers:
+                    return entries[match]['verdict']
+        return None
+    
+    def add(self, text: str, verdict: Dict) -> None:
+        """
+        Store the verdict for a claim
+        
+        Args:
+            text: Raw claim text
+            verdict: Fact-check result from the LLM
+        """
+        key = normalize_text(text)
+        signature = self._hasher.text_signature(key)
+        with self._lock:
+            self._load()[key] = {
+                'verdict': {field: verdict[field] for field in VERDICT_FIELDS if field in verdict},
+                'numbers': claim_numbers(key),
+                'signature': signature,
+                'checked_at': time.time()
+            }
+            self._index.add(key, signature)
+    
+    def save(self) -> None:
+        """
+        Write the unexpired entries to disk, newest first up to CLAIM_STORE_MAX_ENTRIES
+        
+        Entries written by other runs since this store was loaded are merged
+        in, keeping the newer verdict when both checked the same claim.
+        Expired entries are dropped from memory and from the file.
+        """
+        with self._lock:
+            entries = self._load()
+            now = time.time()
+            for key in [key for key, entry in entries.items() if self._expired(entry, now)]:
+                self._drop(key)
+            for key, entry in self._read().items():
+                if key not in entries or entry['checked_at'] > entries[key]['checked_at']:
+                    entries[key] = entry
+                    self._index.add(key, entry['signature'])
+            newest = sorted(entries.items(), key=lambda item: item[1]['checked_at'], reverse=True)
+            stored = {key: entry for key, entry in newest[:CLAIM_STORE_MAX_ENTRIES]}
+            
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(stored, f)
+            os.replace(tmp_path, self.path)
+    
+    def group_near_duplicates(self, claims: List[Dict]) -> Tuple[List[Dict], Dict[int, List[int]]]:
+        """
+        Collapse near-duplicate claims within one batch
+        
+        Args:
+            claims: Claim dicts with tweet_id and text, most important first
+            
+        Returns:
+            Tuple of (representative claims, tweet ids covered by each representative)
+        """
+        index = MinHashLSH(self.threshold)
+        representatives = []
+        numbers_by_rep = {}
+        tweet_ids = {}
+        covered: Dict[int, List[int]] = {}
+        
+        for claim in claims:
+            key = normalize_text(claim['text'])
+            numbers = claim_numbers(key)
+            signature = self._hasher.text_signature(key)
+            
+            match = next(
+                (rep for rep, _ in index.query(signature) if numbers_by_rep[rep] == numbers),
+                None
+            )
+            if match is not None:
+                covered[tweet_ids[match]].append(claim['tweet_id'])
+                continue
+            
+            rep = str(claim['tweet_id'])
+            index.add(rep, signature)
+            numbers_by_rep[rep] = numbers
+            tweet_ids[rep] = claim['tweet_id']
+            covered[claim['tweet_id']] = [claim['tweet_id']]
+            representatives.append(claim)
+        
+        return representatives, covered
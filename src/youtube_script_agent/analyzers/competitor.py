@@ -2,13 +2,260 @@
 Competitor content analysis
 """
 
+import hashlib
 import json
+import threading
+import time
 from langchain_core.messages import HumanMessage
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from ..core.state import AgentState
+from ..utils.context import compact_json, fit_to_budget, get_token_budget
+from ..core.constants import (
+    COMPETITOR_CACHE_TTL_SECONDS,
+    COMPETITOR_MAX_PAGES,
+    COMPETITOR_TWEETS_PER_CHANNEL,
+    MAX_QUERY_LENGTH,
+    MAX_TWEETS_PER_REQUEST,
+)
 import tweepy
 
 
+class CompetitorCache:
+    """
+    Process-wide cache of competitor timelines and the analyses built from them
+    
+    Timelines are cached per channel for a TTL, so topics sharing channels
+    reuse each other's fetches. Analyses are keyed by a fingerprint of the
+    competitor corpus and only recomputed when the corpus changes; they expire
+    after the same TTL, and expired ones are dropped whenever one is stored.
+    """
+    
+    def __init__(self, ttl: float = COMPETITOR_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._timelines: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._analyses: Dict[str, Tuple[float, Dict]] = {}
+        self._lock = threading.Lock()
+    
+    def get_timeline(self, channel: str) -> Optional[List[Dict]]:
+        """Get a channel's cached tweets, or None if missing or expired"""
+        with self._lock:
+            entry = self._timelines.get(channel.lower())
+        if entry and time.time() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+    
+    def set_timeline(self, channel: str, topics: List[Dict]) -> None:
+        """Cache a channel's tweets"""
+        with self._lock:
+            self._timelines[channel.lower()] = (time.time(), topics)
+    
+    def get_analysis(self, fingerprint: str) -> Optional[Dict]:
+        """Get the analysis for a competitor corpus fingerprint, or None if missing or expired"""
+        with self._lock:
+            entry = self._analyses.get(fingerprint)
+        if entry and time.time() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+    
+    def set_analysis(self, fingerprint: str, analysis: Dict) -> None:
+        """Cache the analysis for a competitor corpus fingerprint"""
+        now = time.time()
+        with self._lock:
+            self._analyses = {
+                key: entry for key, entry in self._analyses.items() if now - entry[0] < self.ttl
+            }
+            self._analyses[fingerprint] = (now, analysis)
+
+
+_competitor_cache = CompetitorCache()
+
+
+def build_channel_batches(
+    channels: List[str],
+    max_length: int = MAX_QUERY_LENGTH
+) -> List[List[str]]:
+    """
+    Group channels into `(from:a OR from:b) -is:retweet` queries within the length limit
+    
+    Args:
+        channels: Competitor handles (with or without @)
+        max_length: Maximum query length accepted by the API
+        
+    Returns:
+        List of channel batches, one per query
+    """
+    batches = []
+    current = []
+    for channel in channels:
+        candidate = current + [channel]
+        if current and len(channel_query(candidate)) > max_length:
+            batches.append(current)
+            candidate = [channel]
+        current = candidate
+    if current:
+        batches.append(current)
+    return batches
+
+
+def channel_query(channels: List[str]) -> str:
+    """
+    Build the search query for a batch of competitor channels
+    
+    Args:
+        channels: Competitor handles
+        
+    Returns:
+        Search query
+    """
+    terms = [f"from:{channel.replace('@', '')}" for channel in channels]
+    if len(terms) == 1:
+        return f"{terms[0]} -is:retweet"
+    return f"({' OR '.join(terms)}) -is:retweet"
+
+
+def search_channel_timelines(
+    channels: List[str],
+    twitter_client: tweepy.Client,
+    max_pages: int = COMPETITOR_MAX_PAGES
+) -> Tuple[Dict[str, List[Dict]], bool]:
+    """
+    Page through a batched channel search until every channel has its quota
+    
+    The batched query returns the newest tweets across all its channels, so
+    one busy channel can fill a page on its own; paging continues until each
+    channel has COMPETITOR_TWEETS_PER_CHANNEL tweets, the results run out or
+    max_pages pages have been read.
+    
+    Args:
+        channels: Competitor handles in one query batch
+        twitter_client: Authenticated Twitter client
+        max_pages: Maximum number of pages to request
+        
+    Returns:
+        Tuple of (tweets per lowercased handle, True if the search ran out of results)
+    """
+    timelines = {channel.replace('@', '').lower(): [] for channel in channels}
+    quota = COMPETITOR_TWEETS_PER_CHANNEL * len(channels)
+    max_results = min(MAX_TWEETS_PER_REQUEST, max(10, quota))
+    next_token = None
+    
+    for _ in range(max_pages):
+        params = {
+            'query': channel_query(channels),
+            'max_results': max_results,
+            'tweet_fields': ['public_metrics', 'created_at', 'author_id'],
+            'expansions': ['author_id'],
+            'user_fields': ['username']
+        }
+        if next_token:
+            params['next_token'] = next_token
+        tweets = twitter_client.search_recent_tweets(**params)
+        
+        includes = tweets.includes or {}
+        users = {user.id: user.username.lower() for user in includes.get('users', [])}
+        for tweet in tweets.data or []:
+            if len(channels) == 1:
+                username = channels[0].replace('@', '').lower()
+            else:
+                username = users.get(tweet.author_id)
+            timeline = timelines.get(username)
+            if timeline is not None and len(timeline) < COMPETITOR_TWEETS_PER_CHANNEL:
+                metrics = tweet.public_metrics
+                timeline.append({
+                    'text': tweet.text,
+                    'engagement': metrics['like_count'] + metrics['retweet_count']
+                })
+        
+        next_token = (tweets.meta or {}).get('next_token')
+        if not next_token:
+            return timelines, True
+        if all(len(timeline) >= COMPETITOR_TWEETS_PER_CHANNEL for timeline in timelines.values()):
+            break
+    
+    return timelines, False
+
+
+def fetch_competitor_timelines(
+    channels: List[str],
+    twitter_client: tweepy.Client,
+    cache: CompetitorCache = _competitor_cache
+) -> List[Dict]:
+    """
+    Fetch recent tweets for competitor channels, batched and cached per channel
+    
+    Channels left short by a batched search (because busier channels in the
+    batch took the results) are fetched one by one. A timeline is cached only
+    once it is complete: filled to its quota or drawn from a search that ran
+    out of results, so a short timeline is never served as fresh.
+    
+    Args:
+        channels: Competitor handles
+        twitter_client: Authenticated Twitter client
+        cache: Timeline cache
+        
+    Returns:
+        Competitor tweets in channel order
+    """
+    stale = [channel for channel in channels if cache.get_timeline(channel) is None]
+    
+    timelines: Dict[str, List[Dict]] = {}
+    refetched = 0
+    
+    for batch in build_channel_batches(stale):
+        by_channel, exhausted = search_channel_timelines(batch, twitter_client)
+        for channel in batch:
+            name = channel.replace('@', '').lower()
+            timeline = by_channel[name]
+            complete = exhausted or len(timeline) >= COMPETITOR_TWEETS_PER_CHANNEL
+            if not complete and len(batch) > 1:
+                single, complete = search_channel_timelines([channel], twitter_client, max_pages=1)
+                timeline = single[name]
+                complete = complete or len(timeline) >= COMPETITOR_TWEETS_PER_CHANNEL
+                refetched += 1
+            timelines[name] = timeline
+            if complete:
+                cache.set_timeline(channel, timeline)
+    
+    competitor_topics = []
+    for channel in channels:
+        timeline = timelines.get(channel.replace('@', '').lower())
+        if timeline is None:
+            timeline = cache.get_timeline(channel) or []
+        for item in timeline:
+            competitor_topics.append({
+                'channel': channel,
+                'text': item['text'],
+                'engagement': item['engagement']
+            })
+    
+    if stale:
+        print(f"  ✓ Fetched {len(stale)} competitor timelines ({refetched} one by one), "
+              f"{len(channels) - len(stale)} from cache")
+    else:
+        print(f"  ✓ All {len(channels)} competitor timelines served from cache")
+    
+    return competitor_topics
+
+
+def corpus_fingerprint(competitor_topics: List[Dict]) -> str:
+    """
+    Hash the competitor tweets that feed the analysis prompt
+    
+    Engagement counts are excluded so that metric drift alone does not
+    trigger a new analysis.
+    
+    Args:
+        competitor_topics: Competitor tweets
+        
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    for item in competitor_topics:
+        digest.update(f"{item['channel']}\x1f{item['text']}\x1e".encode('utf-8'))
+    return digest.hexdigest()
+
+
 def analyze_competitors(state: AgentState, twitter_client: tweepy.Client, llm) -> AgentState:
     """
     Analyze what competitor channels are covering
@@ -30,30 +277,28 @@ def analyze_competitors(state: AgentState, twitter_client: tweepy.Client, llm) -
     competitor_channels = config.get('competitor_channels', [])
     
     try:
-        competitor_topics = []
-        
         # Search tweets from competitor channels
-        for channel in competitor_channels:
-            query = f"from:{channel.replace('@', '')} -is:retweet"
-            tweets = twitter_client.search_recent_tweets(
-                query=query,
-                max_results=10,
-                tweet_fields=['public_metrics', 'created_at']
-            )
-            
-            if tweets.data:
-                for tweet in tweets.data:
-                    competitor_topics.append({
-                        'channel': channel,
-                        'text': tweet.text,
-                        'engagement': tweet.public_metrics['like_count'] + tweet.public_metrics['retweet_count']
-                    })
+        competitor_topics = fetch_competitor_timelines(competitor_channels, twitter_client)
         
         # Use Claude to analyze competitor patterns
         if competitor_topics:
+            # Highest-engagement competitor tweets first, up to the token budget
+            budget = get_token_budget(config, 'analyze_competitors')
+            ranked = sorted(competitor_topics, key=lambda item: item['engagement'], reverse=True)
+            competitor_topics, used = fit_to_budget(ranked, budget)
+            print(f"  ✓ Context: {used}/{budget} tokens, "
+                  f"{len(competitor_topics)} competitor tweets")
+            
+            fingerprint = corpus_fingerprint(competitor_topics)
+            cached = _competitor_cache.get_analysis(fingerprint)
+            if cached is not None:
+                state['competitor_analysis'] = dict(cached)
+                print("✅ Competitor analysis unchanged, reused cached result")
+                return state
+            
             prompt = f"""Analyze what these competitor channels are covering:
 
-{json.dumps(competitor_topics[:20], indent=2)}
+{compact_json(competitor_topics)}
 
 Identify:
 1. Common themes they're all covering (we should too)
@@ -69,6 +314,7 @@ Return JSON with: common_themes (list), gaps (list), competitor_angles (list)"""
                 content = content.split("```json")[1].split("```")[0]
             
             state['competitor_analysis'] = json.loads(content.strip())
+            _competitor_cache.set_analysis(fingerprint, state['competitor_analysis'])
             print("✅ Competitor analysis complete")
         else:
             state['competitor_analysis'] = {'common_themes': [], 'gaps': [], 'competitor_angles': []}
@@ -77,4 +323,4 @@ Return JSON with: common_themes (list), gaps (list), competitor_angles (list)"""
         print(f"⚠️ Competitor analysis error: {e}")
         state['competitor_analysis'] = {'error': str(e)}
     
-    return state
\ No newline at end of file
+    return state
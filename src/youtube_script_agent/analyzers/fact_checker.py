@@ -4,17 +4,32 @@ Fact-checking for viral claims
 
 import json
 from langchain_core.messages import HumanMessage
-from typing import Dict, List
+from typing import Dict, List, Optional
 from ..core.state import AgentState
+from ..core.constants import FACT_CHECK_MAX_CLAIMS
+from .claim_detector import rank_claim_candidates
+from .claim_store import ClaimStore
+from ..utils.context import compact_json, fit_to_budget, get_token_budget
 
 
-def fact_check_claims(state: AgentState, llm) -> AgentState:
+def fact_check_claims(
+    state: AgentState,
+    llm,
+    claim_store: Optional[ClaimStore] = None
+) -> AgentState:
     """
     Fact-check viral claims before including them
     
+    Every filtered tweet is scanned for claims, and candidates are ranked by
+    claim strength times engagement. Claims checked on an earlier run, or
+    rewordings of them, reuse the verdict from the claim store.
+    Near-duplicate claims within a run are checked once.
+    Only the remaining new claims go to the LLM, in a single prompt.
+    
     Args:
         state: Current agent state with filtered_tweets
         llm: Claude LLM instance
+        claim_store: Persistent verdict store (None checks every claim)
         
     Returns:
         Updated state with fact_check_results
@@ -24,27 +39,39 @@ def fact_check_claims(state: AgentState, llm) -> AgentState:
     if state.get('error') or not state['filtered_tweets']:
         return state
     
-    # Extract claims that need verification
-    top_tweets = state['filtered_tweets'][:10]
-    
-    claims_to_check = []
-    for tweet in top_tweets:
-        # Identify tweets with strong claims or stats
-        if any(indicator in tweet['text'].lower() for indicator in 
-               ['breaking:', 'report:', 'sources:', 'confirmed:', '%', 'first time', 'record']):
-            claims_to_check.append({
-                'tweet_id': tweet['id'],
-                'text': tweet['text'],
-                'author': tweet['author_username'],
-                'engagement': tweet['total_engagement']
-            })
+    # Extract claims that need verification, most worth checking first
+    claims_to_check = rank_claim_candidates(state['filtered_tweets'])
+    print(f"  ✓ Found {len(claims_to_check)} claims in {len(state['filtered_tweets'])} tweets")
     
     fact_check_results = []
     
+    # Reuse verdicts for claims already checked recently
+    if claim_store is not None:
+        new_claims = []
+        for claim in claims_to_check:
+            verdict = claim_store.lookup(claim['text'])
+            if verdict is None:
+                new_claims.append(claim)
+            else:
+                fact_check_results.append(
+                    {'tweet_id': claim['tweet_id'], **verdict, 'cached': True}
+                )
+        if fact_check_results:
+            print(f"  ✓ Reused {len(fact_check_results)} cached verdicts")
+        claims_to_check, covered = claim_store.group_near_duplicates(new_claims)
+    else:
+        covered = {claim['tweet_id']: [claim['tweet_id']] for claim in claims_to_check}
+    
     if claims_to_check:
+        budget = get_token_budget(state['config'], 'fact_check')
+        max_claims = int(state['config'].get('fact_check_max_claims', FACT_CHECK_MAX_CLAIMS))
+        claims, used = fit_to_budget(claims_to_check[:max_claims], budget)
+        print(f"  ✓ Context: {used}/{budget} tokens, {len(claims)} claims")
+        claim_text = {claim['tweet_id']: claim['text'] for claim in claims}
+        
         prompt = f"""You are a fact-checker. Analyze these viral claims and rate their credibility:
 
-{json.dumps(claims_to_check[:5], indent=2)}
+{compact_json(claims)}
 
 For each claim:
 1. Identify the specific factual claim being made
@@ -61,18 +88,46 @@ Return JSON array with: tweet_id, claim, credibility, reasoning, recommendation"
             if "```json" in content:
                 content = content.split("```json")[1].split("```")[0]
             
-            fact_check_results = json.loads(content.strip())
+            # Store new verdicts and share them with near-duplicate tweets
+            for fc in json.loads(content.strip()):
+                tweet_id = _match_tweet_id(fc.get('tweet_id'), claim_text)
+                if tweet_id is None:
+                    continue
+                if claim_store is not None:
+                    claim_store.add(claim_text[tweet_id], fc)
+                for duplicate_id in covered.get(tweet_id, [tweet_id]):
+                    fact_check_results.append({**fc, 'tweet_id': duplicate_id})
             
-            # Add fact-check results to tweets
-            fact_check_map = {fc['tweet_id']: fc for fc in fact_check_results}
-            for tweet in state['filtered_tweets']:
-                if tweet['id'] in fact_check_map:
-                    tweet['fact_check'] = fact_check_map[tweet['id']]
-            
-            print(f"✅ Fact-checked {len(fact_check_results)} claims")
+            if claim_store is not None:
+                claim_store.save()
             
+            print(f"✅ Fact-checked {len(claims)} new claims")
+        
         except Exception as e:
             print(f"⚠️ Fact-check error: {e}")
     
+    # Add fact-check results to tweets
+    fact_check_map = {fc['tweet_id']: fc for fc in fact_check_results}
+    for tweet in state['filtered_tweets']:
+        if tweet.id in fact_check_map:
+            tweet.fact_check = fact_check_map[tweet.id]
+    
     state['fact_check_results'] = fact_check_results
-    return state
\ No newline at end of file
+    return state
+
+
+def _match_tweet_id(value, claim_text: Dict) -> Optional[int]:
+    """
+    Map the tweet_id echoed back by the LLM onto a checked claim
+    
+    Args:
+        value: tweet_id from the LLM response (int or string)
+        claim_text: Claim text keyed by tweet id
+        
+    Returns:
+        Tweet id, or None if it does not match a claim sent in the prompt
+    """
+    for tweet_id in claim_text:
+        if str(tweet_id) == str(value):
+            return tweet_id
+    return None
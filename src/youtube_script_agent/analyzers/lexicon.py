@@ -0,0 +1,170 @@
+"""
+Local lexicon and emoji sentiment scoring
+"""
+
+import re
+import numpy as np
+from typing import Dict, List, Sequence
+from ..core.records import TweetRecord
+
+# Word valences on a -3..3 scale, tuned for sports and fan chatter
+WORD_VALENCE = {
+    # Positive
+    'amazing': 2.8, 'awesome': 2.7, 'beautiful': 2.6, 'best': 2.5, 'brilliant': 2.7, 'clutch': 2.4,
+    'congrats': 2.4, 'congratulations': 2.5, 'dominant': 2.0, 'elite': 2.2, 'epic': 2.4,
+    'excellent': 2.7, 'excited': 2.2, 'fantastic': 2.8, 'fire': 1.8, 'fun': 2.0, 'glad': 2.0,
+    'goat': 2.5, 'good': 1.9,
+    'great': 2.6, 'happy': 2.5, 'hype': 1.8, 'hyped': 2.0, 'impressive': 2.3, 'incredible': 2.7,
+    'insane': 1.6, 'legend': 2.3, 'legendary': 2.6, 'love': 2.9, 'loved': 2.7, 'loving': 2.6,
+    'lets': 1.2, 'nice': 1.8, 'perfect': 2.7, 'proud': 2.2, 'respect': 1.9, 'solid': 1.5,
+    'special': 1.9, 'spectacular': 2.7, 'strong': 1.6, 'stunning': 2.4, 'thrilled': 2.6,
+    'unreal': 1.8,
+    'win': 2.2, 'winning': 2.2, 'wins': 2.0, 'won': 2.0, 'wow': 2.2, 'yes': 1.4,
+    # Negative
+    'angry': -2.4, 'awful': -2.8, 'bad': -2.4, 'boring': -2.0, 'bust': -2.0, 'cheated': -2.6,
+    'choke': -2.4, 'choked': -2.5, 'clown': -2.0, 'disappointed': -2.3, 'disappointing': -2.4,
+    'disaster': -2.8, 'disgrace': -2.8, 'disgusting': -2.9, 'dumb': -2.2, 'embarrassing': -2.5,
+    'fail': -2.2, 'failed': -2.2, 'fraud': -2.6, 'furious': -2.7, 'garbage': -2.6, 'hate': -2.9,
+    'horrible': -2.8, 'injured': -1.8, 'injury': -1.7, 'joke': -1.6, 'lose': -2.0, 'loss': -2.0,
+    'lost': -1.9, 'mad': -2.1, 'mess': -2.0, 'overrated': -2.0, 'pathetic': -2.8, 'rigged': -2.6,
+    'robbed': -2.6, 'sad': -2.2, 'scam': -2.6, 'sloppy': -2.0, 'sucks': -2.5, 'terrible': -2.9,
+    'trash': -2.6, 'ugly': -2.3, 'upset': -2.0, 'worst': -3.0, 'wtf': -2.0,
+}
+
+EMOJI_VALENCE = {
+    '😂': 1.5, '🤣': 1.6, '😍': 2.7, '🥰': 2.6, '😊': 2.2, '😁': 2.2, '😀': 2.0, '😎': 1.8,
+    '🔥': 2.2, '🐐': 2.4, '💪': 2.0, '👏': 2.1, '🙌': 2.2, '🎉': 2.4, '🏆': 2.3, '❤': 2.8,
+    '💯': 2.0, '👍': 1.8, '🚀': 1.8, '✅': 1.2,
+    '😡': -2.8, '🤬': -3.0, '😠': -2.6, '😤': -1.8, '😭': -1.6, '😢': -2.2, '💔': -2.5, '🤡': -2.2,
+    '🗑': -2.4, '👎': -2.0, '🤮': -2.8, '😒': -1.8, '🙄': -1.6, '😞': -2.1, '😩': -1.9,
+}
+
+NEGATORS = frozenset({
+    'not', 'no', 'never', 'nobody', 'nothing', 'none', 'neither', 'nor', 'cannot', 'cant',
+    'dont', 'doesnt', 'didnt', 'isnt', 'wasnt', 'arent', 'werent', 'wont', 'aint', 'hardly',
+})
+INTENSIFIERS = frozenset({
+    'absolutely', 'completely', 'extremely', 'incredibly', 'so', 'really', 'super', 'totally',
+    'very', 'most', 'truly', 'literally',
+})
+
+NEGATION_SCALAR = -0.74  # Flips and damps a valence preceded by a negator (VADER)
+INTENSIFIER_BOOST = 0.3
+EXCLAMATION_BOOST = 0.1  # Per "!", up to 4
+NORMALIZATION_ALPHA = 15.0  # compound = s / sqrt(s^2 + alpha)
+NEUTRAL_BAND = 0.05
+
+_TOKEN_RE = re.compile(r"[a-z']+|[^\w\s]")
+
+
+def _text_valences(text: str) -> List[float]:
+    valences = []
+    tokens = [token.replace("'", '') for token in _TOKEN_RE.findall(text.lower())]
+    for i, token in enumerate(tokens):
+        valence = WORD_VALENCE.get(token) or EMOJI_VALENCE.get(token)
+        if not valence:
+            continue
+        window = tokens[max(0, i - 3):i]
+        if window and window[-1] in INTENSIFIERS:
+            valence += INTENSIFIER_BOOST if valence > 0 else -INTENSIFIER_BOOST
+        if any(word in NEGATORS for word in window):
+            valence *= NEGATION_SCALAR
+        valences.append(valence)
+    return valences
+
+
+def score_texts(texts: Sequence[str]) -> np.ndarray:
+    """
+    Score texts on the compound -1..1 scale
+    
+    Tokens are matched against the lexicons in one pass per text; per-text
+    sums, exclamation emphasis and normalization run vectorized.
+    
+    Args:
+        texts: Tweet or comment texts
+        
+    Returns:
+        Compound score per text
+    """
+    owners = []
+    valences = []
+    for index, text in enumerate(texts):
+        text_valences = _text_valences(text)
+        owners.extend([index] * len(text_valences))
+        valences.extend(text_valences)
+    
+    sums = np.bincount(
+        np.asarray(owners, dtype=np.int64),
+        weights=np.asarray(valences, dtype=np.float64),
+        minlength=len(texts)
+    )
+    exclamations = np.fromiter(
+        (text.count('!') for text in texts), dtype=np.float64, count=len(texts)
+    )
+    sums *= 1 + EXCLAMATION_BOOST * np.minimum(exclamations, 4)
+    return sums / np.sqrt(sums * sums + NORMALIZATION_ALPHA)
+
+
+def summarize_scores(scores: np.ndarray, weights: np.ndarray) -> Dict:
+    """
+    Aggregate per-text scores into an overall mood
+    
+    Args:
+        scores: Compound scores
+        weights: Weight per text (e.g. log engagement)
+        
+    Returns:
+        Dict with mood, weighted score, label shares, sample count and
+        agreement (how one-sided the opinionated texts are, 0..1)
+    """
+    count = len(scores)
+    positive = int(np.count_nonzero(scores > NEUTRAL_BAND))
+    negative = int(np.count_nonzero(scores < -NEUTRAL_BAND))
+    polar = positive + negative
+    
+    score = float(np.average(scores, weights=weights)) if count and weights.sum() > 0 else 0.0
+    agreement = abs(positive - negative) / polar if polar else 0.0
+    if agreement < 0.2:
+        mood = 'mixed' if polar else 'neutral'
+    else:
+        mood = 'positive' if positive > negative else 'negative'
+    
+    return {
+        'mood': mood,
+        'score': round(score, 3),
+        'positive_share': round(positive / count, 3) if count else 0.0,
+        'neutral_share': round((count - polar) / count, 3) if count else 0.0,
+        'negative_share': round(negative / count, 3) if count else 0.0,
+        'samples': count,
+        'agreement': round(agreement, 3)
+    }
+
+
+def score_tweet_sentiment(tweets: Sequence[TweetRecord]) -> Dict:
+    """
+    Score tweets and their comments locally, storing each tweet's score on its record
+    
+    Sets `sentiment_score` on every tweet. Tweets are weighted by log
+    engagement and comments by log likes in the aggregates.
+    
+    Args:
+        tweets: Filtered tweet records (with comments where scraped)
+        
+    Returns:
+        Summary over tweets and comments (see summarize_scores)
+    """
+    comments = [comment for tweet in tweets for comment in (tweet.comments or [])]
+    texts = [tweet.text for tweet in tweets] + [comment['text'] for comment in comments]
+    scores = score_texts(texts)
+    
+    for tweet, score in zip(tweets, scores):
+        tweet.sentiment_score = round(float(score), 3)
+    
+    weights = np.log1p(np.fromiter(
+        [tweet.total_engagement for tweet in tweets]
+        + [comment.get('likes', 0) for comment in comments],
+        dtype=np.float64,
+        count=len(texts)
+    )) + 1
+    
+    return summarize_scores(scores, weights)
@@ -6,12 +6,25 @@ import json
 from langchain_core.messages import HumanMessage
 from typing import Dict
 from ..core.state import AgentState
+from ..core.constants import (
+    SENTIMENT_CONFIDENT_AGREEMENT,
+    SENTIMENT_CONFIDENT_BUDGET_RATIO,
+    SENTIMENT_LLM_MODE,
+    SENTIMENT_MIN_SAMPLES
+)
+from .lexicon import score_tweet_sentiment
+from ..utils.context import build_tweet_context, compact_json, estimate_tokens, get_token_budget
 
 
 def analyze_sentiment_advanced(state: AgentState, llm) -> AgentState:
     """
     Advanced sentiment analysis with competitor context
     
+    Tweets and comments are scored locally first (lexicon and emoji), and each
+    tweet's score is stored as `sentiment_score`. With `sentiment_llm` set to
+    'auto', a confident local mood is passed to Claude as given and the
+    context budget shrinks; 'never' skips the LLM call entirely.
+    
     Args:
         state: Current agent state with filtered_tweets
         llm: Claude LLM instance
@@ -24,33 +37,68 @@ def analyze_sentiment_advanced(state: AgentState, llm) -> AgentState:
     if state.get('error') or not state['filtered_tweets']:
         return state
     
-    tweets_summary = []
-    for tweet in state['filtered_tweets'][:20]:
-        tweets_summary.append({
-            'text': tweet['text'],
-            'engagement': tweet['total_engagement'],
-            'quality_score': tweet['quality_score'],
-            'author': tweet['author_username'],
-            'verified': tweet['author_verified'],
-            'top_comments': [c['text'] for c in tweet.get('comments', [])[:5]],
-            'fact_check': tweet.get('fact_check', {})
-        })
+    # Local pre-scoring tier
+    config = state['config']
+    local = score_tweet_sentiment(state['filtered_tweets'])
+    mood = describe_local_sentiment(local)
+    confident = (
+        local['samples'] >= config.get('sentiment_min_samples', SENTIMENT_MIN_SAMPLES)
+        and local['agreement']
+        >= config.get('sentiment_confident_agreement', SENTIMENT_CONFIDENT_AGREEMENT)
+    )
+    print(f"  ✓ Local sentiment: {mood} over {local['samples']} texts "
+          f"(agreement {local['agreement']:.2f})")
+    
+    mode = config.get('sentiment_llm', SENTIMENT_LLM_MODE)
+    if mode == 'never':
+        state['sentiment_analysis'] = {'sentiment': mood, 'local_sentiment': local}
+        state['trending_topics'] = state['trending_hashtags'][:10]
+        print("✅ Local sentiment analysis complete (LLM skipped)")
+        return state
+    
+    use_local_mood = confident and mode == 'auto'
+    competitor_context = compact_json(state.get('competitor_analysis', {}))
     
-    competitor_context = state.get('competitor_analysis', {})
+    # Tweets and comments fill whatever the competitor context leaves of the budget
+    budget = get_token_budget(config, 'analyze_sentiment')
+    if use_local_mood:
+        budget = int(budget * SENTIMENT_CONFIDENT_BUDGET_RATIO)
+    tweets_summary, used = build_tweet_context(
+        state['filtered_tweets'],
+        budget - estimate_tokens(competitor_context),
+        lambda tweet: {
+            'text': tweet.text,
+            'engagement': tweet.total_engagement,
+            'quality_score': tweet.quality_score,
+            'author': tweet.author_username,
+            'verified': tweet.author_verified,
+            'fact_check': tweet.fact_check or {}
+        }
+    )
+    print(f"  ✓ Context: {used + estimate_tokens(competitor_context)}/{budget} tokens, "
+          f"{len(tweets_summary)} tweets")
+    
+    if use_local_mood:
+        sentiment_task = (
+            f"1. **Overall Sentiment**: Measured as {mood}; "
+            "explain what drives it in one sentence"
+        )
+    else:
+        sentiment_task = "1. **Overall Sentiment**: Dominant mood and why"
     
     prompt = f"""Analyze these top tweets and provide comprehensive insights:
 
 TWEETS:
-{json.dumps(tweets_summary, indent=2)}
+{compact_json(tweets_summary)}
 
 COMPETITOR COVERAGE:
-{json.dumps(competitor_context, indent=2)}
+{competitor_context}
 
 TRENDING HASHTAGS:
 {', '.join(state['trending_hashtags'][:10])}
 
 Provide:
-1. **Overall Sentiment**: Dominant mood and why
+{sentiment_task}
 2. **Trending Topics**: Ranked by importance (top 10)
 3. **Controversies**: Debates generating discussion
 4. **Viral Moments**: Most shared moments/plays
@@ -69,12 +117,27 @@ Format as JSON with keys: sentiment, trending_topics (list), controversies (list
             content = content.split("```json")[1].split("```")[0]
         
         analysis = json.loads(content.strip())
+        analysis['local_sentiment'] = local
         state['sentiment_analysis'] = analysis
         state['trending_topics'] = analysis.get('trending_topics', [])
         print("✅ Advanced sentiment analysis complete")
         
     except Exception as e:
         print(f"⚠️ Analysis error: {e}")
-        state['sentiment_analysis'] = {'error': str(e)}
+        state['sentiment_analysis'] = {'error': str(e), 'sentiment': mood, 'local_sentiment': local}
     
-    return state
\ No newline at end of file
+    return state
+
+
+def describe_local_sentiment(local: Dict) -> str:
+    """
+    Describe a local sentiment summary in one line for prompts and output
+    
+    Args:
+        local: Summary from score_tweet_sentiment
+        
+    Returns:
+        Readable mood description
+    """
+    return (f"{local['mood']} ({local['score']:+.2f}; {local['positive_share']:.0%} positive, "
+            f"{local['negative_share']:.0%} negative, {local['neutral_share']:.0%} neutral)")
@@ -79,7 +79,88 @@ SCRIPT_VARIANTS = [
 MIN_ENGAGEMENT_RATIO = 0.001
 SPAM_REPLY_THRESHOLD = 0.8
 BOT_RT_MULTIPLIER = 2
+QUALITY_TOP_K = 50
 
 # API rate limits
 MAX_TWEETS_PER_REQUEST = 100
-MAX_COMMENTS_PER_TWEET = 100
\ No newline at end of file
+MAX_COMMENTS_PER_TWEET = 100
+MAX_TWEETS_STREAMED = 10000  # Upper bound on the configurable max_tweets cap
+MAX_QUERY_LENGTH = 512  # Recent search query limit for standard access
+RATE_LIMIT_MAX_RETRIES = 3
+RATE_LIMIT_MAX_WAIT_SECONDS = 900  # One full Twitter rate-limit window
+
+# Competitor timelines
+COMPETITOR_TWEETS_PER_CHANNEL = 10
+COMPETITOR_CACHE_TTL_SECONDS = 3600
+COMPETITOR_MAX_PAGES = 3  # Batched timeline pages before short channels are fetched one by one
+
+# Prompt context token budgets per node (override with the prompt_token_budgets config)
+PROMPT_TOKEN_BUDGETS = {
+    'analyze_competitors': 2000,
+    'fact_check': 1500,
+    'analyze_sentiment': 6000,
+    'generate_scripts': 3000,
+}
+CHARS_PER_TOKEN = 4  # Rough estimate for English text
+MAX_COMMENTS_PER_PROMPT_TWEET = 5
+PROMPT_CACHING = True  # Mark shared prompt prefixes for Anthropic prompt caching
+
+# Local sentiment pre-scoring
+SENTIMENT_LLM_MODE = 'auto'  # 'always', 'never', or 'auto' to shrink the call when confident
+SENTIMENT_LLM_MODES = ('auto', 'always', 'never')
+SENTIMENT_MIN_SAMPLES = 30  # Tweets plus comments needed before trusting the local mood
+SENTIMENT_CONFIDENT_AGREEMENT = 0.6  # |positive - negative| / opinionated texts
+SENTIMENT_CONFIDENT_BUDGET_RATIO = 0.5  # Share of the context budget used when confident
+
+# LLM response cache
+LLM_CACHE_DIR = '.cache/llm'
+LLM_CACHE_MAX_BYTES = 200 * 1024 * 1024
+LLM_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Near-duplicate collapse
+DEDUP_SIMILARITY_THRESHOLD = 0.8  # Estimated Jaccard similarity of normalized tweet text
+DEDUP_MIN_WORDS = 3  # Shorter texts (link-, mention- or emoji-only tweets) are never merged
+STREAM_POOL_SIZE = 1000  # Clusters kept while paging past one page; lowest-scoring evicted first
+
+# Fact-check claim selection and cache
+FACT_CHECK_MAX_CLAIMS = 8  # New claims sent to the LLM per run, highest claim score first
+CLAIM_STORE_PATH = '.cache/claims/claims.json'
+CLAIM_CACHE_MAX_AGE_SECONDS = 24 * 3600
+CLAIM_STORE_MAX_ENTRIES = 5000
+CLAIM_MATCH_THRESHOLD = 0.7  # Estimated Jaccard similarity for a reworded claim to reuse a verdict
+
+# Run checkpoints (resume failed runs with --resume)
+CHECKPOINT_DB_PATH = '.cache/checkpoints/runs.sqlite'
+CHECKPOINT_MAX_AGE_SECONDS = 7 * 24 * 3600
+CHECKPOINT_MAX_RUNS = 50  # Finished runs kept in the index, newest first
+CHECKPOINT_KEEP_SUCCEEDED = False  # Succeeded runs have nothing to resume; drop their checkpoints
+
+# Run traces (per-node timings, call counts, payload sizes and tokens)
+TRACE_DIR = 'outputs/traces'
+
+# Incremental scraping
+WATERMARK_DIR = '.cache/watermarks'
+WATERMARK_MAX_RECORDS = 1000
+INCREMENTAL_MAX_PAGES = 10  # since_id pages fetched per query before the watermark is held
+SEARCH_WINDOW_HOURS = 24
+
+# Concurrency
+COMMENT_THREADS_TO_FETCH = 15
+COMMENT_FETCH_CONCURRENCY = 5
+TOPIC_WORKERS = 2  # Topics run in parallel by --run-now (they share the Twitter rate limits)
+SCRIPT_VARIANT_COUNT = 3
+SCRIPT_GENERATION_CONCURRENCY = 3
+
+# Automation scheduler
+SCHEDULER_WORKERS = 2  # Scheduled topic runs in flight at once
+SCHEDULER_OVERLAP_POLICY = 'coalesce'  # skip, queue or coalesce a topic still running when due
+SCHEDULER_MAX_SLEEP_SECONDS = 300  # Re-check the clock at least this often while idle
+
+# Local HTTP job service
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 8765
+SERVICE_WORKERS = 2  # Runs in flight at once
+SERVICE_QUEUE_SIZE = 8  # Waiting runs beyond this are rejected with 429
+SERVICE_RECENT_RUNS = 100  # Finished runs kept for status queries
+SERVICE_LATENCY_WINDOW = 200  # Finished runs used for the latency quantiles
+SERVICE_MAX_BODY_BYTES = 64 * 1024
@@ -0,0 +1,200 @@
+"""
+Compact tweet record type and normalization
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class TweetRecord:
+    """
+    Slotted tweet record used throughout the pipeline
+    
+    Replaces the per-tweet dicts: fixed attributes instead of a per-instance
+    hash table, and tuples instead of nested lists. Fields filled in by later
+    stages (quality_score, comments, comment_count, fact_check, sentiment_score,
+    cluster_size) default to None and are omitted from to_dict() until set.
+    Conversion to a dict happens only at the JSON output boundary.
+    """
+    
+    __slots__ = (
+        'id', 'text', 'created_at',
+        'author_username', 'author_verified', 'author_followers', 'author_profile_image',
+        'likes', 'retweets', 'replies', 'quotes', 'total_engagement', 'engagement_ratio',
+        'conversation_id', 'media', 'urls', 'hashtags', 'tweet_url',
+        'quality_score', 'comments', 'comment_count', 'fact_check', 'sentiment_score',
+        'cluster_size',
+    )
+    
+    # Fields set by later pipeline stages, serialized only when present
+    OPTIONAL_FIELDS = (
+        'quality_score', 'comments', 'comment_count', 'fact_check', 'sentiment_score',
+        'cluster_size'
+    )
+    
+    def __init__(
+        self,
+        id: int,
+        text: str,
+        created_at: str,
+        author_username: str,
+        author_verified: bool,
+        author_followers: int,
+        author_profile_image: Optional[str],
+        likes: int,
+        retweets: int,
+        replies: int,
+        quotes: int,
+        total_engagement: int,
+        engagement_ratio: float,
+        conversation_id: Optional[int],
+        media: Tuple[Tuple[str, Optional[str]], ...] = (),
+        urls: Tuple[str, ...] = (),
+        hashtags: Tuple[str, ...] = (),
+        tweet_url: Optional[str] = None,
+        quality_score: Optional[float] = None,
+        comments: Optional[List[Dict]] = None,
+        comment_count: Optional[int] = None,
+        fact_check: Optional[Dict] = None,
+        sentiment_score: Optional[float] = None,
+        cluster_size: Optional[int] = None
+    ):
+        self.id = id
+        self.text = text
+        self.created_at = created_at
+        self.author_username = author_username
+        self.author_verified = author_verified
+        self.author_followers = author_followers
+        self.author_profile_image = author_profile_image
+        self.likes = likes
+        self.retweets = retweets
+        self.replies = replies
+        self.quotes = quotes
+        self.total_engagement = total_engagement
+        self.engagement_ratio = engagement_ratio
+        self.conversation_id = conversation_id
+        self.media = media
+        self.urls = urls
+        self.hashtags = hashtags
+        self.tweet_url = tweet_url
+        self.quality_score = quality_score
+        self.comments = comments
+        self.comment_count = comment_count
+        self.fact_check = fact_check
+        self.sentiment_score = sentiment_score
+        self.cluster_size = cluster_size
+    
+    def __repr__(self) -> str:
+        return (
+            f"TweetRecord(id={self.id!r}, author={self.author_username!r}, "
+            f"engagement={self.total_engagement})"
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to the JSON-ready dict layout used in output files
+        
+        Returns:
+            Dict representation of the tweet
+        """
+        data = {}
+        for field in self.__slots__:
+            value = getattr(self, field)
+            if field in self.OPTIONAL_FIELDS:
+                if value is not None:
+                    data[field] = value
+            elif field == 'media':
+                data[field] = [{'type': media_type, 'url': url} for media_type, url in value]
+            elif field in ('urls', 'hashtags'):
+                data[field] = list(value)
+            else:
+                data[field] = value
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TweetRecord":
+        """
+        Rebuild a record from its to_dict() form
+        
+        Args:
+            data: Dict produced by to_dict()
+            
+        Returns:
+            TweetRecord
+        """
+        fields = {key: value for key, value in data.items() if key in cls.__slots__}
+        fields['media'] = tuple((m['type'], m['url']) for m in data.get('media', []))
+        fields['urls'] = tuple(data.get('urls', []))
+        fields['hashtags'] = tuple(data.get('hashtags', []))
+        return cls(**fields)
+
+
+def to_json(value: Any) -> Any:
+    """
+    `default` hook for json.dump that serializes tweet records lazily
+    
+    Args:
+        value: Object json could not serialize
+        
+    Returns:
+        JSON-serializable representation
+    """
+    if isinstance(value, TweetRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def normalize_tweet(tweet, users_dict: Dict, media_dict: Dict) -> TweetRecord:
+    """
+    Convert an API tweet into the agent's tweet record
+    
+    Args:
+        tweet: tweepy Tweet
+        users_dict: Expanded users keyed by id
+        media_dict: Expanded media keyed by media_key
+        
+    Returns:
+        TweetRecord
+    """
+    author = users_dict.get(tweet.author_id)
+    metrics = tweet.public_metrics
+    total_engagement = metrics['like_count'] + metrics['retweet_count'] + metrics['reply_count']
+    
+    # Extract media URLs
+    media_urls = []
+    if tweet.attachments and 'media_keys' in tweet.attachments:
+        for key in tweet.attachments['media_keys']:
+            if key in media_dict:
+                media = media_dict[key]
+                media_urls.append((
+                    media.type,
+                    getattr(media, 'url', None) or getattr(media, 'preview_image_url', None)
+                ))
+    
+    # Extract URLs and hashtags from tweet
+    tweet_urls = ()
+    hashtags = ()
+    if tweet.entities:
+        tweet_urls = tuple(url['expanded_url'] for url in tweet.entities.get('urls', []))
+        hashtags = tuple(tag['tag'].lower() for tag in tweet.entities.get('hashtags', []))
+    followers = author.public_metrics['followers_count'] if author else 0
+    
+    return TweetRecord(
+        id=tweet.id,
+        text=tweet.text,
+        created_at=tweet.created_at.isoformat(),
+        author_username=author.username if author else 'unknown',
+        author_verified=author.verified if author else False,
+        author_followers=followers,
+        author_profile_image=author.profile_image_url if author else None,
+        likes=metrics['like_count'],
+        retweets=metrics['retweet_count'],
+        replies=metrics['reply_count'],
+        quotes=metrics['quote_count'],
+        total_engagement=total_engagement,
+        engagement_ratio=total_engagement / max(followers, 1) if author else 0,
+        conversation_id=tweet.conversation_id,
+        media=tuple(media_urls),
+        urls=tweet_urls,
+        hashtags=hashtags,
+        tweet_url=f"https://twitter.com/{author.username}/status/{tweet.id}" if author else None
+    )
@@ -25,21 +25,23 @@ def generate_media_suggestions(state: AgentState) -> AgentState:
     
     # Top tweets to screenshot
     for i, tweet in enumerate(state['filtered_tweets'][:10], 1):
-        if tweet.get('media'):
+        if tweet.media:
             media_suggestions.append({
                 'type': 'tweet_with_media',
                 'timestamp': f"[{i*60}s]",
-                'description': f"Screenshot tweet from @{tweet['author_username']} with embedded media",
-                'tweet_url': tweet['tweet_url'],
-                'reasoning': f"High engagement ({tweet['total_engagement']}), has visual content"
+                'description': (
+                    f"Screenshot tweet from @{tweet.author_username} with embedded media"
+                ),
+                'tweet_url': tweet.tweet_url,
+                'reasoning': f"High engagement ({tweet.total_engagement}), has visual content"
             })
         else:
             media_suggestions.append({
                 'type': 'tweet_screenshot',
                 'timestamp': f"[{i*60}s]",
-                'description': f"Screenshot tweet from @{tweet['author_username']}",
-                'tweet_url': tweet['tweet_url'],
-                'reasoning': f"Top quality score ({int(tweet['quality_score'])})"
+                'description': f"Screenshot tweet from @{tweet.author_username}",
+                'tweet_url': tweet.tweet_url,
+                'reasoning': f"Top quality score ({int(tweet.quality_score)})"
             })
     
     # Extract video clip suggestions from tweet content
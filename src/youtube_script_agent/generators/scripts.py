@@ -2,17 +2,277 @@
 Script generation with multiple variants
 """
 
-import json
-from langchain_core.messages import HumanMessage
+import asyncio
+import time
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import BaseMessage
+from pathlib import Path
 from typing import Dict, List
 from ..core.state import AgentState
-from ..core.constants import SCRIPT_VARIANTS
+from ..core.constants import (
+    PROMPT_CACHING,
+    SCRIPT_GENERATION_CONCURRENCY,
+    SCRIPT_VARIANT_COUNT,
+    SCRIPT_VARIANTS,
+)
+from ..utils.context import compact_json, fit_to_budget, get_token_budget, rank_tweets
+from ..utils.file_manager import create_output_dir, script_filename
+from ..utils.prompt_cache import build_cached_message, prompt_cache_usage
+
+
+def build_script_prefix(context: str, config: Dict) -> str:
+    """
+    Build the prompt prefix shared by every script variant
+    
+    Everything identical across variants lives here so it can be served from
+    the prompt cache; only the variant block follows it.
+    
+    Args:
+        context: Shared context block for all variants
+        config: Topic configuration
+        
+    Returns:
+        Prompt prefix text
+    """
+    minutes = config['video_length'].split('-')
+    return f"""{context}
+
+Write a COMPLETE YouTube script for a {config['video_length']} minute video.
+
+Requirements:
+- Match the {config['tone']} tone
+- Use the variant approach described below
+- Include [TIMESTAMP X:XX] markers every major section
+- Add [SCREENSHOT: tweet_url] for specific tweets to show
+- Include [B-ROLL: description] for visual suggestions
+- Add [PAUSE] for emphasis
+- Reference fact-checked claims safely (from fact-check data)
+- Strong CTA at end
+- Word count: {int(minutes[0]) * 150}-{int(minutes[1]) * 150} words"""
+
+
+def build_variant_suffix(variant: Dict) -> str:
+    """
+    Build the variant-specific tail of the generation prompt
+    
+    Args:
+        variant: Variant template from SCRIPT_VARIANTS
+        
+    Returns:
+        Prompt suffix text
+    """
+    return f"""VARIANT: {variant['name']}
+DESCRIPTION: {variant['description']}
+APPROACH: {variant['approach']}
+
+Start naturally and make it {variant['description'].lower()}."""
+
+
+def build_variant_result(variant: Dict, script: str) -> Dict:
+    """
+    Package a generated script as a script variant entry
+    
+    Args:
+        variant: Variant template from SCRIPT_VARIANTS
+        script: Generated script text
+        
+    Returns:
+        Script variant dict
+    """
+    return {
+        'variant_name': variant['name'],
+        'description': variant['description'],
+        'script': script,
+        'word_count': len(script.split())
+    }
+
+
+def _report_usage(variant: Dict, result: Dict, usage: Dict[str, int]) -> None:
+    """Attach token usage to a variant result and print the prompt cache split"""
+    result['token_usage'] = usage
+    print(f"  ✓ {variant['name']}: {usage['input_tokens']} input tokens "
+          f"({usage['cache_read_tokens']} cache read, {usage['cache_write_tokens']} cache write)")
+
+
+class _FirstTokenSignal(AsyncCallbackHandler):
+    """Set an event when the first chunk of a streamed completion arrives"""
+    
+    def __init__(self, event: asyncio.Event):
+        self.event = event
+    
+    async def on_llm_new_token(self, token, **kwargs) -> None:
+        self.event.set()
+
+
+async def _generate_variants_async(
+    llm,
+    prompts: List[BaseMessage],
+    concurrency: int,
+    warm_cache: bool = False
+) -> List:
+    """
+    Run all variant completions concurrently, capped at `concurrency` in flight
+    
+    A prompt-cache entry only becomes readable once the request that writes it
+    has started responding. With `warm_cache` the first variant is streamed
+    (still through the LLM response cache) and the rest are batched as soon
+    as its first chunk arrives, reading the shared prefix from the cache.
+    The stage then takes one time-to-first-token longer than a fully
+    concurrent batch, not one full completion longer.
+    
+    Args:
+        llm: Claude LLM instance
+        prompts: One prompt message per variant
+        concurrency: Maximum concurrent requests
+        warm_cache: Start the first prompt ahead of the others to populate the cache
+        
+    Returns:
+        Responses (or exceptions) in prompt order
+    """
+    if not warm_cache or len(prompts) < 2:
+        return await llm.abatch(
+            [[prompt] for prompt in prompts],
+            config={'max_concurrency': concurrency},
+            return_exceptions=True
+        )
+    
+    started = asyncio.Event()
+    first = asyncio.ensure_future(
+        llm.ainvoke([prompts[0]], config={'callbacks': [_FirstTokenSignal(started)]}, stream=True)
+    )
+    # A cache hit or an error finishes the first request without streaming
+    signal = asyncio.ensure_future(started.wait())
+    await asyncio.wait({first, signal}, return_when=asyncio.FIRST_COMPLETED)
+    signal.cancel()
+    
+    rest = await llm.abatch(
+        [[prompt] for prompt in prompts[1:]],
+        config={'max_concurrency': max(1, concurrency - 1)},
+        return_exceptions=True
+    )
+    try:
+        response = await first
+    except Exception as e:
+        response = e
+    return [response] + rest
+
+
+def _chunk_text(chunk) -> str:
+    """Extract the text from a streamed message chunk"""
+    if isinstance(chunk.content, str):
+        return chunk.content
+    return ''.join(block.get('text', '') for block in chunk.content if isinstance(block, dict))
+
+
+async def _stream_variant(
+    llm,
+    variant: Dict,
+    prompt: BaseMessage,
+    script_file: Path,
+    semaphore: asyncio.Semaphore
+) -> Dict:
+    """
+    Stream one variant's completion into its script file as tokens arrive
+    
+    Args:
+        llm: Claude LLM instance
+        variant: Variant template from SCRIPT_VARIANTS
+        prompt: Generation prompt message
+        script_file: File to write the script into
+        semaphore: Concurrency limiter shared by all variants
+        
+    Returns:
+        Script variant dict with time_to_first_token and tokens_per_second
+    """
+    async with semaphore:
+        started = time.perf_counter()
+        first_token_at = None
+        chunk_count = 0
+        parts = []
+        usage_chunks = []
+        
+        try:
+            with open(script_file, 'w', encoding='utf-8') as f:
+                f.write(f"=== {variant['name']} Variant ===\n")
+                f.write(f"{variant['description']}\n\n")
+                f.flush()
+                
+                async for chunk in llm.astream([prompt]):
+                    text = _chunk_text(chunk)
+                    if getattr(chunk, 'usage_metadata', None):
+                        usage_chunks.append(chunk)
+                    if not text:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    chunk_count += 1
+                    parts.append(text)
+                    f.write(text)
+                    f.flush()
+        except Exception:
+            script_file.unlink(missing_ok=True)
+            raise
+        
+        finished = time.perf_counter()
+        first_token_at = first_token_at or finished
+        generation_time = finished - first_token_at
+        usage = prompt_cache_usage(usage_chunks)
+        tokens = usage['output_tokens'] or chunk_count
+        
+        result = build_variant_result(variant, ''.join(parts))
+        result['token_usage'] = usage
+        result['script_file'] = str(script_file)
+        result['time_to_first_token'] = round(first_token_at - started, 3)
+        result['tokens_per_second'] = (
+            round(tokens / generation_time, 1) if generation_time > 0 else None
+        )
+        return result
+
+
+async def _stream_variants_async(
+    llm,
+    variants: List[Dict],
+    prompts: List[BaseMessage],
+    output_dir: Path,
+    concurrency: int
+) -> List:
+    """
+    Stream all variants concurrently, capped at `concurrency` in flight
+    
+    Args:
+        llm: Claude LLM instance
+        variants: Variant templates
+        prompts: One prompt message per variant
+        output_dir: Directory for the script files
+        concurrency: Maximum concurrent streams
+        
+    Returns:
+        Script variant dicts (or exceptions) in variant order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(
+        *[
+            _stream_variant(
+                llm, variant, prompt, output_dir / script_filename(i, variant['name']), semaphore
+            )
+            for i, (variant, prompt) in enumerate(zip(variants, prompts), 1)
+        ],
+        return_exceptions=True
+    )
 
 
 def generate_multiple_script_variants(state: AgentState, llm) -> AgentState:
     """
     Generate 3-5 different script variations
     
+    Variants are generated concurrently through `abatch`, bounded by the
+    `script_concurrency` config value (1 generates them one at a time). The
+    number of variants comes from `script_variant_count`. With `stream_scripts`
+    set, each variant is streamed into its script file in the output directory
+    as tokens arrive, and time-to-first-token and tokens/second are recorded.
+    The shared context prefix is marked for prompt caching (`prompt_caching`),
+    and each variant's cache-read and cache-write token usage is recorded.
+    
     Args:
         state: Current agent state with all analysis complete
         llm: Claude LLM instance
@@ -30,6 +290,17 @@ def generate_multiple_script_variants(state: AgentState, llm) -> AgentState:
     competitor_analysis = state.get('competitor_analysis', {})
     media_suggestions = state.get('media_suggestions', [])
     
+    # Top tweets first, then media suggestions, within the token budget
+    budget = get_token_budget(config, 'generate_scripts')
+    top_tweets, tweet_tokens = fit_to_budget(
+        [{'author': t.author_username, 'text': t.text[:100], 'engagement': t.total_engagement}
+         for t in rank_tweets(state['filtered_tweets'])[:5]],
+        budget
+    )
+    media, media_tokens = fit_to_budget(media_suggestions[:10], budget - tweet_tokens)
+    print(f"  ✓ Context: {tweet_tokens + media_tokens}/{budget} tokens, "
+          f"{len(top_tweets)} tweets, {len(media)} media suggestions")
+    
     # Context for all variants
     context = f"""
 TOPIC: {state['topic']}
@@ -42,52 +313,71 @@ VIRAL MOMENTS: {', '.join(sentiment.get('viral_moments', [])[:3])}
 UNIQUE ANGLES (vs competitors): {', '.join(competitor_analysis.get('unique_angles', [])[:3])}
 
 TOP TWEETS:
-{json.dumps([{'author': t['author_username'], 'text': t['text'][:100], 'engagement': t['total_engagement']} for t in state['filtered_tweets'][:5]], indent=2)}
+{compact_json(top_tweets)}
 
 MEDIA SUGGESTIONS:
-{json.dumps(media_suggestions[:10], indent=2)}
+{compact_json(media)}
 """
     
+    variants = SCRIPT_VARIANTS[:int(config.get('script_variant_count', SCRIPT_VARIANT_COUNT))]
+    concurrency = max(1, int(config.get('script_concurrency', SCRIPT_GENERATION_CONCURRENCY)))
+    
+    # Shared prefix carries the cache breakpoint; only the variant suffix differs
+    prefix = build_script_prefix(context, config)
+    use_cache = config.get('prompt_caching', PROMPT_CACHING)
+    prompts = [
+        build_cached_message(prefix, build_variant_suffix(variant), use_cache)
+        for variant in variants
+    ]
+    
     script_variants = []
     
-    for variant in SCRIPT_VARIANTS[:3]:  # Generate top 3 variants
-        print(f"  → Generating {variant['name']} variant...")
+    if config.get('stream_scripts'):
+        if config.get('output_dir'):
+            output_dir = Path(config['output_dir'])
+        else:
+            output_dir = create_output_dir(state['topic'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        print(f"  → Streaming {len(variants)} variants into {output_dir} "
+              f"(concurrency={concurrency})...")
+        results = asyncio.run(
+            _stream_variants_async(llm, variants, prompts, output_dir, concurrency)
+        )
         
-        prompt = f"""{context}
-
-VARIANT: {variant['name']}
-DESCRIPTION: {variant['description']}
-APPROACH: {variant['approach']}
-
-Write a COMPLETE YouTube script for a {config['video_length']} minute video.
-
-Requirements:
-- Match the {config['tone']} tone
-- Use the variant approach described above
-- Include [TIMESTAMP X:XX] markers every major section
-- Add [SCREENSHOT: tweet_url] for specific tweets to show
-- Include [B-ROLL: description] for visual suggestions
-- Add [PAUSE] for emphasis
-- Reference fact-checked claims safely (from fact-check data)
-- Strong CTA at end
-- Word count: {int(config['video_length'].split('-')[0]) * 150}-{int(config['video_length'].split('-')[1]) * 150} words
-
-Start naturally and make it {variant['description'].lower()}."""
+        for variant, result in zip(variants, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ Error generating {variant['name']}: {result}")
+                continue
+            print(f"  ✓ {variant['name']}: first token {result['time_to_first_token']}s, "
+                  f"{result['tokens_per_second']} tokens/s")
+            _report_usage(variant, result, result['token_usage'])
+            script_variants.append(result)
+    elif concurrency == 1:
+        for variant, prompt in zip(variants, prompts):
+            print(f"  → Generating {variant['name']} variant...")
+            try:
+                response = llm.invoke([prompt])
+                result = build_variant_result(variant, response.content)
+                _report_usage(variant, result, prompt_cache_usage([response]))
+                script_variants.append(result)
+            except Exception as e:
+                print(f"⚠️ Error generating {variant['name']}: {e}")
+    else:
+        print(f"  → Generating {', '.join(v['name'] for v in variants)} variants "
+              f"(concurrency={concurrency})...")
+        responses = asyncio.run(
+            _generate_variants_async(llm, prompts, concurrency, warm_cache=use_cache)
+        )
         
-        try:
-            response = llm.invoke([HumanMessage(content=prompt)])
-            
-            script_variants.append({
-                'variant_name': variant['name'],
-                'description': variant['description'],
-                'script': response.content,
-                'word_count': len(response.content.split())
-            })
-            
-        except Exception as e:
-            print(f"⚠️ Error generating {variant['name']}: {e}")
+        for variant, response in zip(variants, responses):
+            if isinstance(response, Exception):
+                print(f"⚠️ Error generating {variant['name']}: {response}")
+                continue
+            result = build_variant_result(variant, response.content)
+            _report_usage(variant, result, prompt_cache_usage([response]))
+            script_variants.append(result)
     
     state['script_variants'] = script_variants
     print(f"✅ Generated {len(script_variants)} script variants")
     
-    return state
\ No newline at end of file
+    return state
@@ -1,11 +1,24 @@
 """
 Main entry point for the CLI
+
+Only the standard library and the constants are imported at module load.
+The agent (LangGraph, LangChain, tweepy, numpy and every scraper and
+analyzer) is imported inside main() once a run is about to start, so
+`--help` and argument errors return immediately;
+tests/unit/test_import_budget.py guards this.
 """
 
 import argparse
 from pathlib import Path
-from .agents.executor import run_agent_for_topic, setup_automation
-from .core.config import load_config
+from .core.constants import (
+    SCHEDULER_OVERLAP_POLICY,
+    SCRIPT_VARIANTS,
+    SENTIMENT_LLM_MODES,
+    SERVICE_HOST,
+    SERVICE_PORT,
+    SERVICE_QUEUE_SIZE,
+    TOPIC_WORKERS,
+)
 
 
 def main():
@@ -21,6 +34,27 @@ def main():
                        help='Run immediately without scheduling')
     parser.add_argument('--config', type=Path,
                        help='Path to config file')
+    parser.add_argument('--workers', type=int, default=TOPIC_WORKERS,
+                       help=f'Topics to run in parallel with --run-now, or runs in flight with '
+                            f'--serve (default: {TOPIC_WORKERS}, 1 runs them in sequence)')
+    parser.add_argument('--overlap-policy', choices=['skip', 'queue', 'coalesce'],
+                       default=SCHEDULER_OVERLAP_POLICY,
+                       help='With --automate, what to do when a topic is still running at its '
+                            'next due time')
+    parser.add_argument('--resume', type=str, metavar='RUN_ID',
+                       help='Resume a failed run from its last completed step')
+    parser.add_argument('--metrics', action='store_true',
+                       help='Also print the Prometheus metrics of sequential and resumed runs '
+                            '(traces are always saved)')
+    parser.add_argument('--serve', action='store_true',
+                       help='Run the local HTTP job service (submit runs, poll status and metrics)')
+    parser.add_argument('--host', type=str, default=SERVICE_HOST,
+                       help=f'With --serve, interface to bind (default: {SERVICE_HOST})')
+    parser.add_argument('--port', type=int, default=SERVICE_PORT,
+                       help=f'With --serve, port to bind (default: {SERVICE_PORT})')
+    parser.add_argument('--queue-size', type=int, default=SERVICE_QUEUE_SIZE,
+                       help=f'With --serve, runs allowed to wait before new ones are rejected '
+                            f'(default: {SERVICE_QUEUE_SIZE})')
 
     # Custom config overrides
     parser.add_argument('--engagement-threshold', type=int,
@@ -31,10 +65,26 @@ def main():
                        help='Video length (e.g., "10-12")')
     parser.add_argument('--tone', type=str,
                        help='Video tone/style')
+    parser.add_argument('--variants', type=int,
+                       help=f'Number of script variants to generate (1-{len(SCRIPT_VARIANTS)})')
+    parser.add_argument('--max-tweets', type=int,
+                       help='Page through up to this many tweets (streams pages above 100)')
+    parser.add_argument('--stream-scripts', action='store_true',
+                       help='Stream scripts into their output files as they are generated')
+    parser.add_argument('--bypass-llm-cache', nargs='+', metavar='NODE',
+                       help='Nodes that skip the LLM response cache '
+                            '(e.g. fact_check analyze_sentiment)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only fetch tweets newer than the last run for this topic')
+    parser.add_argument('--sentiment-llm', choices=SENTIMENT_LLM_MODES,
+                       help='When to call Claude for sentiment after local scoring (default: auto)')
 
     args = parser.parse_args()
+    if args.variants is not None and not 1 <= args.variants <= len(SCRIPT_VARIANTS):
+        parser.error(f"--variants must be between 1 and {len(SCRIPT_VARIANTS)}")
 
     # Load configuration
+    from .core.config import load_config
     config = load_config(args.config)
 
     # Build custom config from args
@@ -47,15 +97,39 @@ def main():
         custom_config['video_length'] = args.video_length
     if args.tone:
         custom_config['tone'] = args.tone
+    if args.variants is not None:
+        custom_config['script_variant_count'] = args.variants
+    if args.max_tweets:
+        custom_config['max_tweets'] = args.max_tweets
+    if args.stream_scripts:
+        custom_config['stream_scripts'] = True
+    if args.bypass_llm_cache:
+        custom_config['llm_cache_bypass'] = args.bypass_llm_cache
+    if args.incremental:
+        custom_config['incremental'] = True
+    if args.sentiment_llm:
+        custom_config['sentiment_llm'] = args.sentiment_llm
 
-    # Execution modes
-    if args.automate:
-        setup_automation(args.topics, config)
+    # Execution modes (the agent is imported only here, once a run starts)
+    if args.resume:
+        from .agents.executor import resume_agent_run
+        resume_agent_run(args.resume, config, args.metrics)
+    elif args.serve:
+        from .agents.service import serve
+        serve(config, args.host, args.port, args.workers, args.queue_size, custom_config)
+    elif args.automate:
+        from .agents.executor import setup_automation
+        setup_automation(args.topics, config, args.workers, args.overlap_policy)
     elif args.run_now:
-        for topic in args.topics:
-            run_agent_for_topic(topic, config, custom_config)
+        from .agents.executor import run_agent_for_topic, run_topics_concurrently
+        if args.workers > 1 and len(args.topics) > 1:
+            run_topics_concurrently(args.topics, config, custom_config, args.workers)
+        else:
+            for topic in args.topics:
+                run_agent_for_topic(topic, config, custom_config, show_metrics=args.metrics)
     else:
-        run_agent_for_topic(args.topic, config, custom_config)
+        from .agents.executor import run_agent_for_topic
+        run_agent_for_topic(args.topic, config, custom_config, show_metrics=args.metrics)
 
 
 if __name__ == "__main__":
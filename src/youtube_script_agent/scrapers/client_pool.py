@@ -0,0 +1,187 @@
+"""
+Process-wide Twitter client pool with per-endpoint rate limiting
+"""
+
+import threading
+import time
+import tweepy
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlencode
+from ..core.constants import RATE_LIMIT_MAX_RETRIES, RATE_LIMIT_MAX_WAIT_SECONDS
+from ..utils.tracing import current_trace
+
+
+class TokenBucket:
+    """
+    Token bucket mirroring one endpoint's Twitter rate-limit window
+    
+    The bucket starts open and is synchronised from the `x-rate-limit-*`
+    response headers after every call. When it is empty, callers block until
+    the window resets instead of failing with a 429.
+    """
+    
+    def __init__(self):
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self._cond = threading.Condition()
+    
+    def acquire(self, max_wait: float = RATE_LIMIT_MAX_WAIT_SECONDS) -> float:
+        """
+        Take one token, waiting for the window to reset if necessary
+        
+        Args:
+            max_wait: Longest time to wait for a token, in seconds
+            
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.time()
+                waited = time.monotonic() - started
+                if self.remaining is not None and now >= self.reset_at:
+                    # Window rolled over; headers on the next response will correct this
+                    self.remaining = self.limit
+                if self.remaining is None or self.remaining > 0:
+                    if self.remaining is not None:
+                        self.remaining -= 1
+                    return waited
+                
+                delay = min(self.reset_at - now + 1, max_wait - waited)
+                if delay <= 0:
+                    raise TimeoutError(f"Rate limit did not reset within {max_wait:.0f}s")
+                self._cond.wait(delay)
+    
+    def update(self, headers) -> None:
+        """
+        Synchronise the bucket with rate-limit response headers
+        
+        Args:
+            headers: Response headers from the Twitter API
+        """
+        try:
+            limit = int(headers['x-rate-limit-limit'])
+            remaining = int(headers['x-rate-limit-remaining'])
+            reset_at = float(headers['x-rate-limit-reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+        
+        with self._cond:
+            self.limit = limit
+            # Concurrent callers may have already spent tokens after this response was issued
+            self.remaining = remaining if self.remaining is None else min(self.remaining, remaining)
+            self.reset_at = reset_at
+            self._cond.notify_all()
+    
+    def exhaust(self, reset_at: float) -> None:
+        """
+        Mark the bucket empty until the given reset time (used after a 429)
+        
+        Args:
+            reset_at: Epoch seconds at which the window resets
+        """
+        with self._cond:
+            self.remaining = 0
+            self.reset_at = max(reset_at, time.time() + 1)
+            if self.limit is None:
+                self.limit = 1
+
+
+class RateLimitedClient(tweepy.Client):
+    """
+    tweepy.Client that routes every request through a per-endpoint token bucket
+    """
+    
+    def __init__(self, bearer_token: str, **kwargs):
+        super().__init__(bearer_token=bearer_token, wait_on_rate_limit=False, **kwargs)
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+    
+    def bucket_for(self, method: str, route: str) -> TokenBucket:
+        """
+        Get (or create) the token bucket for an endpoint
+        
+        Args:
+            method: HTTP method
+            route: API route, e.g. /2/tweets/search/recent
+            
+        Returns:
+            TokenBucket for the endpoint
+        """
+        key = (method.upper(), route)
+        with self._buckets_lock:
+            if key not in self._buckets:
+                self._buckets[key] = TokenBucket()
+            return self._buckets[key]
+    
+    def request(self, method, route, params=None, json=None, user_auth=False):
+        bucket = self.bucket_for(method, route)
+        trace = current_trace()
+        
+        for attempt in range(RATE_LIMIT_MAX_RETRIES + 1):
+            waited = bucket.acquire()
+            if waited:
+                print(f"  ⏳ Waited {waited:.0f}s for rate limit on {route}")
+            
+            started = time.perf_counter()
+            try:
+                response = super().request(
+                    method, route, params=params, json=json, user_auth=user_auth
+                )
+            except tweepy.HTTPException as e:
+                if trace:
+                    self._trace_request(trace, method, route, params, started, e.response)
+                if not isinstance(e, tweepy.TooManyRequests):
+                    raise
+                headers = e.response.headers
+                bucket.update(headers)
+                bucket.exhaust(float(headers.get('x-rate-limit-reset', time.time() + 60)))
+                if attempt == RATE_LIMIT_MAX_RETRIES:
+                    raise
+                continue
+            
+            if trace:
+                self._trace_request(trace, method, route, params, started, response)
+            bucket.update(response.headers)
+            return response
+    
+    @staticmethod
+    def _trace_request(
+        trace,
+        method: str,
+        route: str,
+        params: Optional[Dict],
+        started: float,
+        response
+    ) -> None:
+        trace.record_twitter(
+            method, route, started, time.perf_counter() - started, response.status_code,
+            len(urlencode(params or {}, doseq=True)), len(response.content)
+        )
+
+
+_client_pool: Dict[str, RateLimitedClient] = {}
+_client_pool_lock = threading.Lock()
+
+
+def get_twitter_client(bearer_token: str) -> RateLimitedClient:
+    """
+    Get the process-wide rate-limited client for a bearer token
+    
+    Rate limits apply per app token, so all topics and runs that share a token
+    share one client and its endpoint buckets.
+    
+    Args:
+        bearer_token: Twitter API bearer token
+        
+    Returns:
+        Shared RateLimitedClient
+    """
+    with _client_pool_lock:
+        client = _client_pool.get(bearer_token)
+        if client is None:
+            client = RateLimitedClient(bearer_token=bearer_token)
+            _client_pool[bearer_token] = client
+        return client
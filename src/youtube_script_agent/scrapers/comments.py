@@ -2,15 +2,89 @@
 Comment thread scraping for sentiment analysis
 """
 
+import time
 import tweepy
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Dict, List, Optional, Tuple
 from ..core.state import AgentState
+from ..core.records import TweetRecord
+from ..core.constants import (
+    COMMENT_FETCH_CONCURRENCY,
+    COMMENT_THREADS_TO_FETCH,
+    MAX_COMMENTS_PER_TWEET,
+)
+
+
+def fetch_comment_thread(
+    tweet: TweetRecord,
+    twitter_client: tweepy.Client
+) -> Tuple[Optional[List[Dict]], float]:
+    """
+    Fetch the conversation thread for a single tweet
+    
+    Args:
+        tweet: Tweet record with conversation_id
+        twitter_client: Authenticated Twitter client
+        
+    Returns:
+        Tuple of (comments or None if the thread is empty, elapsed seconds)
+    """
+    started = time.perf_counter()
+    conversation_tweets = twitter_client.search_recent_tweets(
+        query=f"conversation_id:{tweet.conversation_id}",
+        max_results=MAX_COMMENTS_PER_TWEET,
+        tweet_fields=['public_metrics', 'created_at', 'author_id'],
+        user_fields=['username', 'verified']
+    )
+    
+    comments = None
+    if conversation_tweets.data:
+        comments = []
+        for t in conversation_tweets.data:
+            comments.append({
+                'text': t.text,
+                'likes': t.public_metrics['like_count'],
+                'created_at': t.created_at.isoformat()
+            })
+    
+    return comments, time.perf_counter() - started
+
+
+def _apply_comment_thread(tweet: TweetRecord, twitter_client: tweepy.Client) -> float:
+    """
+    Fetch one thread and attach the results to the tweet, isolating errors
+    
+    Args:
+        tweet: Tweet record to update in place
+        twitter_client: Authenticated Twitter client
+        
+    Returns:
+        Elapsed seconds for the fetch
+    """
+    started = time.perf_counter()
+    try:
+        comments, elapsed = fetch_comment_thread(tweet, twitter_client)
+        
+        if comments is not None:
+            tweet.comments = sorted(comments, key=lambda x: x['likes'], reverse=True)[:30]
+            tweet.comment_count = len(comments)
+    
+    except Exception:
+        tweet.comments = []
+        tweet.comment_count = 0
+        elapsed = time.perf_counter() - started
+    
+    return elapsed
 
 
 def scrape_comments_detailed(state: AgentState, twitter_client: tweepy.Client) -> AgentState:
     """
     Enhanced comment scraping for top tweets
     
+    Threads are fetched concurrently, bounded by the `comment_fetch_concurrency`
+    config value (1 fetches sequentially).
+    
     Args:
         state: Current agent state with filtered_tweets
         twitter_client: Authenticated Twitter client
@@ -23,34 +97,29 @@ def scrape_comments_detailed(state: AgentState, twitter_client: tweepy.Client) -
     if state.get('error') or not state['filtered_tweets']:
         return state
     
-    top_tweets = state['filtered_tweets'][:15]
-    
-    for tweet in top_tweets:
-        try:
-            conversation_tweets = twitter_client.search_recent_tweets(
-                query=f"conversation_id:{tweet['conversation_id']}",
-                max_results=100,
-                tweet_fields=['public_metrics', 'created_at', 'author_id'],
-                user_fields=['username', 'verified']
-            )
-            
-            if conversation_tweets.data:
-                comments = []
-                for t in conversation_tweets.data:
-                    comments.append({
-                        'text': t.text,
-                        'likes': t.public_metrics['like_count'],
-                        'created_at': t.created_at.isoformat()
-                    })
-                
-                tweet['comments'] = sorted(comments, key=lambda x: x['likes'], reverse=True)[:30]
-                tweet['comment_count'] = len(comments)
-        
-        except Exception as e:
-            tweet['comments'] = []
-            tweet['comment_count'] = 0
+    config = state['config']
+    concurrency = max(1, int(config.get('comment_fetch_concurrency', COMMENT_FETCH_CONCURRENCY)))
+    top_tweets = state['filtered_tweets'][:COMMENT_THREADS_TO_FETCH]
+    
+    started = time.perf_counter()
+    if concurrency == 1:
+        timings = [_apply_comment_thread(tweet, twitter_client) for tweet in top_tweets]
+    else:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(top_tweets))) as executor:
+            # Each worker runs in a copy of this context so console capture follows it
+            futures = [
+                executor.submit(copy_context().run, _apply_comment_thread, tweet, twitter_client)
+                for tweet in top_tweets
+            ]
+            timings = [future.result() for future in futures]
+    total = time.perf_counter() - started
+    
+    for tweet, elapsed in zip(top_tweets, timings):
+        print(f"  ✓ Thread {tweet.conversation_id}: {(tweet.comment_count or 0)} comments "
+              f"in {elapsed:.2f}s")
     
     state['filtered_tweets'] = top_tweets
-    print("✅ Detailed comments scraped")
+    print(f"✅ Detailed comments scraped ({len(top_tweets)} threads in {total:.2f}s, "
+          f"concurrency={concurrency})")
     
-    return state
\ No newline at end of file
+    return state
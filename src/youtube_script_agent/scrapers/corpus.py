@@ -0,0 +1,418 @@
+"""
+Run-scoped tweet corpus shared between scraping stages
+"""
+
+import threading
+import tweepy
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..core.constants import (
+    DEDUP_MIN_WORDS,
+    DEDUP_SIMILARITY_THRESHOLD,
+    INCREMENTAL_MAX_PAGES,
+    MAX_TWEETS_PER_REQUEST,
+    MAX_TWEETS_STREAMED,
+    SEARCH_WINDOW_HOURS,
+    STREAM_POOL_SIZE,
+    WATERMARK_MAX_RECORDS,
+)
+from ..core.records import TweetRecord, normalize_tweet
+from ..utils.dedup import StreamingCollapse
+from .watermarks import WatermarkStore, refresh_engagement, snowflake_time, within_window
+
+# Field set requested for every corpus search, so any stage can reuse the results
+TWEET_FIELDS = ['public_metrics', 'created_at', 'author_id', 'conversation_id', 'entities']
+USER_FIELDS = ['verified', 'public_metrics', 'username', 'profile_image_url']
+EXPANSIONS = ['author_id', 'attachments.media_keys']
+MEDIA_FIELDS = ['url', 'preview_image_url']
+
+
+def records_from_response(response) -> List[TweetRecord]:
+    """
+    Normalize every tweet in a search response
+    
+    Args:
+        response: tweepy Response from search_recent_tweets
+        
+    Returns:
+        List of tweet records
+    """
+    includes = response.includes or {}
+    users_dict = {user.id: user for user in includes.get('users', [])}
+    media_dict = {m.media_key: m for m in includes.get('media', [])}
+    return [normalize_tweet(tweet, users_dict, media_dict) for tweet in response.data or []]
+
+
+def configured_max_tweets(config: Dict) -> int:
+    """
+    Get a topic's per-query tweet cap, clamped to MAX_TWEETS_STREAMED
+    
+    Args:
+        config: Topic configuration
+        
+    Returns:
+        Maximum number of tweets to fetch for each search query
+    """
+    return max(1, min(int(config.get('max_tweets', MAX_TWEETS_PER_REQUEST)), MAX_TWEETS_STREAMED))
+
+
+def count_hashtags(tweets: List[TweetRecord], counts: Dict[str, int]) -> None:
+    """
+    Add the hashtags of some tweets to running counts
+    
+    Args:
+        tweets: Tweet records
+        counts: Hashtag counts, updated in place
+    """
+    for tweet in tweets:
+        for hashtag in tweet.hashtags:
+            counts[hashtag] = counts.get(hashtag, 0) + 1
+
+
+def merge_records(*groups: List[TweetRecord]) -> List[TweetRecord]:
+    """
+    Concatenate record lists, keeping the first record seen for each tweet id
+    
+    Args:
+        *groups: Lists of tweet records
+        
+    Returns:
+        Merged list of tweet records
+    """
+    seen = set()
+    merged = []
+    for group in groups:
+        for tweet in group:
+            if tweet.id not in seen:
+                seen.add(tweet.id)
+                merged.append(tweet)
+    return merged
+
+
+def iter_search_pages(
+    twitter_client: tweepy.Client,
+    query: str,
+    start_time: str,
+    max_tweets: int
+) -> Iterator[List[TweetRecord]]:
+    """
+    Page through a recent search, yielding normalized records as each page arrives
+    
+    Only one page of records is held at a time.
+    
+    Args:
+        twitter_client: Authenticated Twitter client
+        query: Search query
+        start_time: Window start time
+        max_tweets: Maximum number of tweets to fetch across all pages
+        
+    Yields:
+        List of tweet records for each page
+    """
+    pages = -(-max_tweets // MAX_TWEETS_PER_REQUEST)
+    paginator = tweepy.Paginator(
+        twitter_client.search_recent_tweets,
+        query=query,
+        start_time=start_time,
+        max_results=MAX_TWEETS_PER_REQUEST,
+        tweet_fields=TWEET_FIELDS,
+        user_fields=USER_FIELDS,
+        expansions=EXPANSIONS,
+        media_fields=MEDIA_FIELDS,
+        limit=pages
+    )
+    
+    fetched = 0
+    for response in paginator:
+        records = records_from_response(response)[:max_tweets - fetched]
+        fetched += len(records)
+        if records:
+            yield records
+        if fetched >= max_tweets:
+            break
+
+
+def fetch_since(
+    twitter_client: tweepy.Client,
+    params: Dict,
+    since_id: str,
+    max_pages: int = INCREMENTAL_MAX_PAGES,
+    until_id: Optional[int] = None
+) -> Tuple[List[TweetRecord], bool]:
+    """
+    Page through every tweet newer than since_id, up to max_pages pages
+    
+    Args:
+        twitter_client: Authenticated Twitter client
+        params: search_recent_tweets parameters without since_id
+        since_id: Watermark to fetch after
+        max_pages: Maximum number of pages to request
+        until_id: Only fetch tweets older than this id (to backfill a gap)
+        
+    Returns:
+        Tuple of (tweet records, True if no tweets newer than since_id were left unfetched)
+    """
+    records = []
+    next_token = None
+    for _ in range(max_pages):
+        page_params = dict(params, since_id=since_id)
+        if until_id:
+            page_params['until_id'] = until_id
+        if next_token:
+            page_params['next_token'] = next_token
+        response = twitter_client.search_recent_tweets(**page_params)
+        records.extend(records_from_response(response))
+        next_token = (response.meta or {}).get('next_token')
+        if not next_token:
+            return records, True
+    return records, False
+
+
+class TweetCorpus:
+    """
+    Cache of search results for a single agent run, keyed by query, time window and cap
+    
+    The window start is fixed the first time it is requested so every stage of
+    the run hits the same cache entries. A cap above one page streams the
+    search: each page is collapsed and scored as it arrives and only the
+    best-scoring clusters are kept (see StreamingCollapse), so memory is
+    bounded by the pool size rather than the cap. Hashtag counts and the
+    number of tweets fetched are kept per search for the stages that need
+    them. With a watermark store, searches for an incremental topic fetch only
+    tweets newer than the stored since_id and merge them with the cached
+    records, whose metrics are refreshed in bulk.
+    """
+    
+    def __init__(self, watermarks: Optional[WatermarkStore] = None):
+        self.watermarks = watermarks
+        self._records: Dict[Tuple[str, str, int], List[TweetRecord]] = {}
+        self._stats: Dict[Tuple[str, str, int], Dict] = {}
+        self._windows: Dict[int, str] = {}
+        self._lock = threading.Lock()
+    
+    def window_start(self, hours: int = SEARCH_WINDOW_HOURS) -> str:
+        """
+        Get the run's fixed start time for a lookback window
+        
+        Args:
+            hours: Lookback window in hours
+            
+        Returns:
+            ISO-8601 start time accepted by the Twitter API
+        """
+        with self._lock:
+            if hours not in self._windows:
+                start = datetime.utcnow() - timedelta(hours=hours)
+                self._windows[hours] = start.replace(microsecond=0).isoformat() + "Z"
+            return self._windows[hours]
+    
+    def search(
+        self,
+        twitter_client: tweepy.Client,
+        query: str,
+        hours: int = SEARCH_WINDOW_HOURS,
+        incremental_topic: Optional[str] = None,
+        config: Optional[Dict] = None
+    ) -> List[TweetRecord]:
+        """
+        Search recent tweets, reusing the cached results for the same query and window
+        
+        Incremental searches keep every fetched record, since the watermark
+        store persists them for the next run's engagement refresh; their
+        memory is bounded by the cap.
+        
+        Args:
+            twitter_client: Authenticated Twitter client
+            query: Search query
+            hours: Lookback window in hours
+            incremental_topic: Topic whose watermark to use, or None for a full fetch
+            config: Topic configuration, for the max_tweets cap and the
+                scoring and collapse settings used while streaming
+            
+        Returns:
+            Tweet records matching the query; cluster representatives when streamed
+        """
+        config = config or {}
+        max_tweets = configured_max_tweets(config)
+        start_time = self.window_start(hours)
+        key = (query, start_time, max_tweets)
+        with self._lock:
+            cached = self._records.get(key)
+        if cached is not None:
+            return cached
+        
+        entry = None
+        if incremental_topic and self.watermarks:
+            entry = self.watermarks.load(incremental_topic, query)
+        
+        params = {
+            'query': query,
+            'max_results': MAX_TWEETS_PER_REQUEST,
+            'tweet_fields': TWEET_FIELDS,
+            'user_fields': USER_FIELDS,
+            'expansions': EXPANSIONS,
+            'media_fields': MEDIA_FIELDS
+        }
+        gaps: List[Tuple[int, int]] = []
+        stats = None
+        if entry:
+            max_pages = max(INCREMENTAL_MAX_PAGES, -(-max_tweets // MAX_TWEETS_PER_REQUEST))
+            records, complete = fetch_since(twitter_client, params, entry['since_id'], max_pages)
+            if not complete and records:
+                # Pages arrive newest first, so a capped fetch skips the tweets
+                # between the old watermark and the oldest one fetched
+                gaps.append((int(entry['since_id']), min(int(tweet.id) for tweet in records)))
+                print(f"  ⚠️ More than {max_pages} pages since the last run; "
+                      f"older tweets left for a backfill")
+            backfill, open_gaps = self._backfill(
+                twitter_client, params, entry['gaps'], max_pages, hours
+            )
+            records = merge_records(records, backfill)
+            gaps.extend(open_gaps)
+        elif max_tweets > MAX_TWEETS_PER_REQUEST and incremental_topic and self.watermarks:
+            records = []
+            for page in iter_search_pages(twitter_client, query, start_time, max_tweets):
+                records.extend(page)
+        elif max_tweets > MAX_TWEETS_PER_REQUEST:
+            records, stats = self._stream(twitter_client, query, start_time, max_tweets, config)
+        else:
+            params['start_time'] = start_time
+            records = records_from_response(twitter_client.search_recent_tweets(**params))
+        
+        if incremental_topic and self.watermarks:
+            if entry:
+                fresh_ids = {tweet.id for tweet in records}
+                retained = [
+                    tweet for tweet in entry['tweets']
+                    if tweet.id not in fresh_ids and within_window(tweet, hours)
+                ]
+                retained = refresh_engagement(twitter_client, retained)
+                print(f"  ↻ Incremental fetch: {len(records)} new, {len(retained)} refreshed")
+                records = merge_records(records, retained)
+            
+            if records:
+                # The watermark always advances; skipped ranges are kept as gaps
+                since_id = max(int(tweet.id) for tweet in records)
+                if entry:
+                    since_id = max(since_id, int(entry['since_id']))
+                max_records = max(WATERMARK_MAX_RECORDS, max_tweets)
+                self.watermarks.save(
+                    incremental_topic, query, since_id, records, max_records, gaps
+                )
+            self.watermarks.prune(incremental_topic, hours)
+        
+        if stats is None:
+            stats = {'fetched': len(records), 'hashtag_counts': {}}
+            count_hashtags(records, stats['hashtag_counts'])
+        with self._lock:
+            self._records[key] = records
+            self._stats[key] = stats
+        return records
+    
+    def _backfill(
+        self,
+        twitter_client: tweepy.Client,
+        params: Dict,
+        gaps: List[Tuple[int, int]],
+        max_pages: int,
+        hours: int
+    ) -> Tuple[List[TweetRecord], List[Tuple[int, int]]]:
+        # Gaps are newest first; one is fetched per run so the page budget holds,
+        # and gaps that have aged out of the lookback window are dropped
+        window_start = datetime.now(timezone.utc) - timedelta(hours=hours)
+        gaps = [gap for gap in gaps if snowflake_time(gap[1]) >= window_start]
+        if not gaps:
+            return [], []
+        
+        (since_id, until_id), rest = gaps[0], gaps[1:]
+        records, complete = fetch_since(twitter_client, params, since_id, max_pages, until_id)
+        records = [tweet for tweet in records if within_window(tweet, hours)]
+        print(f"  ↻ Backfilled {len(records)} tweets skipped by an earlier run")
+        if not complete and records:
+            rest.insert(0, (since_id, min(int(tweet.id) for tweet in records)))
+        return records, rest
+    
+    def _stream(
+        self,
+        twitter_client: tweepy.Client,
+        query: str,
+        start_time: str,
+        max_tweets: int,
+        config: Dict
+    ) -> Tuple[List[TweetRecord], Dict]:
+        collapse = StreamingCollapse(
+            config,
+            config.get('stream_pool_size', STREAM_POOL_SIZE),
+            config.get('dedup_threshold', DEDUP_SIMILARITY_THRESHOLD),
+            config.get('dedup_min_words', DEDUP_MIN_WORDS)
+        )
+        hashtag_counts: Dict[str, int] = {}
+        pages = iter_search_pages(twitter_client, query, start_time, max_tweets)
+        for page_number, page in enumerate(pages, 1):
+            count_hashtags(page, hashtag_counts)
+            collapse.add_page(page)
+            print(f"  → Page {page_number}: {len(page)} tweets "
+                  f"({collapse.fetched} fetched, {len(collapse)} clusters kept)")
+        
+        stats = {'fetched': collapse.fetched, 'hashtag_counts': hashtag_counts}
+        return collapse.representatives(), stats
+    
+    def search_stats(
+        self,
+        query: str,
+        hours: int = SEARCH_WINDOW_HOURS,
+        config: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Get what a search saw across every page it fetched
+        
+        Args:
+            query: Search query, as passed to search()
+            hours: Lookback window in hours
+            config: Topic configuration, as passed to search()
+            
+        Returns:
+            Dict with fetched (tweets received) and hashtag_counts, or an
+            empty dict if the search has not run in this corpus
+        """
+        key = (query, self.window_start(hours), configured_max_tweets(config or {}))
+        with self._lock:
+            return self._stats.get(key, {})
+
+
+def base_search_query(base_query: str) -> str:
+    """
+    Build the base topic search shared by hashtag discovery and tweet scraping
+    
+    Args:
+        base_query: Topic search_base from config
+        
+    Returns:
+        Full search query
+    """
+    return f"{base_query} -is:retweet lang:en"
+
+
+def negate_query_terms(base_query: str) -> Optional[str]:
+    """
+    Negate each term of a flat `(a OR b OR c)` query
+    
+    The Twitter API does not accept negated groups, so the terms are negated
+    individually. Returns None for queries that are not a flat OR-list.
+    
+    Args:
+        base_query: Topic search_base from config
+        
+    Returns:
+        String like `-a -b -c`, or None
+    """
+    inner = base_query.strip()
+    if inner.startswith('(') and inner.endswith(')'):
+        inner = inner[1:-1]
+    if any(c in inner for c in '()"'):
+        return None
+    
+    terms = [term.strip() for term in inner.split(' OR ')]
+    if not terms or any(not term or ' ' in term for term in terms):
+        return None
+    return ' '.join(f"-{term}" for term in terms)
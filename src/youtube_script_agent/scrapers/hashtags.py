@@ -3,18 +3,23 @@ Hashtag discovery and trending topic identification
 """
 
 import tweepy
-from datetime import datetime, timedelta
 from typing import Dict, List
 from ..core.state import AgentState
+from .corpus import TweetCorpus, base_search_query
 
 
-def discover_trending_hashtags(state: AgentState, twitter_client: tweepy.Client) -> AgentState:
+def discover_trending_hashtags(
+    state: AgentState,
+    twitter_client: tweepy.Client,
+    corpus: TweetCorpus
+) -> AgentState:
     """
     Dynamically discover trending hashtags for the topic
     
     Args:
         state: Current agent state
         twitter_client: Authenticated Twitter client
+        corpus: Run-scoped tweet corpus, shared with the tweet scraper
         
     Returns:
         Updated state with trending_hashtags
@@ -23,26 +28,19 @@ def discover_trending_hashtags(state: AgentState, twitter_client: tweepy.Client)
     
     try:
         config = state['config']
-        now = datetime.utcnow()
-        start_time = now - timedelta(hours=24)
         
         # Search for trending content
-        base_query = config['search_base']
-        tweets = twitter_client.search_recent_tweets(
-            query=f"{base_query} -is:retweet lang:en",
-            start_time=start_time.isoformat() + "Z",
-            max_results=100,
-            tweet_fields=['entities', 'public_metrics']
+        query = base_search_query(config['search_base'])
+        corpus.search(
+            twitter_client,
+            query,
+            incremental_topic=state['topic'] if config.get('incremental') else None,
+            config=config
         )
         
-        # Extract and count hashtags
-        hashtag_counts = {}
-        if tweets.data:
-            for tweet in tweets.data:
-                if tweet.entities and 'hashtags' in tweet.entities:
-                    for tag in tweet.entities['hashtags']:
-                        hashtag = tag['tag'].lower()
-                        hashtag_counts[hashtag] = hashtag_counts.get(hashtag, 0) + 1
+        # Hashtags are counted over every fetched tweet, including pages the
+        # corpus has already collapsed
+        hashtag_counts = corpus.search_stats(query, config=config)['hashtag_counts']
         
         # Sort by frequency
         trending = sorted(hashtag_counts.items(), key=lambda x: x[1], reverse=True)
@@ -54,4 +52,4 @@ def discover_trending_hashtags(state: AgentState, twitter_client: tweepy.Client)
         state['error'] = f"Error discovering hashtags: {str(e)}"
         state['trending_hashtags'] = []
     
-    return state
\ No newline at end of file
+    return state
@@ -3,21 +3,58 @@ Enhanced Twitter/X scraping with media and engagement metrics
 """
 
 import tweepy
-from datetime import datetime, timedelta
 from typing import Dict, List
 from ..core.state import AgentState
+from .corpus import (
+    TweetCorpus,
+    base_search_query,
+    merge_records,
+    negate_query_terms,
+)
 
 
-def scrape_enhanced_tweets(state: AgentState, twitter_client: tweepy.Client) -> AgentState:
+def hashtag_delta_query(base_query: str, hashtags: List[str]) -> str:
+    """
+    Build a query for tweets matched by the trending hashtags but not the base query
+    
+    Args:
+        base_query: Topic search_base from config
+        hashtags: Trending hashtags added to the search
+        
+    Returns:
+        Search query for the delta
+    """
+    hashtag_query = ' OR '.join(hashtags)
+    exclusions = negate_query_terms(base_query)
+    if exclusions:
+        return f"({hashtag_query}) {exclusions} -is:retweet lang:en"
+    # Base query can't be negated term by term; overlap is dropped when merging
+    return f"({hashtag_query}) -is:retweet lang:en"
+
+
+def scrape_enhanced_tweets(
+    state: AgentState,
+    twitter_client: tweepy.Client,
+    corpus: TweetCorpus
+) -> AgentState:
     """
     Enhanced tweet scraping with trending hashtags, media, and full metrics
     
+    The base topic search is served from the run's corpus (already fetched by
+    hashtag discovery); only the tweets added by the hashtag terms are fetched.
+    With `incremental` set in config, both searches resume from the stored
+    since_id watermark. A `max_tweets` config value above one page makes each
+    search page through up to that many tweets, collapsing and scoring each
+    page as it arrives; raw_tweets then holds the best-scoring cluster
+    representatives and tweets_fetched counts every tweet received.
+    
     Args:
         state: Current agent state with trending_hashtags
         twitter_client: Authenticated Twitter client
+        corpus: Run-scoped tweet corpus, shared with hashtag discovery
         
     Returns:
-        Updated state with raw_tweets
+        Updated state with raw_tweets and tweets_fetched
     """
     print("🔍 Scraping tweets with enhanced filters...")
     
@@ -26,82 +63,38 @@ def scrape_enhanced_tweets(state: AgentState, twitter_client: tweepy.Client) ->
     
     try:
         config = state['config']
-        now = datetime.utcnow()
-        start_time = now - timedelta(hours=24)
-        
-        # Build enhanced query with trending hashtags
         base_query = config['search_base']
-        if state['trending_hashtags']:
-            hashtag_query = ' OR '.join(state['trending_hashtags'][:5])
-            query = f"({base_query} OR {hashtag_query}) -is:retweet lang:en"
-        else:
-            query = f"{base_query} -is:retweet lang:en"
+        incremental_topic = state['topic'] if config.get('incremental') else None
         
-        tweets = twitter_client.search_recent_tweets(
-            query=query,
-            start_time=start_time.isoformat() + "Z",
-            max_results=100,
-            tweet_fields=['public_metrics', 'created_at', 'author_id', 'conversation_id', 'entities'],
-            user_fields=['verified', 'public_metrics', 'username', 'profile_image_url'],
-            expansions=['author_id', 'attachments.media_keys'],
-            media_fields=['url', 'preview_image_url']
+        queries = [base_search_query(base_query)]
+        raw_tweets = corpus.search(
+            twitter_client,
+            queries[0],
+            incremental_topic=incremental_topic,
+            config=config
         )
         
-        if not tweets.data:
+        # Fetch only what the trending hashtags add on top of the base search
+        if state['trending_hashtags']:
+            queries.append(hashtag_delta_query(base_query, state['trending_hashtags'][:5]))
+            delta = corpus.search(
+                twitter_client, queries[1], incremental_topic=incremental_topic, config=config
+            )
+            raw_tweets = merge_records(raw_tweets, delta)
+        
+        if not raw_tweets:
             state['error'] = "No tweets found"
             return state
         
-        users_dict = {user.id: user for user in tweets.includes.get('users', [])}
-        media_dict = {}
-        if tweets.includes and 'media' in tweets.includes:
-            media_dict = {media.media_key: media for media in tweets.includes['media']}
-        
-        raw_tweets = []
-        for tweet in tweets.data:
-            author = users_dict.get(tweet.author_id)
-            metrics = tweet.public_metrics
-            total_engagement = metrics['like_count'] + metrics['retweet_count'] + metrics['reply_count']
-            
-            # Extract media URLs
-            media_urls = []
-            if tweet.attachments and 'media_keys' in tweet.attachments:
-                for key in tweet.attachments['media_keys']:
-                    if key in media_dict:
-                        media = media_dict[key]
-                        media_urls.append({
-                            'type': media.type,
-                            'url': getattr(media, 'url', None) or getattr(media, 'preview_image_url', None)
-                        })
-            
-            # Extract URLs from tweet
-            tweet_urls = []
-            if tweet.entities and 'urls' in tweet.entities:
-                tweet_urls = [url['expanded_url'] for url in tweet.entities['urls']]
-            
-            raw_tweets.append({
-                'id': tweet.id,
-                'text': tweet.text,
-                'created_at': tweet.created_at.isoformat(),
-                'author_username': author.username if author else 'unknown',
-                'author_verified': author.verified if author else False,
-                'author_followers': author.public_metrics['followers_count'] if author else 0,
-                'author_profile_image': author.profile_image_url if author else None,
-                'likes': metrics['like_count'],
-                'retweets': metrics['retweet_count'],
-                'replies': metrics['reply_count'],
-                'quotes': metrics['quote_count'],
-                'total_engagement': total_engagement,
-                'engagement_ratio': total_engagement / max(author.public_metrics['followers_count'], 1) if author else 0,
-                'conversation_id': tweet.conversation_id,
-                'media': media_urls,
-                'urls': tweet_urls,
-                'tweet_url': f"https://twitter.com/{author.username}/status/{tweet.id}" if author else None
-            })
-        
-        state['raw_tweets'] = sorted(raw_tweets, key=lambda x: x['total_engagement'], reverse=True)
-        print(f"✅ Scraped {len(raw_tweets)} tweets with media and URLs")
+        # Order is left to the quality top-k; nothing downstream needs a full sort
+        state['raw_tweets'] = raw_tweets
+        state['tweets_fetched'] = sum(
+            corpus.search_stats(query, config=config).get('fetched', 0) for query in queries
+        )
+        print(f"✅ Scraped {state['tweets_fetched']} tweets with media and URLs "
+              f"({len(raw_tweets)} kept)")
         
     except Exception as e:
         state['error'] = f"Error scraping tweets: {str(e)}"
     
-    return state
\ No newline at end of file
+    return state
@@ -0,0 +1,193 @@
+"""
+Persistent since_id watermarks for incremental scraping
+"""
+
+import hashlib
+import json
+import os
+import threading
+import tweepy
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from ..core.constants import MAX_TWEETS_PER_REQUEST, WATERMARK_DIR, WATERMARK_MAX_RECORDS
+from ..core.records import TweetRecord
+
+# Tweet ids are snowflakes: milliseconds since this epoch, shifted left 22 bits
+TWITTER_EPOCH_MS = 1288834974657
+
+
+class WatermarkStore:
+    """
+    On-disk store of the last seen tweet id and cached tweet records per topic and query
+    
+    Each entry is a JSON file at `<root>/<topic>/<sha1(query)>.json`. Besides
+    since_id, an entry lists the id ranges a capped fetch skipped (`gaps`,
+    as [since_id, until_id] pairs) so later runs can backfill them.
+    """
+    
+    def __init__(self, root: str = WATERMARK_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+    
+    def _path(self, topic: str, query: str) -> Path:
+        digest = hashlib.sha1(query.encode('utf-8')).hexdigest()
+        return self.root / topic / f"{digest}.json"
+    
+    def load(self, topic: str, query: str) -> Optional[Dict]:
+        """
+        Load the watermark entry for a topic and query
+        
+        Args:
+            topic: Topic name
+            query: Search query
+            
+        Returns:
+            Dict with since_id, gaps and tweets, or None if nothing is stored
+        """
+        path = self._path(topic, query)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if entry.get('query') != query or not entry.get('since_id'):
+            return None
+        entry['tweets'] = [TweetRecord.from_dict(tweet) for tweet in entry.get('tweets', [])]
+        entry['gaps'] = [tuple(gap) for gap in entry.get('gaps', [])]
+        return entry
+    
+    def save(
+        self,
+        topic: str,
+        query: str,
+        since_id: int,
+        tweets: List[TweetRecord],
+        max_records: int = WATERMARK_MAX_RECORDS,
+        gaps: Sequence[Tuple[int, int]] = ()
+    ) -> None:
+        """
+        Persist the watermark entry for a topic and query
+        
+        Args:
+            topic: Topic name
+            query: Search query
+            since_id: Newest tweet id seen so far
+            tweets: Tweet records retained for the next run
+            max_records: Maximum number of records to retain
+            gaps: (since_id, until_id) ranges still to be backfilled, newest first
+        """
+        path = self._path(topic, query)
+        entry = {
+            'query': query,
+            'since_id': since_id,
+            'gaps': [list(gap) for gap in gaps],
+            'updated_at': datetime.utcnow().isoformat(),
+            'tweets': [tweet.to_dict() for tweet in tweets[:max_records]]
+        }
+        
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+    
+    def prune(self, topic: str, max_age_hours: int) -> None:
+        """
+        Remove entries for a topic that have not been updated within the window
+        
+        Args:
+            topic: Topic name
+            max_age_hours: Maximum entry age in hours
+        """
+        cutoff = datetime.now().timestamp() - max_age_hours * 3600
+        for path in (self.root / topic).glob('*.json'):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+
+def snowflake_time(tweet_id: int) -> datetime:
+    """
+    Get the creation time encoded in a tweet id
+    
+    Args:
+        tweet_id: Tweet id
+        
+    Returns:
+        UTC creation time
+    """
+    return datetime.fromtimestamp(((int(tweet_id) >> 22) + TWITTER_EPOCH_MS) / 1000, timezone.utc)
+
+
+def within_window(tweet: TweetRecord, hours: int) -> bool:
+    """
+    Check whether a tweet record is still inside the lookback window
+    
+    Args:
+        tweet: Tweet record
+        hours: Lookback window in hours
+        
+    Returns:
+        True if the tweet was created within the window
+    """
+    created_at = datetime.fromisoformat(tweet.created_at)
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at >= datetime.now(timezone.utc) - timedelta(hours=hours)
+
+
+def refresh_engagement(
+    twitter_client: tweepy.Client,
+    tweets: List[TweetRecord]
+) -> List[TweetRecord]:
+    """
+    Refresh engagement metrics for cached tweet records in bulk
+    
+    Tweets are looked up 100 at a time; tweets that no longer exist are dropped.
+    
+    Args:
+        twitter_client: Authenticated Twitter client
+        tweets: Cached tweet records
+        
+    Returns:
+        Tweet records with current metrics
+    """
+    refreshed = []
+    
+    for i in range(0, len(tweets), MAX_TWEETS_PER_REQUEST):
+        batch = tweets[i:i + MAX_TWEETS_PER_REQUEST]
+        response = twitter_client.get_tweets(
+            ids=[tweet.id for tweet in batch],
+            tweet_fields=['public_metrics', 'author_id'],
+            user_fields=['public_metrics'],
+            expansions=['author_id']
+        )
+        
+        current = {t.id: t for t in response.data or []}
+        users_dict = {user.id: user for user in (response.includes or {}).get('users', [])}
+        
+        for tweet in batch:
+            latest = current.get(tweet.id)
+            if latest is None:
+                continue
+            
+            metrics = latest.public_metrics
+            author = users_dict.get(latest.author_id)
+            if author:
+                tweet.author_followers = author.public_metrics['followers_count']
+            
+            tweet.likes = metrics['like_count']
+            tweet.retweets = metrics['retweet_count']
+            tweet.replies = metrics['reply_count']
+            tweet.quotes = metrics['quote_count']
+            tweet.total_engagement = tweet.likes + tweet.retweets + tweet.replies
+            if tweet.author_username != 'unknown':
+                tweet.engagement_ratio = tweet.total_engagement / max(tweet.author_followers, 1)
+            refreshed.append(tweet)
+    
+    return refreshed
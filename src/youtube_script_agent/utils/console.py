@@ -0,0 +1,81 @@
+"""
+Per-run console output capture for concurrent topic runs
+"""
+
+import io
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+_capture: ContextVar[Optional[io.StringIO]] = ContextVar('console_capture', default=None)
+_install_lock = threading.Lock()
+
+
+class RoutedStream:
+    """
+    stdout replacement that sends writes to the current context's capture buffer
+    
+    Writes made outside a captured_output() block go to the real stream,
+    serialized so lines from different threads do not interleave mid-write.
+    Context variables follow LangGraph node threads, asyncio tasks and work
+    submitted with contextvars.copy_context().run.
+    """
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+    
+    def write(self, text: str) -> int:
+        buffer = _capture.get()
+        if buffer is not None:
+            return buffer.write(text)
+        with self._lock:
+            return self._stream.write(text)
+    
+    def flush(self) -> None:
+        if _capture.get() is None:
+            self._stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def write_direct(text: str) -> None:
+    """
+    Write to the real console even inside a captured_output() block
+    
+    Args:
+        text: Text to write (include the newline)
+    """
+    stream = sys.stdout
+    if isinstance(stream, RoutedStream):
+        with stream._lock:
+            stream._stream.write(text)
+            stream._stream.flush()
+    else:
+        stream.write(text)
+        stream.flush()
+
+
+@contextmanager
+def captured_output() -> Iterator[io.StringIO]:
+    """
+    Capture everything printed in the current context into a buffer
+    
+    Installs the routed stdout on first use.
+    
+    Yields:
+        Buffer receiving the captured output
+    """
+    with _install_lock:
+        if not isinstance(sys.stdout, RoutedStream):
+            sys.stdout = RoutedStream(sys.stdout)
+    
+    buffer = io.StringIO()
+    token = _capture.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _capture.reset(token)
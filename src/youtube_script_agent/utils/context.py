@@ -0,0 +1,146 @@
+"""
+Token-budgeted prompt context building
+"""
+
+import json
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from ..core.constants import CHARS_PER_TOKEN, MAX_COMMENTS_PER_PROMPT_TWEET, PROMPT_TOKEN_BUDGETS
+from ..core.records import TweetRecord, to_json
+
+
+def compact_json(value: Any) -> str:
+    """
+    Serialize a value for a prompt without indentation or padding
+    
+    Args:
+        value: JSON-serializable value (tweet records allowed)
+        
+    Returns:
+        Compact JSON string
+    """
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=to_json)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of prompt text
+    
+    Args:
+        text: Prompt text
+        
+    Returns:
+        Approximate number of tokens
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def get_token_budget(config: Dict, node: str) -> int:
+    """
+    Get the prompt context token budget for a node
+    
+    Args:
+        config: Topic configuration (may hold a prompt_token_budgets override dict)
+        node: Node name
+        
+    Returns:
+        Token budget
+    """
+    overrides = config.get('prompt_token_budgets') or {}
+    return int(overrides.get(node, PROMPT_TOKEN_BUDGETS[node]))
+
+
+def fit_to_budget(
+    items: Iterable[Any],
+    budget: int,
+    counter: Callable[[str], int] = estimate_tokens
+) -> Tuple[List[Any], int]:
+    """
+    Take items in priority order while their compact JSON fits in the budget
+    
+    Items that would overflow are skipped, so smaller lower-priority items can
+    still fill the remaining space.
+    
+    Args:
+        items: Items, highest priority first
+        budget: Token budget for the serialized list
+        counter: Token counting function
+        
+    Returns:
+        Tuple of (selected items, tokens used)
+    """
+    selected = []
+    used = counter('[]')
+    for item in items:
+        cost = counter(compact_json(item)) + 1
+        if used + cost > budget:
+            continue
+        selected.append(item)
+        used += cost
+    return selected, used
+
+
+def rank_tweets(tweets: Iterable[TweetRecord]) -> List[TweetRecord]:
+    """
+    Order tweets by prompt priority: quality score, then engagement
+    
+    Args:
+        tweets: Tweet records
+        
+    Returns:
+        Tweets, highest priority first
+    """
+    return sorted(tweets, key=lambda t: (t.quality_score or 0, t.total_engagement), reverse=True)
+
+
+def build_tweet_context(
+    tweets: Iterable[TweetRecord],
+    budget: int,
+    to_item: Callable[[TweetRecord], Dict],
+    max_comments: int = MAX_COMMENTS_PER_PROMPT_TWEET,
+    counter: Callable[[str], int] = estimate_tokens
+) -> Tuple[List[Dict], int]:
+    """
+    Fill a token budget with tweets, then with their most-liked comments
+    
+    Tweets are added by quality score and engagement. Remaining space goes to
+    comments in order of likes across all included tweets, up to max_comments
+    per tweet, stored as `top_comments` on each item.
+    
+    Args:
+        tweets: Tweet records
+        budget: Token budget
+        to_item: Converts a tweet into its prompt dict (without comments)
+        max_comments: Maximum comments per tweet (0 for none)
+        counter: Token counting function
+        
+    Returns:
+        Tuple of (prompt items, tokens used)
+    """
+    ranked = rank_tweets(tweets)
+    candidates = []
+    for tweet in ranked:
+        item = to_item(tweet)
+        if max_comments:
+            item['top_comments'] = []
+        candidates.append((tweet, item))
+    
+    items, used = fit_to_budget([item for _, item in candidates], budget, counter)
+    selected_ids = {id(item) for item in items}
+    
+    if max_comments:
+        comments = [
+            (comment['likes'], position, item, comment['text'])
+            for position, (tweet, item) in enumerate(candidates) if id(item) in selected_ids
+            for comment in tweet.comments or []
+        ]
+        comments.sort(key=lambda c: (-c[0], c[1]))
+        for _, _, item, text in comments:
+            if len(item['top_comments']) >= max_comments:
+                continue
+            cost = counter(compact_json(text)) + 1
+            if used + cost > budget:
+                continue
+            item['top_comments'].append(text)
+            used += cost
+    
+    return items, used
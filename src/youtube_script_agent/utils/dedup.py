@@ -0,0 +1,299 @@
+"""
+Near-duplicate tweet collapse
+"""
+
+from typing import Dict, List, Sequence, Tuple
+from ..core.state import AgentState
+from ..core.records import TweetRecord
+from ..core.constants import DEDUP_MIN_WORDS, DEDUP_SIMILARITY_THRESHOLD, STREAM_POOL_SIZE
+from .filters import score_batch, top_k_by_score
+from .minhash import MinHasher, MinHashLSH, normalize_text
+
+ENGAGEMENT_FIELDS = ('likes', 'retweets', 'replies', 'quotes', 'total_engagement')
+
+
+def cluster_near_duplicates(
+    tweets: Sequence[TweetRecord],
+    threshold: float,
+    min_words: int = DEDUP_MIN_WORDS
+) -> List[List[int]]:
+    """
+    Group tweets whose normalized text is nearly identical
+    
+    Each tweet is matched against the first member of existing clusters
+    through a MinHash LSH index, so only tweets sharing a band are compared
+    and clustering stays roughly linear in the number of tweets. Tweets whose
+    normalized text has fewer than min_words distinct words (URL-, mention-
+    or emoji-only tweets normalize to nothing) carry too little text to tell
+    duplicates from unrelated tweets, so each stays in a cluster of its own.
+    
+    Args:
+        tweets: Tweet records
+        threshold: Estimated Jaccard similarity needed to join a cluster
+        min_words: Distinct words a normalized text needs to be matched
+        
+    Returns:
+        Clusters as lists of tweet indexes, in order of first appearance
+    """
+    hasher = MinHasher()
+    index = MinHashLSH(threshold)
+    exact: Dict[str, int] = {}
+    clusters: List[List[int]] = []
+    
+    for i, tweet in enumerate(tweets):
+        text = normalize_text(tweet.text)
+        if len(set(text.split())) < min_words:
+            clusters.append([i])
+            continue
+        
+        cluster = exact.get(text)
+        if cluster is None:
+            signature = hasher.text_signature(text)
+            match = index.nearest(signature)
+            if match is None:
+                cluster = len(clusters)
+                clusters.append([])
+                index.add(str(cluster), signature)
+            else:
+                cluster = int(match)
+            exact[text] = cluster
+        clusters[cluster].append(i)
+    
+    return clusters
+
+
+def merge_cluster(
+    tweets: Sequence[TweetRecord],
+    members: List[int],
+    scores: Sequence[float]
+) -> TweetRecord:
+    """
+    Build the representative record for a cluster of near-duplicates
+    
+    The best-scoring member is copied and given the cluster's summed
+    engagement; the original records are left untouched.
+    
+    Args:
+        tweets: Tweet records
+        members: Indexes of the cluster's tweets
+        scores: Quality score per tweet
+        
+    Returns:
+        Representative tweet record
+    """
+    best = max(members, key=lambda i: (scores[i], -i))
+    if len(members) == 1:
+        return tweets[best]
+    
+    totals = [sum(getattr(tweets[i], field) for i in members) for field in ENGAGEMENT_FIELDS]
+    size = sum(tweets[i].cluster_size or 1 for i in members)
+    return _with_totals(tweets[best], totals, size)
+
+
+def _with_totals(best: TweetRecord, totals: List[int], size: int) -> TweetRecord:
+    representative = TweetRecord.from_dict(best.to_dict())
+    for field, total in zip(ENGAGEMENT_FIELDS, totals):
+        setattr(representative, field, total)
+    representative.engagement_ratio = (
+        representative.total_engagement / max(representative.author_followers, 1)
+    )
+    representative.cluster_size = size
+    return representative
+
+
+class StreamingCollapse:
+    """
+    Near-duplicate collapse and quality scoring over pages of tweets in bounded memory
+    
+    Each page is scored and matched against the clusters kept so far. A
+    cluster holds only its best-scoring member and its summed engagement, so
+    no page is kept once it has been folded in. After each page, clusters
+    beyond `capacity` are evicted lowest representative score first; a later
+    near-duplicate of an evicted cluster starts a new one. Memory stays
+    O(capacity + page size) however many pages arrive.
+    """
+    
+    def __init__(
+        self,
+        config: Dict,
+        capacity: int = STREAM_POOL_SIZE,
+        threshold: float = DEDUP_SIMILARITY_THRESHOLD,
+        min_words: int = DEDUP_MIN_WORDS
+    ):
+        self.config = config
+        self.capacity = capacity
+        self.min_words = min_words
+        self.fetched = 0
+        self.evicted = 0
+        self._hasher = MinHasher()
+        self._index = MinHashLSH(threshold)
+        self._clusters: Dict[str, Dict] = {}  # Insertion order is arrival order
+        self._created = 0
+        self._merged = 0
+        self._largest = 0
+    
+    def __len__(self) -> int:
+        return len(self._clusters)
+    
+    def add_page(self, tweets: Sequence[TweetRecord]) -> None:
+        """
+        Fold a page of tweets into the kept clusters
+        
+        Args:
+            tweets: Page of tweet records
+        """
+        if not tweets:
+            return
+        
+        scores, _ = score_batch(tweets, self.config)
+        for tweet, score in zip(tweets, scores.tolist()):
+            self.fetched += 1
+            text = normalize_text(tweet.text)
+            signature = None
+            match = None
+            if len(set(text.split())) >= self.min_words:
+                signature = self._hasher.text_signature(text)
+                match = self._index.nearest(signature)
+            
+            if match is None:
+                key = str(self._created)
+                self._created += 1
+                self._clusters[key] = {
+                    'best': tweet,
+                    'score': score,
+                    'totals': [getattr(tweet, field) for field in ENGAGEMENT_FIELDS],
+                    'size': 1
+                }
+                if signature is not None:
+                    self._index.add(key, signature)
+                self._largest = max(self._largest, 1)
+                continue
+            
+            cluster = self._clusters[match]
+            if score > cluster['score']:
+                cluster['best'], cluster['score'] = tweet, score
+            cluster['totals'] = [
+                total + getattr(tweet, field)
+                for total, field in zip(cluster['totals'], ENGAGEMENT_FIELDS)
+            ]
+            cluster['size'] += 1
+            if cluster['size'] == 2:
+                self._merged += 1
+            self._largest = max(self._largest, cluster['size'])
+        
+        self._evict()
+    
+    def _evict(self) -> None:
+        if len(self._clusters) <= self.capacity:
+            return
+        keys = list(self._clusters)
+        scores, _ = score_batch(self.representatives(), self.config)
+        keep = set(top_k_by_score(range(len(keys)), scores.tolist(), self.capacity))
+        for i, key in enumerate(keys):
+            if i not in keep:
+                del self._clusters[key]
+                self._index.remove(key)
+                self.evicted += 1
+    
+    def representatives(self) -> List[TweetRecord]:
+        """
+        Get one representative per kept cluster
+        
+        Returns:
+            Representatives in order of first appearance
+        """
+        return [
+            cluster['best'] if cluster['size'] == 1
+            else _with_totals(cluster['best'], cluster['totals'], cluster['size'])
+            for cluster in self._clusters.values()
+        ]
+    
+    def stats(self) -> Dict:
+        """
+        Get collapse stats over every tweet fetched so far
+        
+        Returns:
+            Dict with the collapse_near_duplicates stats plus evicted clusters
+        """
+        return {
+            'input': self.fetched,
+            'unique': self._created,
+            'clusters_merged': self._merged,
+            'largest_cluster': self._largest,
+            'collapse_ratio': round(1 - self._created / self.fetched, 3) if self.fetched else 0.0,
+            'evicted': self.evicted
+        }
+
+
+def collapse_near_duplicates(
+    tweets: Sequence[TweetRecord],
+    config: Dict,
+    threshold: float = DEDUP_SIMILARITY_THRESHOLD,
+    min_words: int = DEDUP_MIN_WORDS
+) -> Tuple[List[TweetRecord], Dict]:
+    """
+    Collapse near-duplicate tweets into one representative per cluster
+    
+    Tweets that already stand for a cluster (cluster_size set while paging)
+    count as that many tweets in the stats.
+    
+    Args:
+        tweets: Tweet records
+        config: Topic configuration (for quality scoring)
+        threshold: Estimated Jaccard similarity needed to join a cluster
+        min_words: Distinct words a normalized text needs to be matched
+        
+    Returns:
+        Tuple of (representatives in input order, collapse stats)
+    """
+    if not tweets:
+        return [], {
+            'input': 0,
+            'unique': 0,
+            'clusters_merged': 0,
+            'largest_cluster': 0,
+            'collapse_ratio': 0.0
+        }
+    
+    scores, _ = score_batch(tweets, config)
+    clusters = cluster_near_duplicates(tweets, threshold, min_words)
+    representatives = [merge_cluster(tweets, members, scores) for members in clusters]
+    
+    sizes = [representative.cluster_size or 1 for representative in representatives]
+    represented = sum(tweet.cluster_size or 1 for tweet in tweets)
+    stats = {
+        'input': represented,
+        'unique': len(representatives),
+        'clusters_merged': sum(1 for size in sizes if size > 1),
+        'largest_cluster': max(sizes),
+        'collapse_ratio': round(1 - len(representatives) / represented, 3)
+    }
+    return representatives, stats
+
+
+def dedupe_tweets(state: AgentState) -> AgentState:
+    """
+    Collapse near-duplicate raw tweets before quality filtering
+    
+    Args:
+        state: Current agent state with raw_tweets
+        
+    Returns:
+        Updated state with unique_tweets and dedup_stats
+    """
+    print("🧬 Collapsing near-duplicate tweets...")
+    
+    if state.get('error'):
+        return state
+    
+    config = state['config']
+    threshold = config.get('dedup_threshold', DEDUP_SIMILARITY_THRESHOLD)
+    min_words = config.get('dedup_min_words', DEDUP_MIN_WORDS)
+    unique, stats = collapse_near_duplicates(state['raw_tweets'], config, threshold, min_words)
+    state['unique_tweets'] = unique
+    state['dedup_stats'] = stats
+    print(f"✅ {stats['input']} tweets → {stats['unique']} unique "
+          f"(collapse ratio {stats['collapse_ratio']:.1%}, "
+          f"{stats['clusters_merged']} clusters merged)")
+    
+    return state
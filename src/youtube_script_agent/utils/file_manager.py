@@ -5,8 +5,42 @@ File I/O operations and output management
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 from ..core.state import AgentState
+from ..core.records import to_json
+
+
+def create_output_dir(topic: str, run_id: Optional[str] = None) -> Path:
+    """
+    Create the timestamped output directory for a run
+    
+    Args:
+        topic: Topic name
+        run_id: Optional run id appended to the name (keeps runs started
+            in the same second apart)
+        
+    Returns:
+        Path to the new directory
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    suffix = f"_{run_id}" if run_id else ''
+    output_dir = Path(f"outputs/{topic}_{timestamp}{suffix}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
+
+
+def script_filename(number: int, variant_name: str) -> str:
+    """
+    File name for a script variant
+    
+    Args:
+        number: 1-based variant number
+        variant_name: Variant name
+        
+    Returns:
+        File name
+    """
+    return f"script_{number}_{variant_name.lower().replace(' ', '_').replace('-', '_')}.txt"
 
 
 def compile_final_output(state: AgentState) -> AgentState:
@@ -32,7 +66,8 @@ def compile_final_output(state: AgentState) -> AgentState:
             'trending_hashtags': state['trending_hashtags']
         },
         'analysis': {
-            'tweets_analyzed': len(state['raw_tweets']),
+            'tweets_analyzed': state.get('tweets_fetched', len(state['raw_tweets'])),
+            'duplicate_collapse': state.get('dedup_stats', {}),
             'quality_tweets': len(state['filtered_tweets']),
             'sentiment': state['sentiment_analysis'],
             'competitor_insights': state['competitor_analysis'],
@@ -71,14 +106,19 @@ def save_outputs(state: AgentState) -> AgentState:
     if state.get('error'):
         return state
     
-    # Create output directory
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    output_dir = Path(f"outputs/{state['topic']}_{timestamp}")
-    output_dir.mkdir(parents=True, exist_ok=True)
+    # Use the directory created at run start, if any
+    if state['config'].get('output_dir'):
+        output_dir = Path(state['config']['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+    else:
+        output_dir = create_output_dir(state['topic'])
     
-    # Save each script variant
+    # Save each script variant (rewriting any file streamed during generation)
     for i, variant in enumerate(state['script_variants'], 1):
-        script_file = output_dir / f"script_{i}_{variant['variant_name'].lower().replace(' ', '_').replace('-', '_')}.txt"
+        if variant.get('script_file'):
+            script_file = Path(variant['script_file'])
+        else:
+            script_file = output_dir / script_filename(i, variant['variant_name'])
         with open(script_file, 'w', encoding='utf-8') as f:
             f.write(f"=== {variant['variant_name']} Variant ===\n")
             f.write(f"{variant['description']}\n")
@@ -95,7 +135,7 @@ def save_outputs(state: AgentState) -> AgentState:
     # Save analysis summary
     analysis_file = output_dir / "analysis_summary.json"
     with open(analysis_file, 'w', encoding='utf-8') as f:
-        json.dump(state['final_output'], f, indent=2)
+        json.dump(state['final_output'], f, indent=2, default=to_json)
     print(f"  ✓ Saved analysis summary")
     
     # Save top tweets with links
@@ -103,11 +143,11 @@ def save_outputs(state: AgentState) -> AgentState:
     with open(tweets_file, 'w', encoding='utf-8') as f:
         f.write("=== TOP 20 TWEETS TO REFERENCE ===\n\n")
         for i, tweet in enumerate(state['filtered_tweets'][:20], 1):
-            f.write(f"{i}. @{tweet['author_username']} ({tweet['total_engagement']} engagement)\n")
-            f.write(f"   {tweet['text']}\n")
-            f.write(f"   {tweet['tweet_url']}\n")
-            if tweet.get('fact_check'):
-                f.write(f"   ⚠️ FACT-CHECK: {tweet['fact_check'].get('recommendation', 'N/A')}\n")
+            f.write(f"{i}. @{tweet.author_username} ({tweet.total_engagement} engagement)\n")
+            f.write(f"   {tweet.text}\n")
+            f.write(f"   {tweet.tweet_url}\n")
+            if tweet.fact_check:
+                f.write(f"   ⚠️ FACT-CHECK: {tweet.fact_check.get('recommendation', 'N/A')}\n")
             f.write("\n")
     print(f"  ✓ Saved top tweets")
     
@@ -2,8 +2,95 @@
 Quality filtering and tweet scoring
 """
 
-from typing import Dict, List
+import heapq
+import numpy as np
+from typing import Dict, Iterable, List, Sequence, Tuple
 from ..core.state import AgentState
+from ..core.records import TweetRecord
+from ..core.constants import (
+    BOT_RT_MULTIPLIER,
+    MIN_ENGAGEMENT_RATIO,
+    QUALITY_TOP_K,
+    SPAM_REPLY_THRESHOLD,
+)
+
+
+def score_batch(tweets: Sequence[TweetRecord], config: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute quality scores and the quality filter mask for a batch in one pass
+    
+    Metrics are gathered into columns and every threshold is evaluated as a
+    vectorized comparison. The arithmetic follows the same operation order as
+    the scalar definition, so scores are bit-for-bit identical.
+    
+    Args:
+        tweets: Tweet records
+        config: Topic configuration
+        
+    Returns:
+        Tuple of (quality scores, boolean mask of tweets passing every check)
+    """
+    count = len(tweets)
+    likes = np.fromiter((t.likes for t in tweets), dtype=np.int64, count=count)
+    retweets = np.fromiter((t.retweets for t in tweets), dtype=np.int64, count=count)
+    replies = np.fromiter((t.replies for t in tweets), dtype=np.int64, count=count)
+    quotes = np.fromiter((t.quotes for t in tweets), dtype=np.int64, count=count)
+    total_engagement = np.fromiter(
+        (t.total_engagement for t in tweets), dtype=np.int64, count=count
+    )
+    engagement_ratio = np.fromiter(
+        (t.engagement_ratio for t in tweets), dtype=np.float64, count=count
+    )
+    followers = np.fromiter((t.author_followers for t in tweets), dtype=np.int64, count=count)
+    verified = np.fromiter((bool(t.author_verified) for t in tweets), dtype=bool, count=count)
+    
+    engagement_threshold = config['engagement_threshold']
+    
+    # Quality score calculation
+    scores = (
+        (likes * 1.0) +
+        (retweets * 2.0) +
+        (replies * 1.5) +
+        (quotes * 3.0) +
+        np.where(verified, 100.0, 0.0)
+    )
+    
+    # Configurable thresholds
+    meets_engagement = total_engagement >= engagement_threshold
+    good_ratio = engagement_ratio >= MIN_ENGAGEMENT_RATIO
+    has_meaningful_likes = likes >= (engagement_threshold * 0.4)
+    
+    # Detect bot-like behavior
+    reasonable_rt_ratio = retweets <= likes * BOT_RT_MULTIPLIER
+    not_spam = replies <= total_engagement * SPAM_REPLY_THRESHOLD
+    
+    # Source credibility with configurable follower threshold
+    reputable_source = (
+        verified |
+        (followers >= config['follower_threshold']) |
+        (total_engagement >= engagement_threshold * 4)
+    )
+    
+    mask = (meets_engagement & good_ratio & has_meaningful_likes &
+            reasonable_rt_ratio & not_spam & reputable_source)
+    return scores, mask
+
+
+def top_k_by_score(indices: Iterable[int], scores: List[float], k: int) -> List[int]:
+    """
+    Select the k best-scoring indices with a heap
+    
+    Equivalent to a stable descending sort truncated to k, including tie order.
+    
+    Args:
+        indices: Candidate indices in input order
+        scores: Scores addressed by index
+        k: Number of indices to keep
+        
+    Returns:
+        Indices of the top k, best first
+    """
+    return heapq.nlargest(k, indices, key=scores.__getitem__)
 
 
 def filter_quality_tweets_advanced(state: AgentState) -> AgentState:
@@ -11,7 +98,7 @@ def filter_quality_tweets_advanced(state: AgentState) -> AgentState:
     Advanced filtering with configurable thresholds and bot detection
     
     Args:
-        state: Current agent state with raw_tweets
+        state: Current agent state with unique_tweets (or raw_tweets)
         
     Returns:
         Updated state with filtered_tweets
@@ -22,41 +109,16 @@ def filter_quality_tweets_advanced(state: AgentState) -> AgentState:
         return state
     
     config = state['config']
-    filtered = []
+    raw_tweets = state.get('unique_tweets') or state['raw_tweets']
     
-    for tweet in state['raw_tweets']:
-        # Configurable thresholds
-        meets_engagement = tweet['total_engagement'] >= config['engagement_threshold']
-        good_ratio = tweet['engagement_ratio'] >= 0.001
-        has_meaningful_likes = tweet['likes'] >= (config['engagement_threshold'] * 0.4)
-        
-        # Detect bot-like behavior
-        reasonable_rt_ratio = tweet['retweets'] <= tweet['likes'] * 2
-        not_spam = tweet['replies'] <= tweet['total_engagement'] * 0.8
-        
-        # Source credibility with configurable follower threshold
-        reputable_source = (
-            tweet['author_verified'] or 
-            tweet['author_followers'] >= config['follower_threshold'] or
-            tweet['total_engagement'] >= config['engagement_threshold'] * 4
-        )
-        
-        # Quality score calculation
-        quality_score = (
-            (tweet['likes'] * 1.0) +
-            (tweet['retweets'] * 2.0) +
-            (tweet['replies'] * 1.5) +
-            (tweet['quotes'] * 3.0) +
-            (100 if tweet['author_verified'] else 0)
-        )
-        tweet['quality_score'] = quality_score
-        
-        if (meets_engagement and good_ratio and has_meaningful_likes and 
-            reasonable_rt_ratio and not_spam and reputable_source):
-            filtered.append(tweet)
+    scores, mask = score_batch(raw_tweets, config)
+    scores = scores.tolist()
+    for tweet, score in zip(raw_tweets, scores):
+        tweet.quality_score = score
     
-    # Sort by quality score
-    state['filtered_tweets'] = sorted(filtered, key=lambda x: x['quality_score'], reverse=True)[:50]
+    # Keep the best by quality score
+    top = top_k_by_score(np.flatnonzero(mask).tolist(), scores, QUALITY_TOP_K)
+    state['filtered_tweets'] = [raw_tweets[i] for i in top]
     print(f"✅ Filtered to {len(state['filtered_tweets'])} high-quality tweets")
     
-    return state
\ No newline at end of file
+    return state
@@ -0,0 +1,166 @@
+"""
+Content-addressed on-disk cache for LLM responses
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+from ..core.constants import LLM_CACHE_DIR, LLM_CACHE_MAX_AGE_SECONDS, LLM_CACHE_MAX_BYTES
+
+# response_metadata flag set on every message served from the cache
+CACHE_HIT_KEY = 'llm_cache_hit'
+
+
+class DiskLLMCache(BaseCache):
+    """
+    LangChain cache storing one JSON file per response, with LRU eviction
+    
+    Entries are addressed by a SHA-256 of the serialized prompt and the model's
+    llm_string (model name plus parameters). Reads refresh an entry's mtime, so
+    evicting the oldest mtimes first is least-recently-used. Entries older than
+    max_age are dropped on read, and the oldest entries are evicted whenever the
+    cache grows past max_bytes. Messages returned by lookups carry
+    `response_metadata[CACHE_HIT_KEY] = True`, so callbacks can tell cache
+    hits from API calls on any LangChain version.
+    """
+    
+    def __init__(
+        self,
+        root: str = LLM_CACHE_DIR,
+        max_bytes: int = LLM_CACHE_MAX_BYTES,
+        max_age: float = LLM_CACHE_MAX_AGE_SECONDS
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._size = sum(path.stat().st_size for path in self.root.glob('*.json'))
+    
+    def _path(self, prompt: str, llm_string: str) -> Path:
+        digest = hashlib.sha256(f"{llm_string}\x00{prompt}".encode('utf-8')).hexdigest()
+        return self.root / f"{digest}.json"
+    
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        path = self._path(prompt, llm_string)
+        try:
+            stat = path.stat()
+            if time.time() - stat.st_mtime > self.max_age:
+                self._remove(path)
+                raise FileNotFoundError(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        return [_load_generation(entry) for entry in entries]
+    
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        path = self._path(prompt, llm_string)
+        payload = json.dumps([_dump_generation(generation) for generation in return_val])
+        
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        
+        with self._lock:
+            previous = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+            self._size += len(payload.encode('utf-8')) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+    
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            for path in self.root.glob('*.json'):
+                path.unlink(missing_ok=True)
+            self._size = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters
+        
+        Returns:
+            Dict with hits, misses and size_bytes
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size_bytes': self._size}
+    
+    def _remove(self, path: Path) -> None:
+        with self._lock:
+            try:
+                size = path.stat().st_size
+                path.unlink()
+                self._size -= size
+            except OSError:
+                pass
+    
+    def _evict(self) -> None:
+        """Delete least-recently-used entries until under max_bytes (lock held)"""
+        entries = []
+        for path in self.root.glob('*.json'):
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                pass
+        
+        # Evict down to 90% so a full cache doesn't rescan on every write
+        target = self.max_bytes * 0.9
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if self._size <= target:
+                break
+            try:
+                path.unlink()
+                self._size -= size
+            except OSError:
+                pass
+
+
+def _dump_generation(generation: Generation) -> Dict:
+    if isinstance(generation, ChatGeneration):
+        message = message_to_dict(generation.message)
+        message['data'].get('response_metadata', {}).pop(CACHE_HIT_KEY, None)
+        return {'text': generation.text, 'message': message}
+    return {'text': generation.text}
+
+
+def _load_generation(entry: Dict) -> Generation:
+    if 'message' in entry:
+        message = messages_from_dict([entry['message']])[0]
+        message.response_metadata[CACHE_HIT_KEY] = True
+        return ChatGeneration(message=message)
+    return Generation(text=entry['text'], generation_info={CACHE_HIT_KEY: True})
+
+
+_llm_cache: Optional[DiskLLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> DiskLLMCache:
+    """
+    Get the process-wide LLM response cache
+    
+    Returns:
+        Shared DiskLLMCache
+    """
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = DiskLLMCache()
+        return _llm_cache
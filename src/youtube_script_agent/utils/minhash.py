@@ -0,0 +1,207 @@
+"""
+MinHash signatures and LSH lookup for near-duplicate text
+"""
+
+import hashlib
+import re
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+_MERSENNE_PRIME = (1 << 31) - 1
+
+_URL_RE = re.compile(r'https?://\S+')
+_MENTION_RE = re.compile(r'(^|\s)(rt\s+)?@\w+:?')
+_NON_WORD_RE = re.compile(r'[^\w%$.]+')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize tweet text for duplicate matching
+    
+    Lowercases and drops URLs, retweet prefixes, mentions, emoji and
+    punctuation, keeping numbers, percentages and dollar amounts intact.
+    
+    Args:
+        text: Raw tweet text
+        
+    Returns:
+        Normalized text
+    """
+    text = _URL_RE.sub(' ', text.lower())
+    text = _MENTION_RE.sub(' ', text)
+    text = _NON_WORD_RE.sub(' ', text)
+    return ' '.join(word for word in (w.strip('.') for w in text.split()) if word)
+
+
+def _token_hashes(tokens: Iterable[str]) -> np.ndarray:
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'big')
+         for token in tokens),
+        dtype=np.uint64
+    )
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures over token sets
+    
+    Each of the `num_perm` hash functions is (a * x + b) mod p over 32-bit
+    token hashes; the whole signature is one vectorized min.
+    """
+    
+    def __init__(self, num_perm: int = MINHASH_PERMUTATIONS, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    
+    def signature(self, tokens: Set[str]) -> Tuple[int, ...]:
+        """
+        Compute the MinHash signature of a token set
+        
+        Args:
+            tokens: Token set (e.g. the words of normalized text)
+            
+        Returns:
+            Signature of num_perm integers
+        """
+        if not tokens:
+            return (_MERSENNE_PRIME,) * self.num_perm
+        hashes = _token_hashes(sorted(tokens)) % _MERSENNE_PRIME
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME
+        return tuple(int(value) for value in permuted.min(axis=0))
+    
+    def text_signature(self, text: str) -> Tuple[int, ...]:
+        """
+        Compute the signature of already normalized text over its words
+        
+        Args:
+            text: Normalized text
+            
+        Returns:
+            Signature of num_perm integers
+        """
+        return self.signature(set(text.split()))
+
+
+def estimate_jaccard(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """
+    Estimate the Jaccard similarity of two token sets from their signatures
+    
+    Args:
+        a: First signature
+        b: Second signature
+        
+    Returns:
+        Fraction of matching signature positions
+    """
+    return sum(x == y for x, y in zip(a, b)) / max(len(a), 1)
+
+
+class MinHashLSH:
+    """
+    Banded locality-sensitive index over MinHash signatures
+    
+    Signatures are split into `bands` bands; entries sharing any band are
+    candidates, and a candidate matches when its estimated Jaccard similarity
+    reaches `threshold`. Lookups touch only the candidate buckets.
+    """
+    
+    def __init__(self, threshold: float, bands: int = MINHASH_BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._signatures)
+    
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        rows = len(signature) // self.bands
+        return [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+    
+    def add(self, key: str, signature: Tuple[int, ...]) -> None:
+        """
+        Index a signature under a key, replacing any previous entry for it
+        
+        Args:
+            key: Identifier returned by lookups
+            signature: MinHash signature
+        """
+        self.remove(key)
+        self._signatures[key] = np.asarray(signature, dtype=np.uint32)
+        for band_key in self._band_keys(signature):
+            self._buckets.setdefault(band_key, set()).add(key)
+    
+    def remove(self, key: str) -> None:
+        """
+        Remove a key from the index if present
+        
+        Args:
+            key: Identifier passed to add()
+        """
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band_key in self._band_keys(tuple(int(value) for value in signature)):
+            bucket = self._buckets.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+    
+    def candidates(self, signature: Tuple[int, ...]) -> Set[str]:
+        """
+        Collect keys sharing at least one band with a signature
+        
+        Args:
+            signature: MinHash signature
+            
+        Returns:
+            Candidate keys
+        """
+        found = set()
+        for band_key in self._band_keys(signature):
+            found.update(self._buckets.get(band_key, ()))
+        return found
+    
+    def query(self, signature: Tuple[int, ...]) -> List[Tuple[str, float]]:
+        """
+        Find indexed keys whose estimated similarity reaches the threshold
+        
+        Candidates are compared against the signature in one vectorized step.
+        
+        Args:
+            signature: MinHash signature
+            
+        Returns:
+            (key, similarity) pairs, most similar first
+        """
+        keys = sorted(self.candidates(signature))
+        if not keys:
+            return []
+        
+        stacked = np.stack([self._signatures[key] for key in keys])
+        similarities = (stacked == np.asarray(signature, dtype=np.uint32)).mean(axis=1)
+        matches = [
+            (key, float(similarity))
+            for key, similarity in zip(keys, similarities)
+            if similarity >= self.threshold
+        ]
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+    
+    def nearest(self, signature: Tuple[int, ...]) -> Optional[str]:
+        """
+        Find the most similar indexed key above the threshold
+        
+        Args:
+            signature: MinHash signature
+            
+        Returns:
+            Matching key, or None
+        """
+        matches = self.query(signature)
+        return matches[0][0] if matches else None
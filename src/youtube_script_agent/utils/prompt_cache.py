@@ -0,0 +1,68 @@
+"""
+Anthropic prompt caching helpers
+"""
+
+from langchain_core.messages import HumanMessage
+from typing import Dict, Iterable
+
+
+def build_cached_message(prefix: str, suffix: str, cache: bool = True) -> HumanMessage:
+    """
+    Build a message whose stable prefix is marked for Anthropic prompt caching
+    
+    The prefix and suffix are sent as separate text blocks, with a
+    `cache_control` breakpoint on the prefix. Calls that share the prefix read
+    it from the cache instead of reprocessing it. Without caching, the blocks
+    are joined into one plain text message.
+    
+    Args:
+        prefix: Content shared across calls (context, instructions)
+        suffix: Call-specific content
+        cache: Whether to add the cache breakpoint
+        
+    Returns:
+        HumanMessage
+    """
+    if not cache:
+        return HumanMessage(content=f"{prefix}\n\n{suffix}")
+    
+    return HumanMessage(content=[
+        {'type': 'text', 'text': prefix, 'cache_control': {'type': 'ephemeral'}},
+        {'type': 'text', 'text': suffix}
+    ])
+
+
+def prompt_cache_usage(messages: Iterable) -> Dict[str, int]:
+    """
+    Sum input, cache-read and cache-write token usage over response messages or chunks
+    
+    Reads the standard `usage_metadata` first and falls back to the raw
+    Anthropic usage block in `response_metadata`.
+    
+    Args:
+        messages: AIMessage responses or streamed AIMessageChunks
+        
+    Returns:
+        Dict with input_tokens, output_tokens, cache_read_tokens and cache_write_tokens
+    """
+    totals = {
+        'input_tokens': 0, 'output_tokens': 0, 'cache_read_tokens': 0, 'cache_write_tokens': 0
+    }
+    
+    for message in messages:
+        usage = getattr(message, 'usage_metadata', None)
+        if usage:
+            details = usage.get('input_token_details') or {}
+            totals['input_tokens'] += usage.get('input_tokens', 0)
+            totals['output_tokens'] += usage.get('output_tokens', 0)
+            totals['cache_read_tokens'] += details.get('cache_read', 0) or 0
+            totals['cache_write_tokens'] += details.get('cache_creation', 0) or 0
+            continue
+        
+        raw = (getattr(message, 'response_metadata', None) or {}).get('usage') or {}
+        totals['input_tokens'] += raw.get('input_tokens', 0) or 0
+        totals['output_tokens'] += raw.get('output_tokens', 0) or 0
+        totals['cache_read_tokens'] += raw.get('cache_read_input_tokens', 0) or 0
+        totals['cache_write_tokens'] += raw.get('cache_creation_input_tokens', 0) or 0
+    
+    return totals
@@ -0,0 +1,439 @@
+"""
+Per-run tracing of graph nodes, Twitter requests and LLM calls
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import Generation, LLMResult
+
+from ..core.constants import TRACE_DIR
+from .llm_cache import CACHE_HIT_KEY
+from .prompt_cache import prompt_cache_usage
+
+_trace: ContextVar[Optional['RunTrace']] = ContextVar('run_trace', default=None)
+_node: ContextVar[Optional[str]] = ContextVar('trace_node', default=None)
+
+# Bucket for calls made outside any node
+NO_NODE = '-'
+
+NODE_COUNTERS = (
+    'seconds', 'twitter_requests', 'twitter_seconds',
+    'twitter_request_bytes', 'twitter_response_bytes',
+    'llm_calls', 'llm_cache_hits', 'llm_seconds', 'prompt_bytes', 'completion_bytes',
+    'input_tokens', 'output_tokens', 'cache_read_tokens', 'cache_write_tokens'
+)
+TOKEN_KINDS = ('input', 'output', 'cache_read', 'cache_write')
+
+
+class RunTrace:
+    """
+    Timings, call counts, payload sizes and token usage of one agent run
+    
+    Every call is kept in order (twitter_calls, llm_calls) and also rolled
+    up into per-node counters, attributed to the node active when it was
+    made. Recording is a perf_counter read and a list append under a lock,
+    cheap enough to stay on for every run.
+    """
+    
+    def __init__(self, run_id: str, topic: str, resumed: bool = False):
+        self.run_id = run_id
+        self.topic = topic
+        self.resumed = resumed
+        self.started_at = datetime.now()
+        self.seconds: Optional[float] = None
+        self.critical_path_seconds: Optional[float] = None
+        self.nodes: Dict[str, Dict[str, float]] = {}
+        self.twitter_calls: List[Dict] = []
+        self.llm_calls: List[Dict] = []
+        self.paths: Optional[Tuple[Path, Path]] = None
+        self._clock = time.perf_counter()
+        self._lock = threading.Lock()
+    
+    def _counters(self, node: Optional[str]) -> Dict[str, float]:
+        # Called with the lock held
+        node = node or NO_NODE
+        if node not in self.nodes:
+            self.nodes[node] = dict.fromkeys(NODE_COUNTERS, 0)
+        return self.nodes[node]
+    
+    def _offset(self, started: float) -> float:
+        return round(started - self._clock, 4)
+    
+    def record_node(self, node: str, started: float, seconds: float) -> None:
+        """
+        Record one execution of a graph node
+        
+        Args:
+            node: Node name
+            started: perf_counter() value when the node started
+            seconds: Wall time of the node
+        """
+        with self._lock:
+            counters = self._counters(node)
+            counters['seconds'] += seconds
+            counters['start_offset'] = self._offset(started)
+    
+    def record_twitter(
+        self,
+        method: str,
+        route: str,
+        started: float,
+        seconds: float,
+        status: int,
+        request_bytes: int,
+        response_bytes: int
+    ) -> None:
+        """
+        Record one Twitter API request
+        
+        Args:
+            method: HTTP method
+            route: API route
+            started: perf_counter() value when the request started
+            seconds: Request latency (excluding rate-limit waits)
+            status: HTTP status code
+            request_bytes: Encoded query string size
+            response_bytes: Response body size
+        """
+        node = _node.get()
+        with self._lock:
+            self.twitter_calls.append({
+                'node': node or NO_NODE,
+                'method': method,
+                'route': route,
+                'start_offset': self._offset(started),
+                'seconds': round(seconds, 4),
+                'status': status,
+                'request_bytes': request_bytes,
+                'response_bytes': response_bytes
+            })
+            counters = self._counters(node)
+            counters['twitter_requests'] += 1
+            counters['twitter_seconds'] += seconds
+            counters['twitter_request_bytes'] += request_bytes
+            counters['twitter_response_bytes'] += response_bytes
+    
+    def record_llm(
+        self,
+        node: Optional[str],
+        model: str,
+        started: float,
+        seconds: float,
+        prompt_bytes: int,
+        completion_bytes: int,
+        usage: Dict[str, int],
+        cache_hit: bool
+    ) -> None:
+        """
+        Record one LLM call
+        
+        Args:
+            node: Node that made the call
+            model: Model name
+            started: perf_counter() value when the call started
+            seconds: Call latency
+            prompt_bytes: UTF-8 size of the prompt text
+            completion_bytes: UTF-8 size of the response text
+            usage: Token usage from prompt_cache_usage() (input_tokens
+                includes cache reads and writes)
+            cache_hit: Whether the response came from the LLM response cache
+        """
+        with self._lock:
+            self.llm_calls.append({
+                'node': node or NO_NODE,
+                'model': model,
+                'start_offset': self._offset(started),
+                'seconds': round(seconds, 4),
+                'cache_hit': cache_hit,
+                'prompt_bytes': prompt_bytes,
+                'completion_bytes': completion_bytes,
+                **usage
+            })
+            counters = self._counters(node)
+            counters['llm_calls'] += 1
+            counters['llm_cache_hits'] += int(cache_hit)
+            counters['llm_seconds'] += seconds
+            counters['prompt_bytes'] += prompt_bytes
+            counters['completion_bytes'] += completion_bytes
+            for key, value in usage.items():
+                counters[key] += value
+    
+    def finish(self) -> None:
+        """Stop the run clock"""
+        self.seconds = time.perf_counter() - self._clock
+    
+    def node_seconds(self) -> Dict[str, float]:
+        """
+        Wall time per graph node
+        
+        Returns:
+            Seconds per node (calls outside nodes excluded)
+        """
+        with self._lock:
+            return {
+                node: counters['seconds']
+                for node, counters in self.nodes.items() if node != NO_NODE
+            }
+    
+    def totals(self) -> Dict[str, float]:
+        """
+        Counters summed over all nodes
+        
+        Returns:
+            Dict keyed like the per-node counters (seconds excluded, since
+            parallel nodes overlap)
+        """
+        with self._lock:
+            return {
+                key: sum(counters[key] for counters in self.nodes.values())
+                for key in NODE_COUNTERS if key != 'seconds'
+            }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-ready trace
+        
+        Returns:
+            Dict with run metadata, totals, per-node counters and every call
+        """
+        totals = self.totals()
+        with self._lock:
+            return {
+                'run_id': self.run_id,
+                'topic': self.topic,
+                'resumed': self.resumed,
+                'started_at': self.started_at.isoformat(),
+                'seconds': round(self.seconds, 4) if self.seconds is not None else None,
+                'critical_path_seconds': self.critical_path_seconds,
+                'totals': totals,
+                'nodes': {node: dict(counters) for node, counters in self.nodes.items()},
+                'twitter_calls': list(self.twitter_calls),
+                'llm_calls': list(self.llm_calls)
+            }
+    
+    def prometheus(self) -> str:
+        """
+        Render the run's metrics in the Prometheus text exposition format
+        
+        Returns:
+            Metrics text with one sample per node, labelled by run and topic
+        """
+        run_labels = f'run_id="{self.run_id}",topic="{self.topic}"'
+        with self._lock:
+            nodes = {node: dict(counters) for node, counters in self.nodes.items()}
+        
+        def family(
+            name: str,
+            help_text: str,
+            samples: List[Tuple[str, float]],
+            keep_zero: bool = False
+        ) -> List[str]:
+            # Nodes that made no calls of a kind are left out to keep the dump short
+            lines = [f'# HELP yts_{name} {help_text}', f'# TYPE yts_{name} gauge']
+            lines += [
+                f'yts_{name}{{{run_labels}{labels}}} {round(value, 6)}'
+                for labels, value in samples if value or keep_zero
+            ]
+            return lines
+        
+        def per_node(counter: str) -> List[Tuple[str, float]]:
+            return [(f',node="{node}"', counters[counter]) for node, counters in nodes.items()]
+        
+        lines = family('run_seconds', 'Wall time of the run',
+                       [('', self.seconds or 0.0)], keep_zero=True)
+        if self.critical_path_seconds is not None:
+            lines += family('run_critical_path_seconds',
+                            'Longest dependency chain through the graph',
+                            [('', self.critical_path_seconds)], keep_zero=True)
+        lines += family('node_seconds', 'Wall time per graph node',
+                        per_node('seconds'), keep_zero=True)
+        lines += family('node_twitter_requests', 'Twitter API requests per node',
+                        per_node('twitter_requests'))
+        lines += family('node_twitter_seconds', 'Twitter API request time per node',
+                        per_node('twitter_seconds'))
+        lines += family('node_twitter_bytes', 'Twitter API payload bytes per node', [
+            (f',node="{node}",direction="{direction}"', counters[f'twitter_{direction}_bytes'])
+            for node, counters in nodes.items() for direction in ('request', 'response')
+        ])
+        lines += family('node_llm_calls', 'LLM calls per node', per_node('llm_calls'))
+        lines += family('node_llm_cache_hits', 'LLM calls answered from the response cache',
+                        per_node('llm_cache_hits'))
+        lines += family('node_llm_seconds', 'LLM call time per node', per_node('llm_seconds'))
+        lines += family('node_llm_bytes', 'LLM payload bytes per node', [
+            (f',node="{node}",direction="{direction}"', counters[f'{kind}_bytes'])
+            for node, counters in nodes.items()
+            for direction, kind in (('request', 'prompt'), ('response', 'completion'))
+        ])
+        lines += family('node_llm_tokens', 'LLM tokens per node', [
+            (f',node="{node}",kind="{kind}"', counters[f'{kind}_tokens'])
+            for node, counters in nodes.items() for kind in TOKEN_KINDS
+        ])
+        return '\n'.join(lines) + '\n'
+    
+    def save(self, directory: str = TRACE_DIR) -> Tuple[Path, Path]:
+        """
+        Write the JSON trace and the Prometheus dump
+        
+        Args:
+            directory: Directory for trace files
+            
+        Returns:
+            Paths of the JSON trace and the metrics file
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = self.run_id
+        if self.resumed:
+            name = f"{self.run_id}-resumed-{self.started_at:%Y%m%d_%H%M%S}"
+        
+        json_path = directory / f"{name}.json"
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        
+        prom_path = directory / f"{name}.prom"
+        prom_path.write_text(self.prometheus(), encoding='utf-8')
+        self.paths = (json_path, prom_path)
+        return self.paths
+
+
+def current_trace() -> Optional[RunTrace]:
+    """
+    Get the trace of the run executing in this context
+    
+    Returns:
+        RunTrace, or None outside a traced run
+    """
+    return _trace.get()
+
+
+@contextmanager
+def tracing(trace: RunTrace) -> Iterator[RunTrace]:
+    """
+    Make a trace current for everything run in this context
+    
+    Context variables follow LangGraph node threads, asyncio tasks and work
+    submitted with contextvars.copy_context().run, so calls made anywhere
+    inside the run are recorded.
+    
+    Args:
+        trace: Trace to record into
+        
+    Yields:
+        The trace, finished when the block exits
+    """
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+        trace.finish()
+
+
+@contextmanager
+def trace_node(name: str) -> Iterator[None]:
+    """
+    Time a graph node and attribute calls made inside it to the node
+    
+    Args:
+        name: Node name
+    """
+    trace = _trace.get()
+    if trace is None:
+        yield
+        return
+    
+    token = _node.set(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.record_node(name, started, time.perf_counter() - started)
+        _node.reset(token)
+
+
+def _text_bytes(content: Any) -> int:
+    """
+    UTF-8 size of message content (a string or a list of content blocks)
+    """
+    if isinstance(content, str):
+        return len(content.encode('utf-8'))
+    if isinstance(content, list):
+        return sum(
+            _text_bytes(block.get('text', '') if isinstance(block, dict) else block)
+            for block in content
+        )
+    return 0
+
+
+def _served_from_cache(generation: Generation) -> bool:
+    """
+    Check the flag DiskLLMCache sets on every generation it serves
+    """
+    message = getattr(generation, 'message', None)
+    if message is not None and message.response_metadata.get(CACHE_HIT_KEY):
+        return True
+    return bool((generation.generation_info or {}).get(CACHE_HIT_KEY))
+
+
+class LLMCallTracer(BaseCallbackHandler):
+    """
+    LangChain callback that records every chat model call into the current run's trace
+    
+    Attach it to the LLM once; calls made outside a traced run are ignored.
+    """
+    
+    run_inline = True
+    
+    def __init__(self):
+        self._pending: Dict[UUID, Tuple[RunTrace, Optional[str], str, float, int]] = {}
+        self._lock = threading.Lock()
+    
+    def on_chat_model_start(
+        self,
+        serialized: Dict,
+        messages: List[List],
+        *,
+        run_id: UUID,
+        **kwargs
+    ) -> None:
+        trace = _trace.get()
+        if trace is None:
+            return
+        
+        model = (
+            (kwargs.get('invocation_params') or {}).get('model')
+            or (serialized or {}).get('name', '')
+        )
+        prompt_bytes = sum(_text_bytes(message.content) for batch in messages for message in batch)
+        with self._lock:
+            self._pending[run_id] = (trace, _node.get(), model, time.perf_counter(), prompt_bytes)
+    
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs) -> None:
+        with self._lock:
+            pending = self._pending.pop(run_id, None)
+        if pending is None:
+            return
+        
+        trace, node, model, started, prompt_bytes = pending
+        generations = [generation for batch in response.generations for generation in batch]
+        messages = [
+            generation.message for generation in generations if hasattr(generation, 'message')
+        ]
+        cache_hit = any(_served_from_cache(generation) for generation in generations)
+        usage = prompt_cache_usage([] if cache_hit else messages)
+        completion_bytes = sum(_text_bytes(message.content) for message in messages)
+        trace.record_llm(node, model, started, time.perf_counter() - started,
+                         prompt_bytes, completion_bytes, usage, cache_hit)
+    
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs) -> None:
+        with self._lock:
+            self._pending.pop(run_id, None)
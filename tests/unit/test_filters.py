@@ -0,0 +1,131 @@
+"""
+Vectorized quality scoring and heap top-k, checked against the scalar definitions
+"""
+
+from typing import Dict, List, Tuple
+
+import pytest
+
+from youtube_script_agent.core.constants import (
+    BOT_RT_MULTIPLIER,
+    MIN_ENGAGEMENT_RATIO,
+    SPAM_REPLY_THRESHOLD,
+)
+from youtube_script_agent.core.records import TweetRecord
+from youtube_script_agent.utils.filters import score_batch, top_k_by_score
+
+CONFIG = {'engagement_threshold': 100, 'follower_threshold': 1000}
+
+# (likes, retweets, replies, quotes, followers, verified)
+BATCH = [
+    (200, 50, 20, 5, 5000, False),    # passes
+    (200, 50, 20, 5, 2000, False),    # same score as the first
+    (300, 100, 10, 0, 0, False),      # zero followers, reputable on engagement alone
+    (60, 10, 40, 0, 0, False),        # zero followers, not reputable
+    (50, 200, 10, 0, 5000, False),    # bot-like retweet ratio
+    (40, 10, 5, 0, 0, True),          # verified, below the engagement threshold
+    (100, 20, 10, 2, 0, True),        # verified with zero followers, scores 261
+    (50, 10, 300, 0, 5000, False),    # reply spam
+    (161, 50, 0, 0, 1000, False),     # exactly at the follower threshold, ties at 261
+    (0, 0, 0, 0, 0, False),           # nothing at all
+    (200, 50, 20, 5, 9000, False),    # a third tie with the first
+]
+
+
+def make_tweet(index: int, likes: int, retweets: int, replies: int, quotes: int,
+               followers: int, verified: bool) -> TweetRecord:
+    total = likes + retweets + replies
+    return TweetRecord(
+        id=index,
+        text=f"tweet {index}",
+        created_at='2024-01-01T00:00:00',
+        author_username=f"author{index}",
+        author_verified=verified,
+        author_followers=followers,
+        author_profile_image=None,
+        likes=likes,
+        retweets=retweets,
+        replies=replies,
+        quotes=quotes,
+        total_engagement=total,
+        engagement_ratio=total / max(followers, 1),
+        conversation_id=index
+    )
+
+
+def scalar_score(tweet: TweetRecord, config: Dict) -> Tuple[float, bool]:
+    """
+    Score and filter one tweet the way the per-tweet loop did
+    
+    Args:
+        tweet: Tweet record
+        config: Topic configuration
+        
+    Returns:
+        Tuple of (quality score, whether the tweet passes every check)
+    """
+    threshold = config['engagement_threshold']
+    passes = (
+        tweet.total_engagement >= threshold and
+        tweet.engagement_ratio >= MIN_ENGAGEMENT_RATIO and
+        tweet.likes >= threshold * 0.4 and
+        tweet.retweets <= tweet.likes * BOT_RT_MULTIPLIER and
+        tweet.replies <= tweet.total_engagement * SPAM_REPLY_THRESHOLD and
+        (
+            tweet.author_verified or
+            tweet.author_followers >= config['follower_threshold'] or
+            tweet.total_engagement >= threshold * 4
+        )
+    )
+    score = (
+        (tweet.likes * 1.0) +
+        (tweet.retweets * 2.0) +
+        (tweet.replies * 1.5) +
+        (tweet.quotes * 3.0) +
+        (100 if tweet.author_verified else 0)
+    )
+    return score, passes
+
+
+@pytest.fixture
+def tweets() -> List[TweetRecord]:
+    return [make_tweet(i, *metrics) for i, metrics in enumerate(BATCH)]
+
+
+def test_score_batch_matches_scalar_scoring(tweets):
+    scores, mask = score_batch(tweets, CONFIG)
+    expected = [scalar_score(tweet, CONFIG) for tweet in tweets]
+    
+    assert scores.tolist() == [score for score, _ in expected]
+    assert mask.tolist() == [passes for _, passes in expected]
+
+
+def test_score_batch_zero_follower_authors(tweets):
+    _, mask = score_batch(tweets, CONFIG)
+    
+    # Zero-follower authors pass only on engagement volume or verification
+    assert mask[2] and mask[6]
+    assert not mask[3] and not mask[9]
+
+
+@pytest.mark.parametrize('k', [0, 1, 2, 3, 5, len(BATCH)])
+def test_top_k_by_score_matches_stable_sort(tweets, k):
+    scores, mask = score_batch(tweets, CONFIG)
+    scores = scores.tolist()
+    passing = [i for i, passes in enumerate(mask) if passes]
+    
+    expected = sorted(passing, key=lambda i: scores[i], reverse=True)[:k]
+    
+    assert top_k_by_score(passing, scores, k) == expected
+
+
+def test_top_k_by_score_keeps_input_order_among_ties(tweets):
+    scores, mask = score_batch(tweets, CONFIG)
+    scores = scores.tolist()
+    passing = [i for i, passes in enumerate(mask) if passes]
+    
+    # Tweets 0, 1 and 10 share the score behind tweet 2; 6 and 8 share 261
+    assert scores[0] == scores[1] == scores[10] < scores[2]
+    assert scores[6] == scores[8]
+    assert top_k_by_score(passing, scores, 4) == [2, 0, 1, 10]
+    assert top_k_by_score([8, 6], scores, 2) == [8, 6]
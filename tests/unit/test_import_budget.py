@@ -0,0 +1,63 @@
+"""
+Import-time regression test for the CLI entry point
+"""
+
+import os
+import re
+import subprocess
+import sys
+from typing import Dict
+
+CLI_MODULE = 'youtube_script_agent.main'
+IMPORT_BUDGET_MS = 150
+
+# Heavy packages main() imports only once a run starts
+DEFERRED_IMPORTS = (
+    'langgraph', 'langchain_core', 'langchain_anthropic', 'anthropic', 'tweepy', 'numpy'
+)
+
+# "import time: <self us> | <cumulative us> | <indent><module>"
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter under `-X importtime`
+    
+    Args:
+        module: Dotted module name
+        
+    Returns:
+        Cumulative import microseconds per module imported
+    """
+    # The child resolves the package the same way this process does
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True, env=env
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def cumulative_ms(times: Dict[str, int], module: str) -> float:
+    # The parent packages are imported first and reported separately
+    parts = module.split('.')
+    return sum(times.get('.'.join(parts[:i]), 0) for i in range(1, len(parts) + 1)) / 1000
+
+
+def test_cli_does_not_import_heavy_dependencies():
+    loaded = {name.split('.')[0] for name in import_times(CLI_MODULE)}
+    
+    assert not loaded & set(DEFERRED_IMPORTS)
+
+
+def test_cli_import_stays_within_budget():
+    # Fastest of a few interpreters, to keep scheduler noise out of the measurement
+    ms = min(cumulative_ms(import_times(CLI_MODULE), CLI_MODULE) for _ in range(3))
+    
+    assert ms <= IMPORT_BUDGET_MS, f"{CLI_MODULE} took {ms:.1f}ms to import"
@@ -0,0 +1,152 @@
+"""
+Prompt caching across script variants, checked against a local fake chat model
+"""
+
+import asyncio
+import time
+from typing import Dict, List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import Field
+
+from youtube_script_agent.core.constants import SCRIPT_VARIANTS
+from youtube_script_agent.generators.scripts import (
+    _generate_variants_async,
+    build_script_prefix,
+    build_variant_suffix,
+    generate_multiple_script_variants,
+)
+from youtube_script_agent.utils.prompt_cache import build_cached_message, prompt_cache_usage
+
+CONFIG = {'video_length': '8-10', 'tone': 'energetic', 'script_concurrency': 3}
+
+
+class RecordingChatModel(BaseChatModel):
+    """
+    Fake chat model that records every request payload and emulates prompt caching
+    
+    A prefix marked with cache_control becomes readable once the request
+    that wrote it has produced its first chunk, as with Anthropic.
+    """
+    
+    first_token_seconds: float = 0.05
+    completion_seconds: float = 0.3
+    requests: List[Dict] = Field(default_factory=list)
+    cached_prefixes: set = Field(default_factory=set)
+    
+    @property
+    def _llm_type(self) -> str:
+        return 'recording-fake'
+    
+    def _record(self, messages: List[BaseMessage], kwargs: Dict) -> Dict:
+        request = {
+            'content': [message.content for message in messages],
+            'kwargs': kwargs,
+            'started': time.perf_counter()
+        }
+        self.requests.append(request)
+        return request
+    
+    def _usage(self, messages: List[BaseMessage]) -> Dict:
+        prefix = next(
+            (block['text'] for message in messages if isinstance(message.content, list)
+             for block in message.content if 'cache_control' in block),
+            None
+        )
+        tokens = sum(len(str(message.content)) for message in messages) // 4
+        cached = len(prefix) // 4 if prefix else 0
+        read = cached if prefix in self.cached_prefixes else 0
+        if prefix:
+            self.cached_prefixes.add(prefix)
+        return {
+            'input_tokens': tokens,
+            'output_tokens': 2,
+            'total_tokens': tokens + 2,
+            'input_token_details': {'cache_read': read, 'cache_creation': cached - read}
+        }
+    
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        raise NotImplementedError("use the async API")
+    
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        request = self._record(messages, kwargs)
+        await asyncio.sleep(self.first_token_seconds)
+        usage = self._usage(messages)
+        await asyncio.sleep(self.completion_seconds - self.first_token_seconds)
+        request['finished'] = time.perf_counter()
+        message = AIMessage(content='Generated script body.', usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        request = self._record(messages, kwargs)
+        await asyncio.sleep(self.first_token_seconds)
+        usage = self._usage(messages)
+        chunk = AIMessageChunk(content='Generated ', usage_metadata=usage)
+        yield ChatGenerationChunk(message=chunk)
+        await asyncio.sleep(self.completion_seconds - self.first_token_seconds)
+        request['finished'] = time.perf_counter()
+        yield ChatGenerationChunk(message=AIMessageChunk(content='script body.'))
+
+
+def variant_prompts(count: int, cache: bool = True) -> List[BaseMessage]:
+    prefix = build_script_prefix("TOPIC: nfl", CONFIG)
+    return [build_cached_message(prefix, build_variant_suffix(variant), cache)
+            for variant in SCRIPT_VARIANTS[:count]]
+
+
+def test_variant_payloads_share_the_cached_prefix():
+    llm = RecordingChatModel()
+    state = {
+        'topic': 'nfl',
+        'config': dict(CONFIG, script_variant_count=3),
+        'filtered_tweets': [],
+        'trending_hashtags': ['#NFL'],
+    }
+    
+    state = generate_multiple_script_variants(state, llm)
+    
+    assert len(state['script_variants']) == 3
+    blocks = [request['content'][0] for request in llm.requests]
+    assert all(block[0]['cache_control'] == {'type': 'ephemeral'} for block in blocks)
+    assert len({block[0]['text'] for block in blocks}) == 1
+    assert len({block[1]['text'] for block in blocks}) == 3
+
+
+def test_warm_up_starts_the_rest_at_the_first_token():
+    llm = RecordingChatModel()
+    
+    started = time.perf_counter()
+    responses = asyncio.run(_generate_variants_async(llm, variant_prompts(3), 3, warm_cache=True))
+    elapsed = time.perf_counter() - started
+    
+    first, *rest = llm.requests
+    assert all(first['started'] < request['started'] < first['finished'] for request in rest)
+    assert elapsed < 2 * llm.completion_seconds
+    usage = [prompt_cache_usage([response]) for response in responses]
+    assert usage[0]['cache_read_tokens'] == 0 and usage[0]['cache_write_tokens'] > 0
+    assert all(u['cache_read_tokens'] > 0 and u['cache_write_tokens'] == 0 for u in usage[1:])
+
+
+def test_without_warm_up_all_variants_start_together():
+    llm = RecordingChatModel()
+    
+    responses = asyncio.run(_generate_variants_async(llm, variant_prompts(3, cache=False), 3))
+    
+    assert len(responses) == 3
+    starts = [request['started'] for request in llm.requests]
+    assert max(starts) - min(starts) < llm.first_token_seconds
+
+
+def test_warm_up_survives_a_failed_first_request():
+    class FailingFirst(RecordingChatModel):
+        async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+            raise RuntimeError("overloaded")
+            yield
+    
+    llm = FailingFirst()
+    responses = asyncio.run(_generate_variants_async(llm, variant_prompts(3), 3, warm_cache=True))
+    
+    assert isinstance(responses[0], RuntimeError)
+    assert all(isinstance(response, AIMessage) for response in responses[1:])